@@ -1 +0,0 @@
-../chap4/action.py
\ No newline at end of file
@@ -0,0 +1,264 @@
+import random
+from itertools import combinations
+from typing import Any, ClassVar, Iterable, Optional, Union
+
+from card import Card, Hand
+
+
+class AskAction:
+    __slots__ = ("__card",)
+    __card: Card
+    # カードごとに共有されるインスタンス
+    __instances: ClassVar[dict[Card, "AskAction"]] = {}
+
+    def __new__(cls, card: Card) -> "AskAction":
+        """
+        質問を返す
+        同じカードの質問は常に同じインスタンスになる
+        """
+        ask = cls.__instances.get(card)
+        if ask is None:
+            ask = super().__new__(cls)
+            object.__setattr__(ask, "_AskAction__card", card)
+            cls.__instances[card] = ask
+        return ask
+
+    @property
+    def card(self) -> Card:
+        """質問したカードを返す"""
+        return self.__card
+
+    def is_hit(self, hand: Hand) -> bool:
+        """質問したカードが手札にあるか返す"""
+        return hand.has_card(self.__card)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """質問は変更できない"""
+        raise AttributeError(f"AskAction is immutable. (name: {name})")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """コピーやpickleでも同じインスタンスを返すようにする"""
+        return (AskAction, (self.__card,))
+
+    def __repr__(self) -> str:
+        """質問を表現する文字列を返す"""
+        return f"Ask({self.__card})"
+
+    def __hash__(self) -> int:
+        """質問のハッシュ値を返す"""
+        return hash(("ask", self.__card))
+
+    def __eq__(self, other: Any) -> bool:
+        """質問が同じか返す"""
+        return self is other
+
+
+class GuessAction:
+    __slots__ = ("__card",)
+    __card: Card
+    # カードごとに共有されるインスタンス
+    __instances: ClassVar[dict[Card, "GuessAction"]] = {}
+
+    def __new__(cls, card: Card) -> "GuessAction":
+        """
+        推測を返す
+        同じカードの推測は常に同じインスタンスになる
+        """
+        guess = cls.__instances.get(card)
+        if guess is None:
+            guess = super().__new__(cls)
+            object.__setattr__(guess, "_GuessAction__card", card)
+            cls.__instances[card] = guess
+        return guess
+
+    @property
+    def card(self) -> Card:
+        """推測したカードを返す"""
+        return self.__card
+
+    def is_hit(self, rest_card: Card) -> bool:
+        """推測したカードが残りのカードと一致するか返す"""
+        return self.__card is rest_card
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """推測は変更できない"""
+        raise AttributeError(f"GuessAction is immutable. (name: {name})")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """コピーやpickleでも同じインスタンスを返すようにする"""
+        return (GuessAction, (self.__card,))
+
+    def __repr__(self) -> str:
+        """推測を表現する文字列を返す"""
+        return f"Guess({self.__card})"
+
+    def __hash__(self) -> int:
+        """推測のハッシュ値を返す"""
+        return hash(("guess", self.__card))
+
+    def __eq__(self, other: Any) -> bool:
+        """推測が同じか返す"""
+        return self is other
+
+
+Action = Union[AskAction, GuessAction]
+
+
+class ActionList:
+    # 手札のビットマスクと直前の質問をキーにした行動の一覧の表
+    __table: ClassVar[dict[tuple[int, Optional[AskAction]], "ActionList"]] = {}
+
+    def __init__(
+        self, ask_actions: Iterable[AskAction], guess_actions: Iterable[GuessAction]
+    ) -> None:
+        """
+        行動の一覧を初期化する
+        一覧は共有されるので変更できないタプルで保持する
+        """
+        self.__ask_actions = tuple(ask_actions)
+        self.__guess_actions = tuple(guess_actions)
+        self.__all_actions: tuple[Action, ...] = (
+            self.__ask_actions + self.__guess_actions
+        )
+
+        # 含まれるかの判定用に、行動のカードをビットマスクで持つ
+        self.__ask_mask = 0
+        for ask in self.__ask_actions:
+            self.__ask_mask |= ask.card.mask
+        self.__guess_mask = 0
+        for guess in self.__guess_actions:
+            self.__guess_mask |= guess.card.mask
+
+    @property
+    def ask_actions(self) -> tuple[AskAction, ...]:
+        """質問の一覧を返す"""
+        return self.__ask_actions
+
+    @property
+    def guess_actions(self) -> tuple[GuessAction, ...]:
+        """推測の一覧を返す"""
+        return self.__guess_actions
+
+    @property
+    def all_actions(self) -> tuple[Action, ...]:
+        """行動の一覧を返す"""
+        return self.__all_actions
+
+    @property
+    def ask_mask(self) -> int:
+        """質問できるカードのビットマスクを返す"""
+        return self.__ask_mask
+
+    @property
+    def guess_mask(self) -> int:
+        """推測できるカードのビットマスクを返す"""
+        return self.__guess_mask
+
+    def choice(self, rng: Optional[random.Random] = None) -> Action:
+        """
+        行動を一様にランダムに選んで返す
+        乱数生成器の指定がなければrandomモジュールを使う
+        """
+        randrange = random.randrange if rng is None else rng.randrange
+        index = randrange(len(self.__all_actions))
+        return self.__all_actions[index]
+
+    def __contains__(self, action: Action) -> bool:
+        """指定された行動が一覧に含まれるか返す"""
+        if isinstance(action, AskAction):
+            return (self.__ask_mask & action.card.mask) != 0
+        if isinstance(action, GuessAction):
+            return (self.__guess_mask & action.card.mask) != 0
+        return False
+
+    def __len__(self) -> int:
+        """行動の数を返す"""
+        return len(self.__all_actions)
+
+    def __repr__(self) -> str:
+        """行動の一覧を表現する文字列を返す"""
+        return list(self.__all_actions).__repr__()
+
+    @classmethod
+    def get_available_actions(
+        cls, hand: Hand, prev_action: Optional[AskAction]
+    ) -> "ActionList":
+        """
+        手番プレイヤーの手札と直前の行動から
+        選択可能な行動の一覧を返す
+        一覧は初回に全パターンを生成した表から引く
+        """
+        return cls.get_available_actions_by_mask(hand.mask, prev_action)
+
+    @classmethod
+    def get_available_actions_by_mask(
+        cls, hand_mask: int, prev_action: Optional[AskAction]
+    ) -> "ActionList":
+        """
+        手番プレイヤーの手札のビットマスクと直前の行動から
+        選択可能な行動の一覧を返す
+        """
+        table = cls.__table
+        if not table:
+            table = cls.__build_table()
+        return table[(hand_mask, prev_action)]
+
+    @classmethod
+    def __build_table(cls) -> dict[tuple[int, Optional[AskAction]], "ActionList"]:
+        # 手札は9枚から4枚を選ぶ126通り、
+        # 直前の質問はなしと9枚のカードの10通り
+        # 複数のスレッドから同時に呼ばれても作りかけの表が見えないよう、
+        # 手元で作ってから1回の代入で公開する（同時に作った場合は後の表が残る）
+        all_cards = Card.get_all_cards()
+        prev_actions: list[Optional[AskAction]] = [None]
+        prev_actions += [AskAction(card) for card in all_cards]
+        table = {}
+        for hand_cards in combinations(all_cards, 4):
+            hand = Hand(list(hand_cards))
+            for prev_action in prev_actions:
+                action_list = cls.__create_actions(hand, prev_action)
+                table[(hand.mask, prev_action)] = action_list
+        cls.__table = table
+        return table
+
+    @classmethod
+    def __create_actions(
+        cls, hand: Hand, prev_action: Optional[AskAction]
+    ) -> "ActionList":
+        ask_actions = [AskAction(card) for card in Card.get_all_cards()]
+        guess_actions = []
+
+        if prev_action is not None:
+            ask_actions.remove(prev_action)
+            for card in hand.get_other_cards():
+                guess_actions.append(GuessAction(card))
+
+        return cls(ask_actions, guess_actions)
+
+
+if __name__ == "__main__":
+    from card import Card, Dealer
+
+    deal = Dealer(0).deal()
+
+    ask = AskAction(Card(1))
+    print(ask)
+    print(ask.is_hit(deal.player0_hand))
+
+    guess = GuessAction(Card(2))
+    print(guess)
+    print(guess.is_hit(deal.rest_card))
+
+    print(ActionList.get_available_actions(deal.player0_hand, None))
+    print(
+        ActionList.get_available_actions(
+            deal.player1_hand,
+            AskAction(Card(1)),
+        )
+    )
+    print(
+        ActionList.get_available_actions(
+            deal.player0_hand,
+            AskAction(Card(2)),
+        )
+    )
@@ -0,0 +1,197 @@
+# asyncioで動くゲームとプレイヤー
+#
+# プレイヤーの行動の選択をawaitで待つので、人やリモートのボットを待っている間も
+# 1つのイベントループで多数のゲームを並行して進められる（ゲームごとのスレッドは不要）
+# 同期のプレイヤーはSyncPlayerAdapterで包んで使う
+
+import asyncio
+from typing import Optional, Protocol, Union, cast
+
+from action import Action, ActionList, AskAction
+from card import Deal
+from event import AskEvent, EventBus, GuessEvent
+from game import GameObserver, ObserverRegistry
+from player import Player
+from state import GameState
+
+
+class AsyncPlayer(Protocol):
+    @property
+    def name(self) -> str:
+        """プレイヤーの名前を返す"""
+        ...
+
+    async def select_action(self, available_actions: ActionList) -> Action:
+        """プレイヤーに行動を選択させて返す"""
+        ...
+
+
+class SyncPlayerAdapter(AsyncPlayer):
+    def __init__(self, player: Player, blocking: bool = False) -> None:
+        """
+        同期のプレイヤーを包んで初期化する
+        入力を待つなどブロックするプレイヤーの場合は、blockingをTrueにすると
+        行動の選択を別スレッドで実行し、イベントループを止めない
+        """
+        self.__player = player
+        self.__blocking = blocking
+
+    @property
+    def player(self) -> Player:
+        """包んでいるプレイヤーを返す"""
+        return self.__player
+
+    @property
+    def name(self) -> str:
+        """プレイヤーの名前を返す"""
+        return self.__player.name
+
+    async def select_action(self, available_actions: ActionList) -> Action:
+        """包んでいるプレイヤーに行動を選択させて返す"""
+        if self.__blocking:
+            return await asyncio.to_thread(
+                self.__player.select_action, available_actions
+            )
+        return self.__player.select_action(available_actions)
+
+
+class AsyncGame:
+    def __init__(
+        self,
+        deal: Deal,
+        player0: AsyncPlayer,
+        player1: AsyncPlayer,
+        event_bus: Optional[EventBus] = None,
+    ) -> None:
+        """
+        ゲームを初期化する
+        イベントバスが渡されなかった場合は、ゲームごとに作る
+        """
+        self.__deal = deal
+        self.__player0 = player0
+        self.__player1 = player1
+        self.__event_bus = EventBus() if event_bus is None else event_bus
+        self.__observers = ObserverRegistry(self.__event_bus)
+
+    @property
+    def event_bus(self) -> EventBus:
+        """イベントバスを返す"""
+        return self.__event_bus
+
+    @property
+    def observer_count(self) -> int:
+        """生きているオブザーバの数を返す（診断用）"""
+        return self.__observers.observer_count
+
+    def add_observer(
+        self,
+        observer: GameObserver,
+        priority: int = 0,
+        asynchronous: bool = False,
+        weak: bool = False,
+    ) -> None:
+        """
+        オブザーバを追加する（Game.add_observer()と同じ）
+        オブザーバには、SyncPlayerAdapterで包んだプレイヤーは包む前のものが渡される
+        """
+        self.__observers.add(observer, priority, asynchronous, weak)
+
+    def remove_observer(self, observer: GameObserver) -> None:
+        """
+        オブザーバを取り除く
+        追加されていない場合はKeyError
+        """
+        self.__observers.remove(observer)
+
+    async def start(self) -> AsyncPlayer:
+        """
+        ゲームを開始し、勝ったプレイヤーを返す
+        ゲームが終わると、まとめて購読しているものに溜めたイベントを渡し、
+        非同期のオブザーバの処理が終わるまで待つ
+        非同期のオブザーバを待つ間は、別スレッドで待つのでほかのタスクも進む
+        """
+        players = (self.__player0, self.__player1)
+        event_players = (
+            self.__get_event_player(self.__player0),
+            self.__get_event_player(self.__player1),
+        )
+        state = GameState(self.__deal)
+        event_bus = self.__event_bus
+
+        try:
+            while True:
+                turn = state.turn
+                action = await players[turn].select_action(state.available_actions)
+                is_hit = state.apply(action)
+
+                # 購読者がいないイベントは作らない
+                if isinstance(action, AskAction):
+                    if event_bus.has_subscribers(AskEvent):
+                        event_player = event_players[turn]
+                        await self.__publish(AskEvent(event_player, action, is_hit))
+                else:
+                    if event_bus.has_subscribers(GuessEvent):
+                        event_player = event_players[turn]
+                        await self.__publish(GuessEvent(event_player, action, is_hit))
+                    return players[cast(int, state.winner)]
+        finally:
+            # 非同期の購読者の処理を待つ間も、イベントループを止めない
+            # （ほかのゲームも同じバスに発行しているので、処理待ちの有無では決めない）
+            if event_bus.has_async_subscribers or event_bus.has_async_work:
+                await asyncio.to_thread(event_bus.flush)
+            else:
+                event_bus.flush()
+
+    async def __publish(self, event: Union[AskEvent, GuessEvent]) -> None:
+        # 非同期の購読者の処理待ちがいっぱいのときは、空きを別スレッドで待つ
+        event_bus = self.__event_bus
+        if event_bus.is_backlogged:
+            await asyncio.to_thread(event_bus.publish, event)
+        else:
+            event_bus.publish(event)
+
+    @staticmethod
+    def __get_event_player(player: AsyncPlayer) -> Player:
+        # オブザーバは名前と同一性しか使わないので、
+        # 非同期のプレイヤーはそのまま渡す
+        if isinstance(player, SyncPlayerAdapter):
+            return player.player
+        return cast(Player, player)
+
+
+if __name__ == "__main__":
+    import time
+
+    from card import Dealer
+    from player import RandomAI
+
+    class RemoteBot(AsyncPlayer):
+        """通信の待ち時間があるボットの代わり"""
+
+        def __init__(self, name: str, random_state: int) -> None:
+            self.__player = RandomAI(name, random_state)
+
+        @property
+        def name(self) -> str:
+            return self.__player.name
+
+        async def select_action(self, available_actions: ActionList) -> Action:
+            await asyncio.sleep(0.01)
+            return self.__player.select_action(available_actions)
+
+    async def play_all(game_count: int) -> list[str]:
+        dealer = Dealer(0, counter_based=True)
+        games = []
+        for i in range(game_count):
+            player0 = SyncPlayerAdapter(RandomAI("Player0", i))
+            player1 = RemoteBot("Player1", i)
+            games.append(AsyncGame(dealer.deal_at(i), player0, player1).start())
+        winners = await asyncio.gather(*games)
+        return [winner.name for winner in winners]
+
+    game_count = 10000
+    start = time.perf_counter()
+    names = asyncio.run(play_all(game_count))
+    elapsed = time.perf_counter() - start
+    print(f"{game_count} games with 10ms bot latency: {elapsed:.2f} sec")
+    print(f"Player0 won {names.count('Player0')} games.")
@@ -0,0 +1,107 @@
+# NumPyを使って多数のディールをまとめて扱う
+# NumPyが必要なのはこのモジュールだけ
+
+from typing import ClassVar, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from card import Card, Deal
+
+IndexArray = npt.NDArray[np.int64]
+MaskArray = npt.NDArray[np.uint16]
+CardMatrix = npt.NDArray[np.bool_]
+
+
+class DealBatch:
+    # 番号順のディールの、先手の手札、後手の手札、残りのカードのビットマスク
+    __mask_table: ClassVar[Optional[npt.NDArray[np.uint16]]] = None
+
+    def __init__(self, indices: IndexArray) -> None:
+        """ディールの番号の配列からディールの一覧を初期化する"""
+        table = self.get_mask_table()
+        self.__indices = indices
+        self.__player0_masks: MaskArray = table[indices, 0]
+        self.__player1_masks: MaskArray = table[indices, 1]
+        self.__rest_masks: MaskArray = table[indices, 2]
+
+    @property
+    def indices(self) -> IndexArray:
+        """ディールの番号の配列を返す"""
+        return self.__indices
+
+    @property
+    def player0_masks(self) -> MaskArray:
+        """先手の手札のビットマスクの配列を返す"""
+        return self.__player0_masks
+
+    @property
+    def player1_masks(self) -> MaskArray:
+        """後手の手札のビットマスクの配列を返す"""
+        return self.__player1_masks
+
+    @property
+    def rest_masks(self) -> MaskArray:
+        """残ったカードのビットの配列を返す"""
+        return self.__rest_masks
+
+    @property
+    def rest_numbers(self) -> npt.NDArray[np.int64]:
+        """残ったカードの数字の配列を返す"""
+        return np.log2(self.__rest_masks).astype(np.int64) + Card.MIN_NUMBER
+
+    @staticmethod
+    def get_card_matrix(masks: MaskArray) -> CardMatrix:
+        """
+        ビットマスクの配列を、各行が1つのディール、
+        各列がカード（1〜9）に対応する真偽値の行列にして返す
+        """
+        bits = np.arange(Card.MAX_NUMBER - Card.MIN_NUMBER + 1, dtype=np.uint16)
+        return ((masks[:, np.newaxis] >> bits) & 1).astype(np.bool_)
+
+    def get_deal(self, i: int) -> Deal:
+        """i番目のディールを返す"""
+        return Deal.from_index(int(self.__indices[i]))
+
+    def __len__(self) -> int:
+        """ディールの数を返す"""
+        return len(self.__indices)
+
+    @classmethod
+    def get_mask_table(cls) -> npt.NDArray[np.uint16]:
+        """ディールの番号からビットマスクを引く表（630行x3列）を返す"""
+        if cls.__mask_table is None:
+            cls.__mask_table = np.array(
+                [
+                    [deal.player0_mask, deal.player1_mask, deal.rest_mask]
+                    for deal in Deal.get_all_deals()
+                ],
+                dtype=np.uint16,
+            )
+        return cls.__mask_table
+
+    @classmethod
+    def generate(cls, generator: np.random.Generator, count: int) -> "DealBatch":
+        """乱数生成器を使ってcount個のディールを一様に選んで返す"""
+        assert count >= 0, f"Invalid count. (count: {count})"
+        indices = generator.integers(0, Deal.COUNT, size=count, dtype=np.int64)
+        return cls(indices)
+
+
+if __name__ == "__main__":
+    import time
+
+    from card import Dealer
+
+    dealer = Dealer(0)
+    batch = dealer.deal_batch(5)
+    for i in range(len(batch)):
+        print(f"{batch.player0_masks[i]:09b}", f"{batch.player1_masks[i]:09b}", end=" ")
+        print(batch.rest_numbers[i], batch.get_deal(i))
+    print(batch.get_card_matrix(batch.player0_masks).astype(int))
+
+    count = 10_000_000
+    start = time.perf_counter()
+    dealer.deal_batch(count)
+    elapsed = time.perf_counter() - start
+    print(f"{count / elapsed:,.0f} deals/sec")
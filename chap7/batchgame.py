@@ -0,0 +1,334 @@
+# 多数のゲームをNumPyの配列で同時に進めるシミュレータ
+#
+# N個のゲームを配列（手札のビットマスク、残りのカード、直前の質問）で持ち、
+# 1ステップで全ゲームを1手ずつ進める
+# 終わったゲームはステップごとに配列から取り除く（勝者の配列が終了フラグを兼ねる）
+# すべてのゲームは先手から始まって1手ずつ進むので、手番は全ゲームで共通になる
+# カードは0〜8の番号（カードの数字-1、ビットマスクのビットの位置）で表す
+# NumPyが必要
+
+from typing import Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from batch import DealBatch, MaskArray
+from card import Card, Dealer
+
+BoolArray = npt.NDArray[np.bool_]
+CardArray = npt.NDArray[np.int64]
+
+# 直前の質問がないことを表すカードの番号
+NO_CARD = -1
+
+__BITS = np.arange(Card.MAX_NUMBER - Card.MIN_NUMBER + 1, dtype=np.uint16)
+__POPCOUNTS = np.array(
+    [Card.count_mask(mask) for mask in range(Card.ALL_MASK + 1)], dtype=np.int64
+)
+
+
+def count_bits(masks: MaskArray) -> npt.NDArray[np.int64]:
+    """ビットマスクの配列の各要素のカードの枚数を返す"""
+    return __POPCOUNTS[masks]
+
+
+def choose_bits(masks: MaskArray, generator: np.random.Generator) -> CardArray:
+    """
+    ビットマスクの配列の各要素から、立っているビットを一様に1つ選んで
+    カードの番号の配列として返す
+    ビットが立っていない要素はNO_CARD
+    """
+    bits = (masks[:, np.newaxis] >> __BITS) & 1
+    counts = bits.sum(axis=1)
+    ranks = (generator.random(len(masks)) * counts).astype(np.int64)
+    cards = np.argmax(bits.cumsum(axis=1) > ranks[:, np.newaxis], axis=1)
+    return np.where(counts > 0, cards, NO_CARD)
+
+
+def to_masks(cards: CardArray) -> MaskArray:
+    """カードの番号の配列をビットマスクの配列にして返す（NO_CARDは0）"""
+    masks = np.left_shift(1, np.maximum(cards, 0)).astype(np.uint16)
+    return np.where(cards >= 0, masks, 0).astype(np.uint16)
+
+
+class BatchPlayer(Protocol):
+    def reset(self, hand_masks: MaskArray) -> None:
+        """新しいゲームの一覧の手札で状態を初期化する"""
+        ...
+
+    def select_actions(
+        self, hand_masks: MaskArray, prev_cards: CardArray
+    ) -> tuple[BoolArray, CardArray]:
+        """
+        各ゲームで行動を選択し、推測かどうかとカードの番号の配列を返す
+        直前の質問がない（NO_CARD）ゲームでは質問しか選べない
+        """
+        ...
+
+    def actions_done(
+        self,
+        is_mine: bool,
+        is_guess: BoolArray,
+        cards: CardArray,
+        is_hit: BoolArray,
+    ) -> None:
+        """各ゲームで行動が行われたときに実行される"""
+        ...
+
+    def keep_games(self, running: BoolArray) -> None:
+        """終わったゲームの状態を取り除き、runningがTrueのゲームだけを残す"""
+        ...
+
+
+class BatchRandomAI(BatchPlayer):
+    def __init__(self, generator: np.random.Generator) -> None:
+        """ランダム選択のAI（RandomAIと同じ振る舞い）を初期化する"""
+        self.__generator = generator
+
+    def reset(self, hand_masks: MaskArray) -> None:
+        """状態を持たないので何もしない"""
+        pass
+
+    def select_actions(
+        self, hand_masks: MaskArray, prev_cards: CardArray
+    ) -> tuple[BoolArray, CardArray]:
+        """選択可能な行動から一様にランダムに選んで返す"""
+        # 質問は直前に質問されたカード以外、推測は手札にないカード
+        ask_masks = (Card.ALL_MASK & ~to_masks(prev_cards)).astype(np.uint16)
+        guess_masks = np.where(prev_cards >= 0, Card.ALL_MASK & ~hand_masks, 0).astype(
+            np.uint16
+        )
+        ask_counts = count_bits(ask_masks)
+        total_counts = ask_counts + count_bits(guess_masks)
+        ranks = (self.__generator.random(len(hand_masks)) * total_counts).astype(
+            np.int64
+        )
+        is_guess = ranks >= ask_counts
+        # 選ばれた方の一覧から一様に選べば、全体から一様に選んだのと同じ
+        masks = np.where(is_guess, guess_masks, ask_masks).astype(np.uint16)
+        return is_guess, choose_bits(masks, self.__generator)
+
+    def actions_done(
+        self,
+        is_mine: bool,
+        is_guess: BoolArray,
+        cards: CardArray,
+        is_hit: BoolArray,
+    ) -> None:
+        """状態を持たないので何もしない"""
+        pass
+
+    def keep_games(self, running: BoolArray) -> None:
+        """状態を持たないので何もしない"""
+        pass
+
+
+class BatchSmartAI(BatchPlayer):
+    def __init__(self, generator: np.random.Generator) -> None:
+        """賢いAI（SmartAIと同じアルゴリズム）を初期化する"""
+        self.__generator = generator
+        empty = np.zeros(0, dtype=np.uint16)
+        # 伏せられたカードの候補、ブラフに使えるカード、次に推測するカード
+        self.__rest_masks: MaskArray = empty
+        self.__bluff_masks: MaskArray = empty
+        self.__maybe_cards: CardArray = np.zeros(0, dtype=np.int64)
+
+    def reset(self, hand_masks: MaskArray) -> None:
+        """手札から状態を初期化する"""
+        self.__rest_masks = (Card.ALL_MASK & ~hand_masks).astype(np.uint16)
+        self.__bluff_masks = hand_masks.copy()
+        self.__maybe_cards = np.full(len(hand_masks), NO_CARD, dtype=np.int64)
+
+    def select_actions(
+        self, hand_masks: MaskArray, prev_cards: CardArray
+    ) -> tuple[BoolArray, CardArray]:
+        """SmartAI.select_action()と同じ手順で行動を選択して返す"""
+        count = len(hand_masks)
+        rest_counts = count_bits(self.__rest_masks)
+        bluff_counts = count_bits(self.__bluff_masks)
+        can_guess = prev_cards >= 0
+
+        # 1. 候補が1枚、もしくは次に推測するカードがあるなら推測する
+        sure_guess = (rest_counts == 1) | (self.__maybe_cards >= 0)
+        sure_cards = np.where(
+            rest_counts == 1,
+            choose_bits(self.__rest_masks, self.__generator),
+            self.__maybe_cards,
+        )
+        # 2. 推測可能なら確率で推測する（候補がなければ手札にないカードから）
+        guess_th = 1 / np.maximum(rest_counts, 1)
+        may_guess = can_guess & (
+            (rest_counts == 0) | (self.__generator.random(count) <= guess_th)
+        )
+        guess_masks = np.where(
+            rest_counts > 0, self.__rest_masks, Card.ALL_MASK & ~hand_masks
+        ).astype(np.uint16)
+        guess_cards = choose_bits(guess_masks, self.__generator)
+        # 3. 可能なら確率でブラフする
+        bluff_th = (5 - bluff_counts) / 20
+        may_bluff = (bluff_counts > 0) & (self.__generator.random(count) <= bluff_th)
+        bluff_cards = choose_bits(self.__bluff_masks, self.__generator)
+        # 4. そうでなければ候補から質問する
+        ask_cards = choose_bits(self.__rest_masks, self.__generator)
+
+        is_guess = sure_guess | (~sure_guess & may_guess)
+        cards = np.select(
+            [sure_guess, may_guess, may_bluff], [sure_cards, guess_cards, bluff_cards]
+        )
+        cards = np.where(sure_guess | may_guess | may_bluff, cards, ask_cards)
+        return is_guess, cards
+
+    def actions_done(
+        self,
+        is_mine: bool,
+        is_guess: BoolArray,
+        cards: CardArray,
+        is_hit: BoolArray,
+    ) -> None:
+        """SmartAI.player_asked()と同じ手順で状態を更新する"""
+        # 推測されたらゲームは終わるので、質問だけを扱う
+        asked = ~is_guess
+        card_masks = to_masks(cards)
+        in_bluff = (self.__bluff_masks & card_masks) != 0
+        in_rest = (self.__rest_masks & card_masks) != 0
+
+        # ブラフに使えるカードから除外
+        self.__bluff_masks = np.where(
+            asked & in_bluff, self.__bluff_masks & ~card_masks, self.__bluff_masks
+        ).astype(np.uint16)
+
+        if is_mine:
+            # ブラフでない質問なら候補から除外し、外れたら次に推測する
+            asked_rest = asked & ~in_bluff
+            self.__rest_masks = np.where(
+                asked_rest, self.__rest_masks & ~card_masks, self.__rest_masks
+            ).astype(np.uint16)
+            self.__maybe_cards = np.where(
+                asked_rest & ~is_hit, cards, self.__maybe_cards
+            )
+        else:
+            # 外れた質問が候補にあれば、確率でブラフでないと判断する
+            missed = asked & ~is_hit & in_rest
+            not_bluff_th = 1 / np.maximum(count_bits(self.__rest_masks), 1)
+            not_bluff = self.__generator.random(len(cards)) <= not_bluff_th
+            self.__maybe_cards = np.where(missed & not_bluff, cards, self.__maybe_cards)
+            self.__rest_masks = np.where(
+                missed & ~not_bluff, self.__rest_masks & ~card_masks, self.__rest_masks
+            ).astype(np.uint16)
+
+    def keep_games(self, running: BoolArray) -> None:
+        """終わったゲームの状態を取り除く"""
+        self.__rest_masks = self.__rest_masks[running]
+        self.__bluff_masks = self.__bluff_masks[running]
+        self.__maybe_cards = self.__maybe_cards[running]
+
+
+class BatchGame:
+    def __init__(self, player0: BatchPlayer, player1: BatchPlayer) -> None:
+        """まとめてゲームを行うシミュレータを初期化する"""
+        self.__players = (player0, player1)
+
+    def play(self, deals: DealBatch) -> npt.NDArray[np.int64]:
+        """ディールの一覧のゲームをすべて行い、各ゲームの勝者（0か1）を返す"""
+        count = len(deals)
+        # 進行中のゲームの元の位置と、その状態
+        # 終わったゲームは配列から取り除き、勝者（終了前は-1）だけを残す
+        indices = np.arange(count)
+        hand_masks = (deals.player0_masks, deals.player1_masks)
+        rest_masks = deals.rest_masks
+        prev_cards = np.full(count, NO_CARD, dtype=np.int64)
+        winners = np.full(count, -1, dtype=np.int64)
+        for player, masks in zip(self.__players, hand_masks):
+            player.reset(masks)
+
+        turn = 0
+        while len(indices) > 0:
+            is_guess, cards = self.__players[turn].select_actions(
+                hand_masks[turn], prev_cards
+            )
+            card_masks = to_masks(cards)
+            is_hit = np.where(
+                is_guess,
+                card_masks == rest_masks,
+                (hand_masks[turn ^ 1] & card_masks) != 0,
+            )
+            for seat, player in enumerate(self.__players):
+                player.actions_done(seat == turn, is_guess, cards, is_hit)
+
+            winners[indices[is_guess & is_hit]] = turn
+            winners[indices[is_guess & ~is_hit]] = turn ^ 1
+
+            running = ~is_guess
+            indices = indices[running]
+            hand_masks = (hand_masks[0][running], hand_masks[1][running])
+            rest_masks = rest_masks[running]
+            prev_cards = cards[running]
+            for player in self.__players:
+                player.keep_games(running)
+            turn ^= 1
+        return winners
+
+    def play_many(
+        self, dealer: Dealer, game_count: int, batch_size: int = 100000
+    ) -> tuple[int, int]:
+        """
+        ディーラーが配るgame_count個のゲームをbatch_sizeずつ行い、
+        各プレイヤーの勝った回数を返す
+        """
+        assert batch_size > 0, f"Invalid batch size. (size: {batch_size})"
+        win_counts = [0, 0]
+        rest_count = game_count
+        while rest_count > 0:
+            size = min(batch_size, rest_count)
+            winners = self.play(dealer.deal_batch(size))
+            player1_win_count = int(winners.sum())
+            win_counts[0] += size - player1_win_count
+            win_counts[1] += player1_win_count
+            rest_count -= size
+        return win_counts[0], win_counts[1]
+
+
+if __name__ == "__main__":
+    import time
+
+    from headless import HeadlessGame
+    from player import Player, RandomAI
+    from seed import derive_seed
+    from smartai import SmartAI
+
+    generator = np.random.default_rng(0)
+    game_count = 1_000_000
+    for name, batch_player0 in [
+        ("random", BatchRandomAI(generator)),
+        ("smart", BatchSmartAI(generator)),
+    ]:
+        batch_game = BatchGame(batch_player0, BatchRandomAI(generator))
+        start = time.perf_counter()
+        win_counts = batch_game.play_many(Dealer(0), game_count)
+        elapsed = time.perf_counter() - start
+        print(f"{name} vs random (batch):")
+        print(f"  Player0 win rate: {win_counts[0] * 100 / game_count:6.2f}%")
+        print(f"  {game_count / elapsed:,.0f} games/sec")
+
+        # chap7のクラスと比べる
+        dealer = Dealer(1)
+        scalar_count = 100000
+        scalar_win_count = 0
+        start = time.perf_counter()
+        for i in range(scalar_count):
+            deal = dealer.deal_at(i)
+            player0: Player
+            if name == "smart":
+                player0 = SmartAI("Player0", deal.player0_hand, derive_seed(1, i))
+                observers = [player0]
+            else:
+                player0 = RandomAI("Player0", derive_seed(1, i))
+                observers = []
+            player1 = RandomAI("Player1", derive_seed(1, "player1", i))
+            headless = HeadlessGame(player0, player1, observers)
+            if headless.play(deal) == 0:
+                scalar_win_count += 1
+        elapsed = time.perf_counter() - start
+        print(f"{name} vs random (chap7 classes):")
+        print(f"  Player0 win rate: {scalar_win_count * 100 / scalar_count:6.2f}%")
+        print(f"  {scalar_count / elapsed:,.0f} games/sec")
@@ -0,0 +1,102 @@
+# カードと行動のフライウェイト化の効果を測るベンチマーク
+#
+# chap6（カードや行動を毎回生成する実装）とchap7（共有インスタンスを返す実装）で
+# ランダムAI同士の対戦を同じ回数だけ行い、次の値を比較する：
+# - 1ゲームあたりの時間
+# - カードと行動のオブジェクトが実際に生成された数
+# - tracemallocで測ったメモリのピーク
+# - カード1枚あたりのメモリ
+
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+
+def measure(chapter_dir: str, game_count: int) -> None:
+    """指定された章のコードで対戦を繰り返して計測結果を出力する"""
+    sys.path.insert(0, chapter_dir)
+    from action import AskAction, GuessAction
+    from card import Card, Dealer
+    from game import Game
+    from player import RandomAI
+
+    card = Card(1)
+    card_size = sys.getsizeof(card)
+    if hasattr(card, "__dict__"):
+        card_size += sys.getsizeof(card.__dict__)
+
+    dealer = Dealer()
+    player0 = RandomAI("Player0", 0)
+    player1 = RandomAI("Player1", 1)
+
+    def run() -> None:
+        for _ in range(game_count):
+            deal = dealer.deal()
+            game = Game(deal, player0, player1)
+            game.start()
+
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 生成されたオブジェクトを保持して数える
+    # （保持しないとidが再利用されて数えられない）
+    created: dict[int, Any] = {}
+    for cls in [Card, AskAction, GuessAction]:
+        original_new = cls.__new__
+
+        def counting_new(
+            cls_: type, *args: Any, original_new: Any = original_new
+        ) -> Any:
+            obj: Any
+            if original_new is object.__new__:
+                obj = original_new(cls_)
+            else:
+                obj = original_new(cls_, *args)
+            created[id(obj)] = obj
+            return obj
+
+        cls.__new__ = staticmethod(counting_new)  # type: ignore
+    run()
+
+    print(f"  time/game     : {elapsed * 1e6 / game_count:8.2f} us")
+    print(f"  objects/game  : {len(created) / game_count:8.2f}")
+    print(f"  peak memory   : {peak / 1024:8.2f} KiB")
+    print(f"  size of card  : {card_size:8d} B")
+
+
+def main(game_count: int) -> None:
+    """メイン"""
+    assert game_count > 0, f"Invalid game count. (count: {game_count})"
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for label, chapter in [("without flyweight", "chap6"), ("with flyweight", "chap7")]:
+        chapter_dir = os.path.join(base_dir, "..", chapter)
+        print(f"{chapter} ({label}):", flush=True)
+        subprocess.run(
+            [sys.executable, __file__, str(game_count), "--measure", chapter_dir],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game_count", type=int)
+    parser.add_argument("--measure", metavar="CHAPTER_DIR")
+
+    args = parser.parse_args()
+    if args.measure is None:
+        main(args.game_count)
+    else:
+        measure(os.path.abspath(args.measure), args.game_count)
@@ -0,0 +1,107 @@
+# ゲームとプレイヤーを使い回す（プールする）効果を測るベンチマーク
+#
+# 賢いAI同士の対戦を同じディール、同じシードで
+# - 毎回Game、プレイヤーを作り、オブザーバを登録する
+# - GamePoolから取り出してreset()で使い回す
+# の2通りで行い、次の値を比較する：
+# - 1ゲームあたりの時間
+# - 1000ゲームあたりのGCの実行回数（世代別）
+# - tracemallocで測ったメモリの増え方（区間ごとの現在値）
+
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+from card import Deal, Dealer
+from game import Game
+from pool import GamePool
+from seed import derive_seed
+from smartai import SmartAI
+
+
+def create_game(deal: Deal) -> Game:
+    """賢いAI同士のゲームを作って返す"""
+    player0 = SmartAI("Player0", deal.player0_hand)
+    player1 = SmartAI("Player1", deal.player1_hand)
+    game = Game(deal, player0, player1)
+    game.add_observer(player0)
+    game.add_observer(player1)
+    return game
+
+
+def run_fresh(deals: list[Deal]) -> list[int]:
+    """毎回ゲームを作って対戦し、勝ったプレイヤーの番号を返す"""
+    winners = []
+    for i, deal in enumerate(deals):
+        player0 = SmartAI("Player0", deal.player0_hand, derive_seed(0, i, 0))
+        player1 = SmartAI("Player1", deal.player1_hand, derive_seed(0, i, 1))
+        game = Game(deal, player0, player1)
+        game.add_observer(player0)
+        game.add_observer(player1)
+        winners.append(0 if game.start() is player0 else 1)
+    return winners
+
+
+def run_pooled(deals: list[Deal]) -> list[int]:
+    """プールしたゲームを使い回して対戦し、勝ったプレイヤーの番号を返す"""
+    pool = GamePool(create_game)
+    winners = []
+    for i, deal in enumerate(deals):
+        game = pool.acquire(deal, (derive_seed(0, i, 0), derive_seed(0, i, 1)))
+        winners.append(0 if game.start() is game.player0 else 1)
+        pool.release(game)
+    return winners
+
+
+def measure(
+    name: str, run: Callable[[list[Deal]], list[int]], deals: list[Deal]
+) -> None:
+    """対戦を繰り返して計測結果を出力する"""
+    gc.collect()
+    start = time.perf_counter()
+    run(deals)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    before = [stat["collections"] for stat in gc.get_stats()]
+    run(deals)
+    after = [stat["collections"] for stat in gc.get_stats()]
+    per_1000 = [(a - b) * 1000 / len(deals) for a, b in zip(after, before)]
+
+    # 区間ごとのメモリの現在値が増え続けないことを確かめる
+    tracemalloc.start()
+    chunk_count = 4
+    currents = []
+    for chunk in range(chunk_count):
+        run(deals[chunk::chunk_count])
+        currents.append(tracemalloc.get_traced_memory()[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name}:")
+    print(f"  time          : {elapsed * 1e6 / len(deals):8.2f} us/game")
+    gc_str = ", ".join(f"{count:.2f}" for count in per_1000)
+    print(f"  gc/1000 games : gen0-2 = {gc_str}")
+    current_str = ", ".join(f"{current / 1024:.1f}" for current in currents)
+    print(f"  traced memory : {current_str} KiB (peak {peak / 1024:.1f} KiB)")
+
+
+def main(game_count: int) -> None:
+    """メイン"""
+    assert game_count > 0, f"Invalid game count. (count: {game_count})"
+    dealer = Dealer(0, counter_based=True)
+    deals = [dealer.deal_at(i) for i in range(game_count)]
+    assert run_fresh(deals) == run_pooled(deals), "Results differ."
+    measure("fresh ", run_fresh, deals)
+    measure("pooled", run_pooled, deals)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game_count", type=int)
+
+    args = parser.parse_args()
+    main(args.game_count)
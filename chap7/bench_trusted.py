@@ -0,0 +1,76 @@
+# チェックを省いた生成（信頼できる生成）の効果を測るベンチマーク
+#
+# ディーラーが配ったカードから手札とディールを作るときに、
+# - 通常の生成（Hand()、Deal()でチェックする）
+# - 信頼できる生成（Hand.from_trusted_mask()、Deal.from_trusted()）
+# の時間を比較し、1ゲームあたりの時間に対してどれだけ減ったかを出力する
+
+import random
+import time
+
+from card import Card, Deal, Dealer, Hand
+from game import Game
+from player import RandomAI
+
+
+def create_deal_checked(cards: list[Card]) -> Deal:
+    """通常の生成でディールを作って返す"""
+    player0_hand = Hand(cards[:4])
+    player1_hand = Hand(cards[4:8])
+    return Deal(player0_hand, player1_hand, cards[-1])
+
+
+def create_deal_trusted(cards: list[Card]) -> Deal:
+    """信頼できる生成でディールを作って返す"""
+    player0_mask = 0
+    for card in cards[:4]:
+        player0_mask |= card.mask
+    rest_card = cards[-1]
+    player1_mask = Card.ALL_MASK & ~(player0_mask | rest_card.mask)
+    player0_hand = Hand.from_trusted_mask(player0_mask)
+    player1_hand = Hand.from_trusted_mask(player1_mask)
+    return Deal.from_trusted(player0_hand, player1_hand, rest_card)
+
+
+def main(game_count: int) -> None:
+    """メイン"""
+    assert game_count > 0, f"Invalid game count. (count: {game_count})"
+    rng = random.Random(0)
+    all_cards = Card.get_all_cards()
+    shuffled = [rng.sample(all_cards, len(all_cards)) for _ in range(game_count)]
+
+    start = time.perf_counter()
+    for cards in shuffled:
+        create_deal_checked(cards)
+    checked_time = (time.perf_counter() - start) / game_count
+
+    start = time.perf_counter()
+    for cards in shuffled:
+        create_deal_trusted(cards)
+    trusted_time = (time.perf_counter() - start) / game_count
+
+    dealer = Dealer(0)
+    player0 = RandomAI("Player0", 0)
+    player1 = RandomAI("Player1", 1)
+    start = time.perf_counter()
+    for _ in range(game_count):
+        Game(dealer.deal(), player0, player1).start()
+    game_time = (time.perf_counter() - start) / game_count
+
+    saving = checked_time - trusted_time
+    print(f"checked deal : {checked_time * 1e6:8.2f} us/game")
+    print(f"trusted deal : {trusted_time * 1e6:8.2f} us/game")
+    print(f"whole game   : {game_time * 1e6:8.2f} us/game (with trusted deal)")
+    print(
+        f"saving       : {saving * 1e6:8.2f} us/game ({saving * 100 / game_time:.1f}%)"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game_count", type=int)
+
+    args = parser.parse_args()
+    main(args.game_count)
@@ -1 +0,0 @@
-../chap4/card.py
\ No newline at end of file
@@ -0,0 +1,563 @@
+import random
+from itertools import combinations
+from typing import TYPE_CHECKING, Any, ClassVar, Iterator, Optional, cast
+
+from seed import derive_seed
+
+if TYPE_CHECKING:
+    from batch import DealBatch
+
+
+class Card:
+    MIN_NUMBER = 1
+    MAX_NUMBER = 9
+    # すべてのカードを表すビットマスク
+    ALL_MASK = (1 << (MAX_NUMBER - MIN_NUMBER + 1)) - 1
+
+    __slots__ = ("__number", "__mask")
+    __number: int
+    __mask: int
+    # 数字ごとに共有されるインスタンス
+    __instances: ClassVar[dict[int, "Card"]] = {}
+    # ビットマスクからカードの並びを引く表
+    __cards_table: ClassVar[tuple[tuple["Card", ...], ...]] = ()
+
+    def __new__(cls, number: int) -> "Card":
+        """
+        カードを返す
+        同じ数字のカードは常に同じインスタンスになる
+        不正な値の場合はValueError
+        （外部からの入力をここで検証するので、-Oでassertを無効にしても検証する）
+        """
+        # Trueは1と同じキーで引けてしまうので、表を引く前に型を確かめる
+        if isinstance(number, bool) or not isinstance(number, int):
+            raise ValueError(f"Invalid number. (number: {number!r})")
+        card = cls.__instances.get(number)
+        if card is None:
+            if not (cls.MIN_NUMBER <= number <= cls.MAX_NUMBER):
+                raise ValueError(f"Invalid number. (number: {number})")
+            card = super().__new__(cls)
+            object.__setattr__(card, "_Card__number", number)
+            object.__setattr__(card, "_Card__mask", 1 << (number - cls.MIN_NUMBER))
+            cls.__instances[number] = card
+        return card
+
+    @property
+    def number(self) -> int:
+        """カードの数字を返す"""
+        return self.__number
+
+    @property
+    def mask(self) -> int:
+        """カードを表すビットを返す"""
+        return self.__mask
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """カードは変更できない"""
+        raise AttributeError(f"Card is immutable. (name: {name})")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """コピーやpickleでも同じインスタンスを返すようにする"""
+        return (Card, (self.__number,))
+
+    def __repr__(self) -> str:
+        """カードを表現する文字列を返す"""
+        return f"Card({self.__number})"
+
+    def __hash__(self) -> int:
+        """カードのハッシュ値を返す"""
+        return hash(self.__number)
+
+    def __eq__(self, other: Any) -> bool:
+        """カードが同じか返す"""
+        return self is other
+
+    def __lt__(self, other: "Card") -> bool:
+        """カードの大小比較"""
+        return self.number < other.number
+
+    @classmethod
+    def get_all_cards(cls) -> list["Card"]:
+        """すべてのカードを生成して返す"""
+        return [cls(number) for number in range(cls.MIN_NUMBER, cls.MAX_NUMBER + 1)]
+
+    @classmethod
+    def get_cards_from_mask(cls, mask: int) -> list["Card"]:
+        """
+        ビットマスクが表すカードを昇順に返す
+        ビットマスクが範囲外の場合はValueError
+        """
+        if not (0 <= mask <= cls.ALL_MASK):
+            raise ValueError(f"Invalid mask. (mask: {mask})")
+        cards_table = cls.__cards_table
+        if not cards_table:
+            # すべてのビットマスク（512通り）についてカードの並びを作っておく
+            # 複数のスレッドから同時に使い始めても作りかけの表が見えないよう、
+            # 手元で作ってから1回の代入で公開する
+            all_cards = cls.get_all_cards()
+            cards_table = tuple(
+                tuple(card for card in all_cards if table_mask & card.mask)
+                for table_mask in range(cls.ALL_MASK + 1)
+            )
+            cls.__cards_table = cards_table
+        return list(cards_table[mask])
+
+    @staticmethod
+    def count_mask(mask: int) -> int:
+        """ビットマスクが表すカードの枚数を返す"""
+        return bin(mask).count("1")
+
+
+class Hand:
+    def __init__(self, cards: list[Card]) -> None:
+        """
+        手札を初期化する
+        カードのリストが不正な場合はValueError
+        （チェックしない場合はfrom_trusted_mask()を使う）
+        """
+        # 手札のチェック
+        if len(cards) != 4:
+            raise ValueError(f"The number of cards is invalid. (cards: {cards})")
+        mask = 0
+        for card in cards:
+            if not isinstance(card, Card):
+                raise ValueError(f"Invalid card. (card: {card!r})")
+            mask |= card.mask
+        if Card.count_mask(mask) != 4:
+            raise ValueError(f"There are the same cards. (cards: {cards})")
+
+        self.__mask = mask
+        self.__cards = sorted(cards)
+
+    @property
+    def cards(self) -> list[Card]:
+        """
+        手札のカード一覧を返す
+        手札はディールを通じて複数のゲームで共有されるので、コピーを返す
+        """
+        return list(self.__cards)
+
+    @property
+    def mask(self) -> int:
+        """手札のカードを表すビットマスクを返す"""
+        return self.__mask
+
+    @property
+    def other_mask(self) -> int:
+        """手札にないカードを表すビットマスクを返す"""
+        return Card.ALL_MASK & ~self.__mask
+
+    def get_other_cards(self) -> list[Card]:
+        """手札にないカードの一覧を返す"""
+        return Card.get_cards_from_mask(self.other_mask)
+
+    def union_mask(self, other: "Hand") -> int:
+        """2つの手札のカードを合わせたビットマスクを返す"""
+        return self.__mask | other.mask
+
+    def has_card(self, card: Card) -> bool:
+        """手札に指定されたカードがあるか返す"""
+        return (self.__mask & card.mask) != 0
+
+    def __repr__(self) -> str:
+        """手札を表現する文字列を返す"""
+        return f"Hand({self.__cards})"
+
+    def __hash__(self) -> int:
+        """手札のハッシュ値を返す"""
+        return hash(self.__mask)
+
+    def __eq__(self, other: Any) -> bool:
+        """手札が同じか返す"""
+        return isinstance(other, Hand) and (self.__mask == other.mask)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "Hand":
+        """
+        ビットマスクから手札を生成して返す
+        不正なビットマスクの場合はValueError
+        """
+        return cls(Card.get_cards_from_mask(mask))
+
+    @classmethod
+    def from_trusted_mask(cls, mask: int) -> "Hand":
+        """
+        正しいと分かっているビットマスクから、チェックせずに手札を生成して返す
+        ゲームの内部で生成したビットマスクにだけ使うこと
+        """
+        hand = cls.__new__(cls)
+        hand.__mask = mask
+        hand.__cards = Card.get_cards_from_mask(mask)
+        return hand
+
+
+class Deal:
+    # ディールの総数（残りのカード9通り x 先手の手札8C4=70通り）
+    COUNT = 630
+
+    # 番号順のディールの一覧と、先手の手札と残りのカードのビットマスクから番号への表
+    # 複数のスレッドから同時に使い始めても作りかけの表が見えないよう、
+    # 2つの表は組にして1回の代入で公開する
+    __table: ClassVar[
+        Optional[tuple[tuple["Deal", ...], dict[tuple[int, int], int]]]
+    ] = None
+
+    def __init__(self, player0_hand: Hand, player1_hand: Hand, rest_card: Card) -> None:
+        """
+        ディールを初期化する
+        手札や残ったカードが不正な場合はValueError
+        （チェックしない場合はfrom_trusted()を使う）
+        """
+        if not (isinstance(player0_hand, Hand) and isinstance(player1_hand, Hand)):
+            raise ValueError(
+                f"Invalid hands. (hands: {player0_hand!r}, {player1_hand!r})"
+            )
+        if not isinstance(rest_card, Card):
+            raise ValueError(f"Invalid rest card. (card: {rest_card!r})")
+        # 使われてるカードのチェック
+        # 4枚+4枚+1枚で9枚すべてが揃っていれば重複もない
+        used_mask = player0_hand.union_mask(player1_hand) | rest_card.mask
+        if used_mask != Card.ALL_MASK:
+            raise ValueError(
+                "Card set is invalid. "
+                f"(used cards: {Card.get_cards_from_mask(used_mask)})"
+            )
+
+        self.__player0_hand = player0_hand
+        self.__player1_hand = player1_hand
+        self.__rest_card = rest_card
+
+    @property
+    def player0_hand(self) -> Hand:
+        """先手の手札を返す"""
+        return self.__player0_hand
+
+    @property
+    def player1_hand(self) -> Hand:
+        """後手の手札を返す"""
+        return self.__player1_hand
+
+    @property
+    def rest_card(self) -> Card:
+        """残ったカードを返す"""
+        return self.__rest_card
+
+    @property
+    def player0_mask(self) -> int:
+        """先手の手札を表すビットマスクを返す"""
+        return self.__player0_hand.mask
+
+    @property
+    def player1_mask(self) -> int:
+        """後手の手札を表すビットマスクを返す"""
+        return self.__player1_hand.mask
+
+    @property
+    def rest_mask(self) -> int:
+        """残ったカードを表すビットを返す"""
+        return self.__rest_card.mask
+
+    @property
+    def index(self) -> int:
+        """ディールの番号（0からCOUNT-1）を返す"""
+        _, indices = Deal.__get_table()
+        return indices[(self.player0_mask, self.rest_mask)]
+
+    def __repr__(self) -> str:
+        """ディールを表現する文字列を返す"""
+        return f"Deal({self.__player0_hand}, {self.__player1_hand}, {self.__rest_card})"
+
+    def __hash__(self) -> int:
+        """ディールのハッシュ値を返す"""
+        return hash((self.player0_mask, self.rest_mask))
+
+    def __eq__(self, other: Any) -> bool:
+        """ディールが同じか返す"""
+        return (
+            isinstance(other, Deal)
+            and (self.player0_mask == other.player0_mask)
+            and (self.rest_mask == other.rest_mask)
+        )
+
+    @classmethod
+    def from_trusted(
+        cls, player0_hand: Hand, player1_hand: Hand, rest_card: Card
+    ) -> "Deal":
+        """
+        正しいと分かっている手札と残ったカードから、チェックせずにディールを生成して返す
+        ゲームの内部で生成した手札とカードにだけ使うこと
+        """
+        deal = cls.__new__(cls)
+        deal.__player0_hand = player0_hand
+        deal.__player1_hand = player1_hand
+        deal.__rest_card = rest_card
+        return deal
+
+    @classmethod
+    def from_index(cls, index: int) -> "Deal":
+        """
+        番号に対応するディールを返す
+        ディールは事前に生成して共有しているものを返す
+        不正な番号の場合はValueError
+        """
+        if not (0 <= index < cls.COUNT):
+            raise ValueError(f"Invalid index. (index: {index})")
+        deals, _ = cls.__get_table()
+        return deals[index]
+
+    @classmethod
+    def get_all_deals(cls) -> list["Deal"]:
+        """すべてのディールを番号順に返す"""
+        deals, _ = cls.__get_table()
+        return list(deals)
+
+    @classmethod
+    def __get_table(
+        cls,
+    ) -> tuple[tuple["Deal", ...], dict[tuple[int, int], int]]:
+        table = cls.__table
+        if table is None:
+            # 同時に作った場合は、後から代入した表が残る（内容は同じ）
+            table = cls.__build_table()
+            cls.__table = table
+        return table
+
+    @classmethod
+    def __build_table(
+        cls,
+    ) -> tuple[tuple["Deal", ...], dict[tuple[int, int], int]]:
+        # 残りのカードの昇順、先手の手札の辞書順に番号を振る
+        all_cards = Card.get_all_cards()
+        deals: list[Deal] = []
+        indices: dict[tuple[int, int], int] = {}
+        for rest_card in all_cards:
+            other_cards = [card for card in all_cards if card is not rest_card]
+            for player0_cards in combinations(other_cards, 4):
+                player0_hand = Hand(list(player0_cards))
+                player1_mask = player0_hand.other_mask & ~rest_card.mask
+                player1_hand = Hand.from_trusted_mask(player1_mask)
+                deal = cls.from_trusted(player0_hand, player1_hand, rest_card)
+                indices[(player0_hand.mask, rest_card.mask)] = len(deals)
+                deals.append(deal)
+        return tuple(deals), indices
+
+
+class Dealer:
+    def __init__(
+        self,
+        random_state: Optional[int] = None,
+        indexed: bool = False,
+        counter_based: bool = False,
+    ) -> None:
+        """
+        ディーラーを初期化する
+        乱数生成器はディーラーごとに持つ
+        indexedがTrueの場合、ディールの番号をランダムに選んで
+        事前に生成されたディールを返す
+        counter_basedがTrueの場合、何ゲーム目かとシードだけから
+        ディールを決める（deal_at()を順番に呼ぶのと同じ）
+        """
+        self.__random = random.Random(random_state)
+        self.__indexed = indexed
+        self.__counter_based = counter_based
+        # シードがなくてもdeal_at()で同じディールを再現できるように、
+        # マスターシードは必ず決めておく
+        if random_state is None:
+            random_state = random.Random().getrandbits(64)
+        self.__master_seed = random_state
+        self.__position = 0
+        # deal_batch()で使うNumPyの乱数生成器（必要になったら作る）
+        self.__np_random: Any = None
+
+    @property
+    def master_seed(self) -> int:
+        """deal_at()で使うマスターシードを返す"""
+        return self.__master_seed
+
+    @property
+    def position(self) -> int:
+        """カウンタベースで次に配るゲームの番号を返す"""
+        return self.__position
+
+    def seek(self, position: int) -> None:
+        """
+        カウンタベースで次に配るゲームの番号を設定する
+        負の番号の場合はValueError
+        """
+        if position < 0:
+            raise ValueError(f"Invalid position. (position: {position})")
+        self.__position = position
+
+    def deal(self) -> Deal:
+        """
+        ディーラーにランダムにカードを配らせて
+        ディールを生成して返す
+        """
+        if self.__counter_based:
+            deal = self.deal_at(self.__position)
+            self.__position += 1
+            return deal
+        if self.__indexed:
+            return Deal.from_index(self.__random.randrange(Deal.COUNT))
+        all_cards = Card.get_all_cards()
+        shuffled_cards = self.__random.sample(all_cards, len(all_cards))
+        # 9枚を分けただけなので、チェックは不要
+        player0_mask = 0
+        for card in shuffled_cards[:4]:
+            player0_mask |= card.mask
+        rest_card = shuffled_cards[-1]
+        player1_mask = Card.ALL_MASK & ~(player0_mask | rest_card.mask)
+        player0_hand = Hand.from_trusted_mask(player0_mask)
+        player1_hand = Hand.from_trusted_mask(player1_mask)
+        return Deal.from_trusted(player0_hand, player1_hand, rest_card)
+
+    def deal_at(self, game_index: int) -> Deal:
+        """
+        マスターシードのもとでgame_index番目のゲームのディールを返す
+        それまでのディールを再生しないので、どの順番で呼んでも同じ結果になる
+        負の番号の場合はValueError
+        """
+        if game_index < 0:
+            raise ValueError(f"Invalid game index. (index: {game_index})")
+        # 64ビットの値を630で割った余りの偏りは無視できる
+        seed = cast(int, derive_seed(self.__master_seed, "deal", game_index))
+        return Deal.from_index(seed % Deal.COUNT)
+
+    def enumerate_deals(self, repeat: int = 1, start: int = 0) -> Iterator[Deal]:
+        """
+        すべてのディールを番号順にrepeat回ずつ並べたうち、start番目以降を返す
+        （それまでのディールをたどらないので、startによらずすぐに始まる）
+        先手と後手の手札を入れ替えたディールも別のディールとして含まれるが、
+        入れ替わるのは手札だけで、どちらのプレイヤーが先手かは変わらない
+        （先手の有利を打ち消すには、guessit_battle_ai.pyの--pairedで席を入れ替える）
+        負の回数や位置の場合はValueError
+        """
+        if repeat < 0:
+            raise ValueError(f"Invalid repeat. (repeat: {repeat})")
+        if start < 0:
+            raise ValueError(f"Invalid start. (start: {start})")
+        all_deals = Deal.get_all_deals()
+        return (all_deals[i % Deal.COUNT] for i in range(start, repeat * Deal.COUNT))
+
+    def stratified_deals(self, count: int, start: int = 0) -> Iterator[Deal]:
+        """
+        ディールごとを層とした層別抽出でcount個のディールを並べたうち、
+        start番目以降を返す（startによらず、並びは同じ）
+        各ディールをcount // COUNT回ずつ返し、
+        余りの分は重複しないようにランダムに選んだディールを返す
+        負の個数や位置の場合はValueError
+        """
+        if count < 0:
+            raise ValueError(f"Invalid count. (count: {count})")
+        if start < 0:
+            raise ValueError(f"Invalid start. (start: {start})")
+        # 検証はすぐに行い、ディールは取り出すときに作る
+        return self.__generate_stratified_deals(count, start)
+
+    def __generate_stratified_deals(self, count: int, start: int) -> Iterator[Deal]:
+        repeat = count // Deal.COUNT
+        full_count = repeat * Deal.COUNT
+        yield from self.enumerate_deals(repeat, min(start, full_count))
+        rest_indices = self.__random.sample(range(Deal.COUNT), count % Deal.COUNT)
+        skip_count = max(start - full_count, 0)
+        for index in sorted(rest_indices)[skip_count:]:
+            yield Deal.from_index(index)
+
+    def deal_batch(self, count: int) -> "DealBatch":
+        """
+        count個のディールをまとめて配り、NumPyの配列として返す
+        乱数はマスターシードから作ったNumPyの乱数生成器を使う
+        NumPyが必要
+        """
+        import numpy as np
+
+        from batch import DealBatch
+
+        if self.__np_random is None:
+            seed = derive_seed(self.__master_seed, "batch")
+            self.__np_random = np.random.default_rng(seed)
+        return DealBatch.generate(self.__np_random, count)
+
+
+if __name__ == "__main__":
+    # Card ----------
+
+    all_cards = Card.get_all_cards()
+    for card in all_cards:
+        print(f"number: {card.number}")
+
+    card1_1 = Card(1)
+    card1_2 = Card(1)
+    card2 = Card(2)
+    assert card1_1 == card1_2
+    assert card1_1 != card2
+    assert card1_2 != card2
+
+    try:
+        Card(Card.MIN_NUMBER - 1)
+    except Exception as e:
+        print(e)
+    try:
+        Card(Card.MAX_NUMBER + 1)
+    except Exception as e:
+        print(e)
+
+    # Hand ----------
+
+    hand = Hand([Card(number) for number in range(1, 5)])
+    print(hand.cards)
+    print(hand.has_card(Card(1)))
+    print(hand.has_card(Card(5)))
+    print(f"{hand.mask:09b}")
+    print(hand.get_other_cards())
+
+    try:
+        Hand([Card(1), Card(2)])
+    except ValueError as e:
+        print(e)
+    try:
+        Hand([Card(number) for number in [1, 2, 3, 1]])
+    except ValueError as e:
+        print(e)
+
+    # Deal ----------
+
+    player0_hand = Hand([Card(i) for i in [1, 5, 7, 8]])
+    player1_hand = Hand([Card(i) for i in [2, 4, 6, 9]])
+    rest_card = Card(3)
+    deal = Deal(player0_hand, player1_hand, rest_card)
+    print(deal.player0_hand.cards)
+    print(deal.player1_hand.cards)
+    print(deal.rest_card)
+
+    try:
+        player0_hand = Hand([Card(i) for i in range(1, 5)])
+        player1_hand = Hand([Card(i) for i in range(4, 8)])
+        rest_card = Card(9)
+        Deal(player0_hand, player1_hand, rest_card)
+    except ValueError as e:
+        print(e)
+
+    # Dealer ----------
+
+    dealer = Dealer()
+
+    deal = dealer.deal()
+    print(deal.player0_hand.cards)
+    print(deal.player1_hand.cards)
+    print(deal.rest_card)
+
+    deal = dealer.deal()
+    print(deal.player0_hand.cards)
+    print(deal.player1_hand.cards)
+    print(deal.rest_card)
+
+    dealer = Dealer(indexed=True)
+
+    deal = dealer.deal()
+    print(deal.index, deal)
+
+    dealer = Dealer(0, counter_based=True)
+
+    for game_index in range(3):
+        print(game_index, dealer.deal().index, dealer.deal_at(game_index).index)
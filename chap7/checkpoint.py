@@ -0,0 +1,120 @@
+# 長い対戦の途中経過を保存するチェックポイント
+#
+# 各ゲームのディールとシードは、対戦全体のシードとゲームの番号だけで決まるので、
+# 乱数の状態の代わりに、対戦の設定、次に行うゲームの番号、それまでの集計を保存すれば
+# 同じ続きから再開できる
+# 一時ファイルに書いてから置き換えるので、書いている途中で落ちても前のものが残る
+
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from stats import DealTally
+
+
+class Checkpoint:
+    # ファイルの形式の版
+    VERSION = 1
+
+    def __init__(
+        self,
+        settings: dict[str, Any],
+        next_game: int,
+        tally: DealTally,
+        record_offset: Optional[int] = None,
+    ) -> None:
+        """
+        チェックポイントを初期化する
+        settingsは対戦の設定、next_gameは次に行うゲームの番号、tallyはそれまでの集計
+        record_offsetは、ゲームごとの記録のファイルのうちnext_gameの手前まで書いた位置
+        （記録していない場合はNone）
+        """
+        self.__settings = settings
+        self.__next_game = next_game
+        self.__tally = tally
+        self.__record_offset = record_offset
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """対戦の設定を返す"""
+        return self.__settings
+
+    @property
+    def next_game(self) -> int:
+        """次に行うゲームの番号を返す"""
+        return self.__next_game
+
+    @property
+    def tally(self) -> DealTally:
+        """それまでの集計を返す"""
+        return self.__tally
+
+    @property
+    def record_offset(self) -> Optional[int]:
+        """記録のファイルの書いた位置を返す"""
+        return self.__record_offset
+
+    def check_settings(self, settings: dict[str, Any]) -> None:
+        """
+        対戦の設定がチェックポイントと同じか確かめる
+        違う場合はValueError
+        """
+        keys = sorted(set(settings) | set(self.__settings))
+        different_keys = [
+            key for key in keys if settings.get(key) != self.__settings.get(key)
+        ]
+        if different_keys:
+            raise ValueError(
+                f"Settings differ from checkpoint. (keys: {', '.join(different_keys)})"
+            )
+
+    def save(self, path: str) -> None:
+        """ファイルに保存する（置き換えはアトミック）"""
+        data = {
+            "version": self.VERSION,
+            "settings": self.__settings,
+            "next_game": self.__next_game,
+            "tally": self.__tally.to_dict(),
+            "record_offset": self.__record_offset,
+        }
+        # 置き換えがアトミックになるよう、一時ファイルは同じディレクトリに作る
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                json.dump(data, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def load(path: str) -> "Checkpoint":
+        """
+        ファイルから読み込んで返す
+        形式が違う場合はValueError
+        """
+        with open(path) as file:
+            data = json.load(file)
+        if data.get("version") != Checkpoint.VERSION:
+            raise ValueError(f"Unknown checkpoint version. (path: {path})")
+        return Checkpoint(
+            data["settings"],
+            data["next_game"],
+            DealTally.from_dict(data["tally"]),
+            data["record_offset"],
+        )
+
+
+if __name__ == "__main__":
+    import sys
+
+    checkpoint = Checkpoint.load(sys.argv[1])
+    tally = checkpoint.tally
+    for key, value in checkpoint.settings.items():
+        print(f"{key}: {value}")
+    print(f"next game: {checkpoint.next_game}")
+    print(f"Player0 won {tally.player0_win_count}/{tally.game_count} games.")
@@ -0,0 +1,355 @@
+# ゲームのイベントを購読者に配送するイベントバス
+#
+# 購読者はイベントの型ごとに登録し、優先度（小さい順）、登録順に通知される
+# 購読者のいないイベントは has_subscribers() で判定でき、
+# イベントを作ること自体を省ける
+# 表示やログのような遅い購読者は、バックグラウンドのスレッドで非同期に処理できる
+
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable, NamedTuple, Optional, TypeVar, Union
+
+from action import AskAction, GuessAction
+from player import Player
+
+Event = TypeVar("Event")
+
+
+class AskEvent(NamedTuple):
+    """プレイヤーが質問したイベント"""
+
+    player: Player
+    ask: AskAction
+    is_hit: bool
+
+
+class GuessEvent(NamedTuple):
+    """プレイヤーが推測したイベント"""
+
+    player: Player
+    guess: GuessAction
+    is_hit: bool
+
+
+class Subscription:
+    def __init__(
+        self,
+        event_type: type,
+        deliver: Callable[[Any], None],
+        priority: int,
+        order: int,
+    ) -> None:
+        """購読を初期化する（EventBusから作られる）"""
+        self.__event_type = event_type
+        self.__deliver = deliver
+        self.__priority = priority
+        self.__order = order
+
+    @property
+    def event_type(self) -> type:
+        """購読しているイベントの型を返す"""
+        return self.__event_type
+
+    @property
+    def deliver(self) -> Callable[[Any], None]:
+        """イベントを渡す関数を返す"""
+        return self.__deliver
+
+    @property
+    def priority(self) -> int:
+        """優先度を返す"""
+        return self.__priority
+
+    @property
+    def sort_key(self) -> tuple[int, int]:
+        """通知する順番を決めるキー（優先度, 登録順）を返す"""
+        return (self.__priority, self.__order)
+
+
+class BatchSubscription(Subscription):
+    def __init__(
+        self,
+        event_type: type,
+        handler: Callable[[list[Any]], None],
+        priority: int,
+        order: int,
+    ) -> None:
+        """イベントをまとめて渡す購読を初期化する（EventBusから作られる）"""
+        self.__events: list[Any] = []
+        self.__handler = handler
+        super().__init__(event_type, self.__events.append, priority, order)
+
+    def flush(self) -> None:
+        """溜めているイベントをまとめて渡す"""
+        if self.__events:
+            events = self.__events.copy()
+            self.__events.clear()
+            self.__handler(events)
+
+
+class AsyncSubscription(Subscription):
+    def __init__(
+        self,
+        event_type: type,
+        deliver: Callable[[Any], None],
+        priority: int,
+        order: int,
+    ) -> None:
+        """
+        バックグラウンドのスレッドで渡す購読を初期化する（EventBusから作られる）
+        deliverはイベントを処理待ちに加える関数
+        """
+        super().__init__(event_type, deliver, priority, order)
+
+
+class BackgroundWorker:
+    def __init__(self, max_queue_size: int) -> None:
+        """
+        イベントをバックグラウンドのスレッドで処理するワーカーを初期化する
+        スレッドは最初のイベントが来たときに起動し、そのあとは止めない
+        （複数のゲームが同じイベントバスを使っても、ほかのゲームの処理を止めない）
+        """
+        self.__queue: queue.Queue[
+            Union[tuple[Callable[[Any], None], Any], threading.Event]
+        ]
+        self.__queue = queue.Queue(max_queue_size)
+        self.__thread: Optional[threading.Thread] = None
+        self.__error: Optional[BaseException] = None
+        # スレッドの起動と例外の受け渡しは、複数のスレッドから行われるので排他する
+        self.__lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """スレッドが動いているか返す"""
+        return self.__thread is not None
+
+    @property
+    def is_full(self) -> bool:
+        """処理待ちがいっぱいで、put()が空きを待つことになるか返す"""
+        return self.__queue.full()
+
+    @property
+    def has_pending(self) -> bool:
+        """処理し終えていないイベントがあるか返す"""
+        return self.__queue.unfinished_tasks > 0
+
+    def put(self, handler: Callable[[Any], None], event: Any) -> None:
+        """
+        イベントを処理待ちに加える
+        キューがいっぱいの場合は、空きができるまで待つ（背圧）
+        """
+        if self.__thread is None:
+            with self.__lock:
+                if self.__thread is None:
+                    thread = threading.Thread(target=self.__run, daemon=True)
+                    thread.start()
+                    self.__thread = thread
+        self.__queue.put((handler, event))
+
+    def join(self) -> None:
+        """
+        それまでに加えたイベントをすべて処理し終えるまで待つ
+        （あとからほかのスレッドが加えたイベントは待たない）
+        処理中に例外が起きていた場合は、最初の例外を送出する
+        """
+        if self.has_pending:
+            # キューは順に処理されるので、目印まで処理されれば、それより前も終わっている
+            done = threading.Event()
+            self.__queue.put(done)
+            done.wait()
+        with self.__lock:
+            error = self.__error
+            self.__error = None
+        if error is not None:
+            raise error
+
+    def __run(self) -> None:
+        while True:
+            item = self.__queue.get()
+            if isinstance(item, threading.Event):
+                self.__queue.task_done()
+                item.set()
+                continue
+            handler, event = item
+            try:
+                handler(event)
+            except BaseException as error:
+                # 例外はjoin()を呼んだスレッドで送出する
+                with self.__lock:
+                    if self.__error is None:
+                        self.__error = error
+            finally:
+                self.__queue.task_done()
+
+
+class EventBus:
+    def __init__(self, max_queue_size: int = 1024) -> None:
+        """
+        イベントバスを初期化する
+        非同期の購読者のイベントは、最大でmax_queue_size個まで溜める
+        """
+        self.__subscriptions: dict[type, list[Subscription]] = {}
+        self.__delivers: dict[type, tuple[Callable[[Any], None], ...]] = {}
+        self.__order = 0
+        self.__worker = BackgroundWorker(max_queue_size)
+        # flush()のたびに探さないよう、まとめて渡す購読を優先度順に並べておく
+        self.__batch_subscriptions: tuple[BatchSubscription, ...] = ()
+        self.__async_subscription_count = 0
+        # 弱参照のオブザーバが消えたときなど、別のスレッドからも購読をやめるので
+        # 購読の変更は排他する（変更中のGCで同じスレッドから呼ばれることもある）
+        self.__lock = threading.RLock()
+
+    def subscribe(
+        self,
+        event_type: type[Event],
+        handler: Callable[[Event], None],
+        priority: int = 0,
+    ) -> Subscription:
+        """
+        イベントの型を購読し、購読を返す
+        イベントは発行されるたびにすぐ渡される
+        """
+        subscription = Subscription(event_type, handler, priority, self.__order)
+        self.__add(subscription)
+        return subscription
+
+    def subscribe_batch(
+        self,
+        event_type: type[Event],
+        handler: Callable[[list[Event]], None],
+        priority: int = 0,
+    ) -> Subscription:
+        """
+        イベントの型をまとめて購読し、購読を返す
+        イベントは溜めておき、flush()のときに発行順のリストで渡される
+        """
+        subscription = BatchSubscription(event_type, handler, priority, self.__order)
+        self.__add(subscription)
+        return subscription
+
+    def subscribe_async(
+        self,
+        event_type: type[Event],
+        handler: Callable[[Event], None],
+        priority: int = 0,
+    ) -> Subscription:
+        """
+        イベントの型を非同期に購読し、購読を返す
+        イベントはバックグラウンドのスレッドで、発行順に渡される
+        次の行動の前にイベントを見る必要がある購読者には使えない
+        """
+        deliver = partial(self.__worker.put, handler)
+        subscription = AsyncSubscription(event_type, deliver, priority, self.__order)
+        self.__add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        購読をやめる
+        まとめて購読していた場合、溜めているイベントは渡さずに捨てる
+        非同期に購読していた場合、処理待ちのイベントはそのまま処理される
+        購読していない場合はValueError
+        """
+        with self.__lock:
+            event_type = subscription.event_type
+            subscriptions = self.__subscriptions.get(event_type, [])
+            subscriptions.remove(subscription)
+            self.__update(event_type)
+
+    @property
+    def is_backlogged(self) -> bool:
+        """
+        非同期の購読者の処理待ちがいっぱいで、
+        発行すると空きができるまで待たされるか返す
+        """
+        return self.__worker.is_full
+
+    @property
+    def has_async_work(self) -> bool:
+        """非同期の購読者の処理待ちがあり、flush()で待たされることがあるか返す"""
+        return self.__worker.has_pending
+
+    @property
+    def has_async_subscribers(self) -> bool:
+        """
+        非同期の購読者がいるか返す
+        ほかのスレッドも同じバスに発行している場合は、
+        has_async_workがFalseでも、直後のflush()で待たされることがある
+        """
+        return self.__async_subscription_count > 0
+
+    def has_subscribers(self, event_type: type) -> bool:
+        """イベントの型に購読者がいるか返す"""
+        return event_type in self.__delivers
+
+    def get_subscriber_count(self, event_type: type) -> int:
+        """イベントの型の購読者の数を返す"""
+        return len(self.__subscriptions.get(event_type, []))
+
+    def publish(self, event: Any) -> None:
+        """イベントを発行し、購読者に優先度順に渡す"""
+        for deliver in self.__delivers.get(type(event), ()):
+            deliver(event)
+
+    def flush(self) -> None:
+        """
+        まとめて購読しているものに、溜めているイベントを優先度順に渡し、
+        非同期の購読者の処理がすべて終わるまで待つ
+        非同期の処理中に例外が起きていた場合は、その例外を送出する
+        """
+        try:
+            for subscription in self.__batch_subscriptions:
+                subscription.flush()
+        finally:
+            self.__worker.join()
+
+    def __add(self, subscription: Subscription) -> None:
+        with self.__lock:
+            self.__order += 1
+            event_type = subscription.event_type
+            self.__subscriptions.setdefault(event_type, []).append(subscription)
+            self.__update(event_type)
+
+    def __update(self, event_type: type) -> None:
+        # 発行のたびに並べ替えないよう、渡す関数の並びを作り直しておく
+        # 購読者がいなくなった型は取り除き、has_subscribers()がFalseを返すようにする
+        subscriptions = self.__subscriptions.get(event_type, [])
+        if subscriptions:
+            subscriptions.sort(key=lambda subscription: subscription.sort_key)
+            self.__delivers[event_type] = tuple(
+                subscription.deliver for subscription in subscriptions
+            )
+        else:
+            self.__subscriptions.pop(event_type, None)
+            self.__delivers.pop(event_type, None)
+        batch_subscriptions = [
+            subscription
+            for subscriptions in self.__subscriptions.values()
+            for subscription in subscriptions
+            if isinstance(subscription, BatchSubscription)
+        ]
+        batch_subscriptions.sort(key=lambda subscription: subscription.sort_key)
+        self.__batch_subscriptions = tuple(batch_subscriptions)
+        self.__async_subscription_count = sum(
+            isinstance(subscription, AsyncSubscription)
+            for subscriptions in self.__subscriptions.values()
+            for subscription in subscriptions
+        )
+
+
+if __name__ == "__main__":
+    from card import Card
+    from player import RandomAI
+
+    bus = EventBus()
+    bus.subscribe(AskEvent, lambda event: print("second:", event.ask), priority=1)
+    bus.subscribe(AskEvent, lambda event: print("first:", event.ask))
+    bus.subscribe_batch(AskEvent, lambda events: print("batch:", len(events)))
+    bus.subscribe_async(AskEvent, lambda event: print("async:", event.ask))
+    print(bus.has_subscribers(AskEvent), bus.has_subscribers(GuessEvent))
+
+    player = RandomAI("player", 0)
+    bus.publish(AskEvent(player, AskAction(Card(1)), True))
+    bus.publish(AskEvent(player, AskAction(Card(2)), False))
+    bus.flush()
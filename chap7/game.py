@@ -1 +0,0 @@
-../chap6/game.py
\ No newline at end of file
@@ -0,0 +1,275 @@
+import weakref
+from typing import Optional, Protocol, cast
+
+from action import AskAction, GuessAction
+from card import Deal
+from event import AskEvent, EventBus, GuessEvent, Subscription
+from player import Player, ResettablePlayer
+from state import GameState
+from terminal import Terminal
+
+
+class GameObserver(Protocol):
+    def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
+        """プレイヤーが質問したときに実行される"""
+        ...
+
+    def player_guessed(self, player: Player, guess: GuessAction, is_hit: bool) -> None:
+        """プレイヤーが推測したときに実行される"""
+        ...
+
+
+def subscribe_observer(
+    event_bus: EventBus,
+    observer: GameObserver,
+    priority: int = 0,
+    asynchronous: bool = False,
+    weak: bool = False,
+) -> tuple[Subscription, Subscription]:
+    """
+    オブザーバに質問と推測のイベントを購読させ、購読を返す
+    弱参照の場合、オブザーバが消えると自動で購読をやめる
+    """
+    if asynchronous:
+        subscribe = event_bus.subscribe_async
+    else:
+        subscribe = event_bus.subscribe
+    if not weak:
+        return (
+            subscribe(AskEvent, lambda event: observer.player_asked(*event), priority),
+            subscribe(
+                GuessEvent, lambda event: observer.player_guessed(*event), priority
+            ),
+        )
+
+    subscriptions: list[Subscription] = []
+
+    def unsubscribe_all(_: "weakref.ref[GameObserver]") -> None:
+        for subscription in subscriptions:
+            try:
+                event_bus.unsubscribe(subscription)
+            except ValueError:
+                # すでに取り除かれていた
+                pass
+
+    observer_ref = weakref.ref(observer, unsubscribe_all)
+
+    def player_asked(event: AskEvent) -> None:
+        observer = observer_ref()
+        if observer is not None:
+            observer.player_asked(*event)
+
+    def player_guessed(event: GuessEvent) -> None:
+        observer = observer_ref()
+        if observer is not None:
+            observer.player_guessed(*event)
+
+    subscriptions.append(subscribe(AskEvent, player_asked, priority))
+    subscriptions.append(subscribe(GuessEvent, player_guessed, priority))
+    return subscriptions[0], subscriptions[1]
+
+
+class ObserverRegistry:
+    def __init__(self, event_bus: EventBus) -> None:
+        """イベントバスにオブザーバを登録する台帳を初期化する"""
+        self.__event_bus = event_bus
+        self.__observers: dict[GameObserver, tuple[Subscription, Subscription]] = {}
+        self.__weak_observers: weakref.WeakKeyDictionary[
+            GameObserver, tuple[Subscription, Subscription]
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def observer_count(self) -> int:
+        """生きているオブザーバの数を返す"""
+        return len(self.__observers) + len(self.__weak_observers)
+
+    @property
+    def weak_observer_count(self) -> int:
+        """生きている弱参照のオブザーバの数を返す"""
+        return len(self.__weak_observers)
+
+    def add(
+        self,
+        observer: GameObserver,
+        priority: int = 0,
+        asynchronous: bool = False,
+        weak: bool = False,
+    ) -> None:
+        """オブザーバを登録する（すでに登録されている場合は何もしない）"""
+        if (observer in self.__observers) or (observer in self.__weak_observers):
+            return
+        subscriptions = subscribe_observer(
+            self.__event_bus, observer, priority, asynchronous, weak
+        )
+        if weak:
+            self.__weak_observers[observer] = subscriptions
+        else:
+            self.__observers[observer] = subscriptions
+
+    def remove(self, observer: GameObserver) -> None:
+        """
+        オブザーバの登録を取り消す
+        登録されていない場合はKeyError
+        """
+        if observer in self.__weak_observers:
+            subscriptions = self.__weak_observers.pop(observer)
+        else:
+            subscriptions = self.__observers.pop(observer)
+        for subscription in subscriptions:
+            self.__event_bus.unsubscribe(subscription)
+
+
+class Game:
+    def __init__(
+        self,
+        deal: Deal,
+        player0: Player,
+        player1: Player,
+        event_bus: Optional[EventBus] = None,
+    ) -> None:
+        """
+        ゲームを初期化する
+        イベントバスが渡されなかった場合は、ゲームごとに作る
+        """
+        self.__deal = deal
+        self.__player0 = player0
+        self.__player1 = player1
+        self.__event_bus = EventBus() if event_bus is None else event_bus
+        self.__observers = ObserverRegistry(self.__event_bus)
+        self.__resettable_players: Optional[tuple[ResettablePlayer, ResettablePlayer]]
+        self.__resettable_players = None
+
+    @property
+    def event_bus(self) -> EventBus:
+        """イベントバスを返す"""
+        return self.__event_bus
+
+    @property
+    def player0(self) -> Player:
+        """先手のプレイヤーを返す"""
+        return self.__player0
+
+    @property
+    def player1(self) -> Player:
+        """後手のプレイヤーを返す"""
+        return self.__player1
+
+    def reset(
+        self,
+        deal: Deal,
+        random_states: tuple[Optional[int], Optional[int]] = (None, None),
+    ) -> None:
+        """
+        ディールを変えて、同じプレイヤーとオブザーバで次のゲームをできるようにする
+        プレイヤーは、新しい手札と乱数のシードで初期化する
+        初期化できないプレイヤーがいる場合は、前の手札で続けないようTypeError
+        """
+        if self.__resettable_players is None:
+            # プロトコルのisinstance()は遅いので、最初のreset()でだけ調べる
+            players: list[ResettablePlayer] = []
+            for player in (self.__player0, self.__player1):
+                if not isinstance(player, ResettablePlayer):
+                    raise TypeError(f"Player cannot be reset. (player: {player})")
+                players.append(player)
+            self.__resettable_players = (players[0], players[1])
+        self.__deal = deal
+        player0, player1 = self.__resettable_players
+        player0.reset(deal.player0_hand, random_states[0])
+        player1.reset(deal.player1_hand, random_states[1])
+
+    @property
+    def observer_count(self) -> int:
+        """生きているオブザーバの数を返す（診断用）"""
+        return self.__observers.observer_count
+
+    def add_observer(
+        self,
+        observer: GameObserver,
+        priority: int = 0,
+        asynchronous: bool = False,
+        weak: bool = False,
+    ) -> None:
+        """
+        オブザーバを追加する
+        オブザーバは優先度の小さい順、同じ優先度なら追加した順に通知される
+        非同期のオブザーバはバックグラウンドで通知され、ゲームの終わりに処理が終わる
+        （次の行動の前に通知を受ける必要があるAIは、非同期にしてはいけない）
+        弱参照のオブザーバはゲームが生かしておかず、消えると自動で取り除かれる
+        すでに追加されている場合は何もしない
+        """
+        self.__observers.add(observer, priority, asynchronous, weak)
+
+    def remove_observer(self, observer: GameObserver) -> None:
+        """
+        オブザーバを取り除く
+        追加されていない場合はKeyError
+        """
+        self.__observers.remove(observer)
+
+    def start(self) -> Player:
+        """
+        ゲームを開始し、勝ったプレイヤーを返す
+        ゲームが終わると、まとめて購読しているものに溜めたイベントを渡し、
+        非同期のオブザーバの処理が終わるまで待つ
+        """
+        players = (self.__player0, self.__player1)
+        state = GameState(self.__deal)
+        event_bus = self.__event_bus
+
+        try:
+            while True:
+                turn_player = players[state.turn]
+                action = turn_player.select_action(state.available_actions)
+                is_hit = state.apply(action)
+
+                # 購読者がいないイベントは作らない
+                if isinstance(action, AskAction):
+                    if event_bus.has_subscribers(AskEvent):
+                        event_bus.publish(AskEvent(turn_player, action, is_hit))
+                else:
+                    if event_bus.has_subscribers(GuessEvent):
+                        event_bus.publish(GuessEvent(turn_player, action, is_hit))
+                    return players[cast(int, state.winner)]
+        finally:
+            event_bus.flush()
+
+
+class GameView(GameObserver):
+    def __init__(self, terminal: Terminal) -> None:
+        """表示を初期化する"""
+        self.__terminal = terminal
+
+    def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
+        """プレイヤーの質問内容と結果を表示する"""
+        self.__terminal.put_str(f"{player.name}: {ask}")
+        result = "Hit." if is_hit else "Miss."
+        self.__terminal.put_str(result)
+        self.__terminal.put_empty_line()
+
+    def player_guessed(self, player: Player, guess: GuessAction, is_hit: bool) -> None:
+        """プレイヤーの推測内容と結果を表示する"""
+        self.__terminal.put_str(f"{player.name}: {guess}")
+        result = "Hit." if is_hit else "Miss."
+        self.__terminal.put_str(result)
+        self.__terminal.put_empty_line()
+
+
+if __name__ == "__main__":
+    from io import StringIO
+
+    from card import Dealer
+    from player import HumanPlayer
+
+    deal = Dealer(0).deal()
+
+    terminal0 = Terminal(in_stream=StringIO("ask 2\nguess 4\n"))
+    human0 = HumanPlayer("player0", deal.player0_hand, terminal0)
+    terminal1 = Terminal(in_stream=StringIO("ask 3\n"))
+    human1 = HumanPlayer("player1", deal.player1_hand, terminal1)
+
+    terminal = Terminal()
+    game = Game(deal, human0, human1)
+    view = GameView(terminal)
+    game.add_observer(view)
+    win_player = game.start()
+    print(f"{win_player.name} won.")
@@ -1,64 +1,613 @@
-from card import Dealer, Hand
+import itertools
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from io import StringIO
+from typing import Generator, Iterator, Optional, Sequence, TextIO, cast
+
+from card import Deal, Dealer, Hand
+from checkpoint import Checkpoint
 from game import Game
 from player import Player, RandomAI
+from pool import GamePool
+from report import BattleObserver, GameLogger, GameRecorder, ProgressReporter
+from seed import derive_seed
 from smartai import SmartAI
+from stats import DealTally, WinRateConfidenceSequence
 from terminal import Terminal
 
+# プレイヤーの種類
+PLAYER_TYPES = ["random", "smart"]
+
+# チェックポイントを取る場合の、シャードの最大のゲーム数
+CHECKPOINT_SHARD_SIZE = 100000
+
 
-def create_player(player_type: str, name: str, hand: Hand) -> Player:
+def create_player(
+    player_type: str, name: str, hand: Hand, random_state: Optional[int] = None
+) -> Player:
     """プレイヤーを作って返す"""
     if player_type == "random":
-        return RandomAI(name)
+        return RandomAI(name, random_state)
     elif player_type == "smart":
-        return SmartAI(name, hand)
+        return SmartAI(name, hand, random_state)
     else:
         raise ValueError(f"Unknown player type. (type: {player_type})")
 
 
-def main(repeat_count: int, player0_type: str, player1_type: str) -> None:
-    """メイン"""
+def create_deals(
+    dealer: Dealer, deal_mode: str, repeat_count: int, start: int = 0
+) -> Iterator[Deal]:
+    """
+    ディールの配り方に従って、repeat_count個のディールのstart番目以降を返す
+    - random: ランダムに配る（i番目のゲームのディールはシードとiだけで決まる）
+    - exhaustive: すべてのディールを同じ回数ずつ配る（手札の入れ替えは網羅するが、先手は変わらない）
+    - stratified: ディールごとの層別抽出で配る
+    """
+    if deal_mode == "random":
+        for i in range(start, repeat_count):
+            yield dealer.deal_at(i)
+    elif deal_mode == "exhaustive":
+        assert (
+            repeat_count % Deal.COUNT == 0
+        ), f"Repeat count must be a multiple of {Deal.COUNT}. (count: {repeat_count})"
+        yield from dealer.enumerate_deals(repeat_count // Deal.COUNT, start)
+    elif deal_mode == "stratified":
+        yield from dealer.stratified_deals(repeat_count, start)
+    else:
+        raise ValueError(f"Unknown deal mode. (mode: {deal_mode})")
+
+
+def format_estimate(estimate: tuple[float, float]) -> str:
+    """勝率の推定値と標準誤差を文字列にして返す"""
+    rate, error = estimate
+    if math.isnan(rate):
+        return "n/a"
+    return f"{rate * 100:6.2f}% (SE {error * 100:.3f}%)"
+
+
+class Shard:
+    def __init__(
+        self,
+        player0_type: str,
+        player1_type: str,
+        random_state: int,
+        deal_mode: str,
+        repeat_count: int,
+        start: int,
+        stop: int,
+        paired: bool = False,
+    ) -> None:
+        """
+        対戦全体のうち、start番目からstop番目の手前までのゲームを表すシャードを初期化する
+        pairedがTrueの場合、2i番目と2i+1番目のゲームは席を入れ替えた組になる
+        シャードは別のプロセスに送るので、pickleできる値だけを持つ
+        """
+        self.__player0_type = player0_type
+        self.__player1_type = player1_type
+        self.__random_state = random_state
+        self.__deal_mode = deal_mode
+        self.__repeat_count = repeat_count
+        self.__start = start
+        self.__stop = stop
+        self.__paired = paired
+
+    @property
+    def player0_type(self) -> str:
+        """先手のプレイヤーの種類を返す"""
+        return self.__player0_type
+
+    @property
+    def player1_type(self) -> str:
+        """後手のプレイヤーの種類を返す"""
+        return self.__player1_type
+
+    @property
+    def random_state(self) -> int:
+        """対戦全体のシードを返す"""
+        return self.__random_state
+
+    @property
+    def deal_mode(self) -> str:
+        """ディールの配り方を返す"""
+        return self.__deal_mode
+
+    @property
+    def repeat_count(self) -> int:
+        """対戦全体のゲーム数を返す"""
+        return self.__repeat_count
+
+    @property
+    def start(self) -> int:
+        """シャードの最初のゲームの番号を返す"""
+        return self.__start
+
+    @property
+    def stop(self) -> int:
+        """シャードの最後のゲームの次の番号を返す"""
+        return self.__stop
+
+    @property
+    def paired(self) -> bool:
+        """席を入れ替えた組で対戦するか返す"""
+        return self.__paired
+
+
+def create_shards(
+    player0_type: str,
+    player1_type: str,
+    random_state: int,
+    deal_mode: str,
+    repeat_count: int,
+    shard_count: int,
+    paired: bool = False,
+    start: int = 0,
+    shard_size: Optional[int] = None,
+) -> list[Shard]:
+    """
+    対戦全体のstart番目以降をほぼ同じゲーム数のshard_count個のシャードに分けて返す
+    （start番目以降にゲームがなければ空のリスト）
+    shard_sizeを指定した場合は、shard_countによらず、ゲーム0から数えて
+    shard_sizeゲームごとの位置で分ける（startが違っても切れ目は同じになる）
+    pairedがTrueの場合は、席を入れ替えた組を分けないようにする
+    """
+    assert shard_count > 0, f"Invalid shard count. (count: {shard_count})"
+    unit = 2 if paired else 1
+    assert (
+        repeat_count % unit == 0
+    ), f"Repeat count must be even when paired. (count: {repeat_count})"
+    assert start % unit == 0, f"Invalid start. (start: {start})"
+    if shard_size is not None:
+        assert shard_size > 0, f"Invalid shard size. (size: {shard_size})"
+        # 組を分けないよう、切れ目は組の境目に切り下げる
+        inner_bounds = {
+            unit * (k * shard_size // unit)
+            for k in range(start // shard_size + 1, repeat_count // shard_size + 1)
+        }
+        bounds = sorted(
+            {start, repeat_count}
+            | {bound for bound in inner_bounds if start < bound < repeat_count}
+        )
+    else:
+        unit_count = (repeat_count - start) // unit
+        if unit_count == 0:
+            # 残りのゲームがない（終わった対戦から再開した）
+            return []
+        shard_count = min(shard_count, unit_count)
+        bounds = [
+            start + unit * (unit_count * k // shard_count)
+            for k in range(shard_count + 1)
+        ]
+    return [
+        Shard(
+            player0_type,
+            player1_type,
+            random_state,
+            deal_mode,
+            repeat_count,
+            start,
+            stop,
+            paired,
+        )
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def play_shard(shard: Shard, observers: Sequence[BattleObserver] = ()) -> DealTally:
+    """
+    シャードのゲームを行い、ディールごとの対戦成績を返す
+    i番目のゲームのディールと各プレイヤーのシードは、対戦全体のシードとiだけで決まるので、
+    どう分けても対戦全体の結果は同じになる
+    組で対戦する場合は、同じディール、同じ席ごとのシードで席を入れ替えて2回対戦する
+    （共通乱数法）
+    オブザーバには、ゲームが終わるたびに結果を通知する
+    """
+    random_state = shard.random_state
+    dealer = Dealer(derive_seed(random_state, "dealer"), counter_based=True)
+
+    def create_game(deal: Deal, swapped: bool) -> Game:
+        # swappedがTrueの場合は、Player0が後手になるように席を入れ替える
+        if swapped:
+            first = create_player(shard.player1_type, "Player1", deal.player0_hand)
+            second = create_player(shard.player0_type, "Player0", deal.player1_hand)
+        else:
+            first = create_player(shard.player0_type, "Player0", deal.player0_hand)
+            second = create_player(shard.player1_type, "Player1", deal.player1_hand)
+        game = Game(deal, first, second)
+        if isinstance(first, SmartAI):
+            game.add_observer(first)
+        if isinstance(second, SmartAI):
+            game.add_observer(second)
+        return game
+
+    def play_game(
+        pool: GamePool, deal: Deal, random_states: tuple[Optional[int], Optional[int]]
+    ) -> bool:
+        # 先手が勝ったか返す
+        game = pool.acquire(deal, random_states)
+        first_won = game.start() == game.player0
+        pool.release(game)
+        return first_won
+
+    # ゲームとプレイヤーは作り直さず、プールから取り出して使い回す
+    pool = GamePool(partial(create_game, swapped=False))
+    tally = DealTally()
+    if not shard.paired:
+        deals = create_deals(dealer, shard.deal_mode, shard.repeat_count, shard.start)
+        shard_deals = itertools.islice(deals, shard.stop - shard.start)
+        for i, deal in enumerate(shard_deals, shard.start):
+            random_states = (
+                derive_seed(random_state, "game", i, "player0"),
+                derive_seed(random_state, "game", i, "player1"),
+            )
+            player0_won = play_game(pool, deal, random_states)
+            tally.add(deal.index, player0_won)
+            for observer in observers:
+                observer.game_finished(i, deal.index, player0_won)
+        return tally
+
+    swapped_pool = GamePool(partial(create_game, swapped=True))
+    pair_start = shard.start // 2
+    pair_stop = shard.stop // 2
+    deals = create_deals(dealer, shard.deal_mode, shard.repeat_count // 2, pair_start)
+    shard_deals = itertools.islice(deals, pair_stop - pair_start)
+    for j, deal in enumerate(shard_deals, pair_start):
+        # 席ごとのシードを組の2つのゲームで共通にする
+        random_states = (
+            derive_seed(random_state, "pair", j, "first"),
+            derive_seed(random_state, "pair", j, "second"),
+        )
+        first_won = play_game(pool, deal, random_states)
+        second_won = not play_game(swapped_pool, deal, random_states)
+        tally.add_pair(deal.index, first_won, second_won)
+        for observer in observers:
+            observer.game_finished(2 * j, deal.index, first_won)
+            observer.game_finished(2 * j + 1, deal.index, second_won)
+    return tally
+
+
+def run_shard(shard: Shard, record: bool = False) -> tuple[DealTally, str]:
+    """
+    ワーカーのプロセスでシャードのゲームを行い、対戦成績を返す
+    recordがTrueの場合、ゲームごとの記録も文字列で返す（Falseなら空文字列）
+    """
+    with StringIO() as record_stream:
+        observers = [GameRecorder(record_stream)] if record else []
+        tally = play_shard(shard, observers)
+        return tally, record_stream.getvalue()
+
+
+def iterate_shard_results(
+    shards: Sequence[Shard],
+    worker_count: int,
+    observers: Sequence[BattleObserver] = (),
+    record: bool = False,
+) -> Generator[tuple[Shard, DealTally, str], None, None]:
+    """
+    シャードのゲームを行い、シャードの順に（シャード, 対戦成績, 記録）を返す
+    worker_countが1の場合はこのプロセスで行い、オブザーバにゲームごとに通知する
+    （記録は空文字列）
+    2以上の場合はプロセスプールで先読みしながら行い、recordがTrueなら記録も返す
+    途中でやめた場合、まだ始まっていないシャードは取り消す
+    """
+    if worker_count == 1:
+        for shard in shards:
+            yield shard, play_shard(shard, observers), ""
+        return
+
+    executor = ProcessPoolExecutor(worker_count)
+    try:
+        futures: deque[Future[tuple[DealTally, str]]] = deque()
+        shard_iterator = iter(shards)
+        # ワーカーが遊ばない程度に先読みする
+        for shard in itertools.islice(shard_iterator, worker_count * 2):
+            futures.append(executor.submit(run_shard, shard, record))
+        for shard in shards:
+            tally, records = futures.popleft().result()
+            next_shard = next(shard_iterator, None)
+            if next_shard is not None:
+                futures.append(executor.submit(run_shard, next_shard, record))
+            yield shard, tally, records
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def main(
+    repeat_count: int,
+    player0_type: str,
+    player1_type: str,
+    random_state: Optional[int] = None,
+    deal_mode: str = "random",
+    worker_count: int = 1,
+    output_mode: str = "games",
+    record_path: Optional[str] = None,
+    progress_interval: float = 1.0,
+    alpha: Optional[float] = None,
+    check_interval: int = 100,
+    paired: bool = False,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: float = 60.0,
+    resume: bool = False,
+) -> None:
+    """
+    メイン
+    シードを指定すると、ディーラーと各ゲームの各プレイヤーに
+    そこから導出したシードを与えるので、対戦結果が再現できる
+    worker_countが2以上の場合、ゲームをシャードに分けてプロセスプールで並列に行う
+    （シードが同じなら、結果はworker_countによらず同じ）
+    output_modeで途中の出力を選ぶ
+    - games: ゲームごと（並列の場合はシャードごと）に出力する
+    - progress: progress_interval秒ごとに進捗を出力する
+    - summary: 最後の集計だけを出力する
+    record_pathを指定すると、ゲームごとの結果をCSVでファイルに記録する
+    alphaを指定すると、check_intervalゲームごとに勝率の信頼系列で逐次検定し、
+    誤り確率alpha以下でどちらが強いか決まった時点で止める
+    （repeat_countはゲーム数の上限になる）
+    先手の有利で決着しないよう、逐次検定はpairedがTrueの場合だけ行える
+    （そうでない場合はValueError）
+    pairedがTrueの場合、各ディールで席を入れ替えて2回ずつ対戦し、
+    組ごとの平均からPlayer0の勝率を推定する（repeat_countは偶数）
+    checkpoint_pathを指定すると、checkpoint_interval秒ごとと最後に、
+    それまでの集計と次のゲームの番号をファイルに保存する
+    resumeがTrueの場合は、そのファイルから続きを行う
+    """
     assert repeat_count > 0, f"Invalid repeat count. (count: {repeat_count})"
-    player0_win_count = 0
-    player1_win_count = 0
+    assert worker_count > 0, f"Invalid worker count. (count: {worker_count})"
+    assert check_interval > 0, f"Invalid check interval. (interval: {check_interval})"
+    assert (
+        checkpoint_interval > 0
+    ), f"Invalid checkpoint interval. (interval: {checkpoint_interval})"
+    if output_mode not in ["games", "progress", "summary"]:
+        raise ValueError(f"Unknown output mode. (mode: {output_mode})")
+    if (alpha is not None) and (not paired):
+        # 先手の勝率で比べると、同じAIどうしでも先手の有利で決着してしまう
+        raise ValueError("Sequential test requires paired games.")
+    checkpoint: Optional[Checkpoint] = None
+    if resume:
+        assert checkpoint_path is not None, "Checkpoint path is required to resume."
+        checkpoint = Checkpoint.load(checkpoint_path)
+        if random_state is None:
+            # シードを指定しなかった場合は、前回のシードで続ける
+            random_state = checkpoint.settings["random_state"]
+    if random_state is None:
+        # シャードごとに別のシードにならないよう、ここで決めておく
+        random_state = random.SystemRandom().getrandbits(64)
+    # 結果に影響する設定（チェックポイントから再開するときは同じでないといけない）
+    settings = {
+        "repeat_count": repeat_count,
+        "player0_type": player0_type,
+        "player1_type": player1_type,
+        "random_state": random_state,
+        "deal_mode": deal_mode,
+        "alpha": alpha,
+        "check_interval": check_interval,
+        "paired": paired,
+    }
+    if checkpoint is None:
+        tally = DealTally()
+        start = 0
+    else:
+        checkpoint.check_settings(settings)
+        if (record_path is None) != (checkpoint.record_offset is None):
+            raise ValueError("Record must be used both before and after resuming.")
+        tally = checkpoint.tally
+        start = checkpoint.next_game
+
     terminal = Terminal()
-    for i in range(repeat_count):
-        deal = Dealer().deal()
+    record_stream: Optional[TextIO] = None
+    if record_path is not None:
+        # ゲームごとの記録は大きなバッファでまとめて書き出す
+        if checkpoint is None:
+            record_stream = open(record_path, "w", buffering=1 << 20)
+            record_stream.write(GameRecorder.HEADER)
+        else:
+            # チェックポイントより後に書いた記録は、もう一度行うので捨てる
+            record_stream = open(record_path, "r+", buffering=1 << 20)
+            record_stream.seek(cast(int, checkpoint.record_offset))
+            record_stream.truncate()
+    reporter = ProgressReporter(terminal, repeat_count, progress_interval)
+    reporter.skip(tally.game_count, tally.player0_win_count)
 
-        player0 = create_player(player0_type, "Player0", deal.player0_hand)
-        player1 = create_player(player1_type, "Player1", deal.player1_hand)
+    sequence: Optional[WinRateConfidenceSequence] = None
+    if alpha is not None:
+        sequence = WinRateConfidenceSequence(alpha)
 
-        game = Game(deal, player0, player1)
+    def update_sequence() -> bool:
+        # 信頼系列を更新し、決着したか返す
+        if sequence is None:
+            return False
+        # 組の中の2つのゲームは独立でないので、組の平均を1つの得点とする
+        sequence.update(tally.pair_count, tally.player0_win_count / 2)
+        return sequence.decision is not None
 
-        if isinstance(player0, SmartAI):
-            game.add_observer(player0)
-        if isinstance(player1, SmartAI):
-            game.add_observer(player1)
+    def save_checkpoint(next_game: int) -> None:
+        record_offset = None
+        if record_stream is not None:
+            # チェックポイントより前の記録は、確実にファイルに書いておく
+            record_stream.flush()
+            os.fsync(record_stream.fileno())
+            record_offset = record_stream.tell()
+        Checkpoint(settings, next_game, tally, record_offset).save(
+            cast(str, checkpoint_path)
+        )
 
-        win_player = game.start()
-        terminal.put_str(f"[{i}/{repeat_count}] {win_player.name} won.")
-        if win_player == player0:
-            player0_win_count += 1
-        else:
-            player1_win_count += 1
-    player0_win_rate = player0_win_count * 100 / repeat_count
-    player1_win_rate = player1_win_count * 100 / repeat_count
+    shard_size: Optional[int] = None
+    remaining_count = repeat_count - start
+    if alpha is not None:
+        # 決着したかをゲーム0から数えてcheck_intervalゲームごとに確かめる
+        # （再開しても確かめる位置が変わらないよう、シャードの切れ目をそろえる）
+        shard_count = 1
+        shard_size = check_interval
+    elif worker_count == 1:
+        shard_count = 1
+    else:
+        # 負荷が偏らないよう、ワーカーの数より多めのシャードに分ける
+        shard_count = worker_count * 4
+    if (checkpoint_path is not None) and (shard_size is None):
+        # チェックポイントはシャードの切れ目で取るので、シャードを大きくしすぎない
+        shard_count = max(
+            shard_count, math.ceil(remaining_count / CHECKPOINT_SHARD_SIZE)
+        )
+    shards = create_shards(
+        player0_type,
+        player1_type,
+        random_state,
+        deal_mode,
+        repeat_count,
+        max(shard_count, 1),
+        paired,
+        start,
+        shard_size,
+    )
+    if update_sequence():
+        # 前回のうちに決着していた
+        shards = []
+
+    observers: list[BattleObserver] = []
+    if worker_count == 1:
+        if output_mode == "games":
+            observers.append(GameLogger(terminal, repeat_count))
+        elif output_mode == "progress":
+            observers.append(reporter)
+        if record_stream is not None:
+            observers.append(GameRecorder(record_stream))
+
+    next_checkpoint_time = time.monotonic() + checkpoint_interval
+    try:
+        results = iterate_shard_results(
+            shards, worker_count, observers, record_stream is not None
+        )
+        next_game = start
+        # 結果はシャードの順に加えるので、止まる位置もworker_countによらない
+        for shard, shard_tally, records in results:
+            tally.merge(shard_tally)
+            next_game = shard.stop
+            if worker_count > 1:
+                if record_stream is not None:
+                    record_stream.write(records)
+                if output_mode == "games":
+                    terminal.put_str(
+                        f"[{shard.stop}/{repeat_count}] "
+                        f"games {shard.start}-{shard.stop - 1} done."
+                    )
+                elif output_mode == "progress":
+                    reporter.update(tally.game_count, tally.player0_win_count)
+            is_settled = update_sequence()
+            if (checkpoint_path is not None) and (
+                time.monotonic() >= next_checkpoint_time
+            ):
+                save_checkpoint(next_game)
+                next_checkpoint_time = time.monotonic() + checkpoint_interval
+            if is_settled:
+                results.close()
+                break
+        if checkpoint_path is not None:
+            save_checkpoint(next_game)
+    finally:
+        if record_stream is not None:
+            record_stream.close()
+    if output_mode == "progress":
+        reporter.finish()
+
+    player0_win_count = tally.player0_win_count
+    player1_win_count = tally.game_count - player0_win_count
+    player0_win_rate = player0_win_count * 100 / tally.game_count
+    player1_win_rate = player1_win_count * 100 / tally.game_count
     terminal.put_str(f"Player0 ({player0_type}): {player0_win_rate:6.2f}%")
     terminal.put_str(f"Player1 ({player1_type}): {player1_win_rate:6.2f}%")
+    simple_estimate = format_estimate(tally.get_simple_estimate())
+    stratified_estimate = format_estimate(tally.get_stratified_estimate())
+    terminal.put_str(f"Player0 win rate (simple):     {simple_estimate}")
+    terminal.put_str(f"Player0 win rate (stratified): {stratified_estimate}")
+    if paired:
+        paired_estimate = format_estimate(tally.get_paired_estimate())
+        terminal.put_str(f"Player0 win rate (paired):     {paired_estimate}")
+        reduction = tally.get_variance_reduction()
+        if reduction >= 1:
+            # 同じAIどうしなど、組の平均がいつも同じだと分散が0になり、比べられない
+            terminal.put_str("Variance removed by pairing: n/a (no paired variance)")
+        elif not math.isnan(reduction):
+            # 同じ標準誤差を独立なゲームで得るのに必要なゲーム数
+            equivalent = tally.game_count / (1 - reduction)
+            terminal.put_str(
+                f"Variance removed by pairing: {reduction * 100:.1f}% "
+                f"(worth {equivalent:,.0f} unpaired games)"
+            )
+    if sequence is not None:
+        lower, upper = sequence.interval
+        if sequence.decision is None:
+            result = "undecided"
+        else:
+            result = f"Player{sequence.decision} is better"
+        terminal.put_str(
+            f"Sequential test (alpha {alpha}): {result} after {tally.game_count} games"
+            f" (Player0 win rate {lower * 100:.2f}% - {upper * 100:.2f}%)"
+        )
 
 
 if __name__ == "__main__":
     import argparse
 
-    player_types = ["random", "smart"]
-
     parser = argparse.ArgumentParser()
     parser.add_argument("repeat_count", type=int)
-    parser.add_argument("player0_type", choices=player_types)
-    parser.add_argument("player1_type", choices=player_types)
+    parser.add_argument("player0_type", choices=PLAYER_TYPES)
+    parser.add_argument("player1_type", choices=PLAYER_TYPES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--deals", choices=["random", "exhaustive", "stratified"], default="random"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--output", choices=["games", "progress", "summary"], default="games"
+    )
+    parser.add_argument("--record", default=None)
+    parser.add_argument("--progress-interval", type=float, default=1.0)
+    parser.add_argument("--alpha", type=float, default=None)
+    parser.add_argument("--check-interval", type=int, default=100)
+    parser.add_argument("--paired", action="store_true")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0)
+    parser.add_argument("--resume", action="store_true")
 
     args = parser.parse_args()
     repeat_count = args.repeat_count
     player0_type = args.player0_type
     player1_type = args.player1_type
+    random_state = args.seed
+    deal_mode = args.deals
+    worker_count = args.workers
+    output_mode = args.output
+    record_path = args.record
+    progress_interval = args.progress_interval
+    alpha = args.alpha
+    check_interval = args.check_interval
+    paired = args.paired
+    checkpoint_path = args.checkpoint
+    checkpoint_interval = args.checkpoint_interval
+    resume = args.resume
+    if resume and (checkpoint_path is None):
+        parser.error("--resume requires --checkpoint")
+    if (alpha is not None) and (not paired):
+        parser.error("--alpha requires --paired")
 
-    main(repeat_count, player0_type, player1_type)
+    main(
+        repeat_count,
+        player0_type,
+        player1_type,
+        random_state,
+        deal_mode,
+        worker_count,
+        output_mode,
+        record_path,
+        progress_interval,
+        alpha,
+        check_interval,
+        paired,
+        checkpoint_path,
+        checkpoint_interval,
+        resume,
+    )
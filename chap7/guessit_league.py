@@ -0,0 +1,425 @@
+# 総当たりのリーグ戦を行うプログラム
+#
+# 名簿のすべての組について、先手と後手を入れ替えた2つの対戦を行い、
+# 対戦が終わるたびにBradley–Terryモデルのレーティングを更新して出力する
+# 対戦はシャードに分けてプロセスプールで並列に行う
+#
+# --adaptiveを指定すると、ゲーム数を全体の予算として、
+# まだ勝ち負けの決まらない組にだけ少しずつゲームを割り当てる（racing）
+# 勝率の信頼系列はいつ止めても有効なので、結果を見ながら割り当てを変えてよい
+
+import math
+import random
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Optional, Sequence, cast
+
+from guessit_battle_ai import PLAYER_TYPES, Shard, create_shards, run_shard
+from rating import BradleyTerryRatings
+from seed import derive_seed
+from stats import DealTally, WinRateConfidenceSequence
+from terminal import Terminal
+
+
+def parse_roster(entries: Sequence[str]) -> tuple[list[str], list[str]]:
+    """
+    名簿の項目（"名前=種類"か"種類"）から、名前の一覧と種類の一覧を返す
+    名前を省略した場合は種類を名前にし、重複したら番号を付ける
+    知らない種類や名前の重複はValueError
+    """
+    names: list[str] = []
+    player_types: list[str] = []
+    for entry in entries:
+        if "=" in entry:
+            name, player_type = entry.split("=", 1)
+        else:
+            name = player_type = entry
+            suffix = 2
+            while name in names:
+                name = f"{player_type}{suffix}"
+                suffix += 1
+        if player_type not in PLAYER_TYPES:
+            raise ValueError(f"Unknown player type. (type: {player_type})")
+        if name in names:
+            raise ValueError(f"Duplicated name. (name: {name})")
+        names.append(name)
+        player_types.append(player_type)
+    return names, player_types
+
+
+class Matchup:
+    def __init__(self, player0: int, player1: int, shards: list[Shard]) -> None:
+        """名簿の番号で表した先手と後手の対戦を初期化する"""
+        self.__player0 = player0
+        self.__player1 = player1
+        self.__shards = shards
+        self.__tally = DealTally()
+        self.__done_count = 0
+
+    @property
+    def player0(self) -> int:
+        """先手の名簿の番号を返す"""
+        return self.__player0
+
+    @property
+    def player1(self) -> int:
+        """後手の名簿の番号を返す"""
+        return self.__player1
+
+    @property
+    def shards(self) -> list[Shard]:
+        """対戦のシャードを返す"""
+        return self.__shards
+
+    @property
+    def tally(self) -> DealTally:
+        """終わったシャードの対戦成績を返す"""
+        return self.__tally
+
+    @property
+    def done_count(self) -> int:
+        """終わったシャードの数を返す"""
+        return self.__done_count
+
+    @property
+    def is_finished(self) -> bool:
+        """すべてのシャードが終わったか返す"""
+        return self.__done_count == len(self.__shards)
+
+    def add_shard_tally(self, tally: DealTally) -> None:
+        """終わったシャードの対戦成績を加える"""
+        self.__tally.merge(tally)
+        self.__done_count += 1
+
+
+def create_matchups(
+    player_types: Sequence[str],
+    names: Sequence[str],
+    random_state: int,
+    deal_mode: str,
+    game_count: int,
+    shard_count: int,
+) -> list[Matchup]:
+    """
+    すべての組について、先手と後手を入れ替えた対戦を作って返す
+    対戦のシードは名前から導出するので、名簿に追加しても既存の対戦の結果は変わらない
+    """
+    matchups = []
+    for i in range(len(names)):
+        for j in range(len(names)):
+            if i == j:
+                continue
+            matchup_seed = cast(int, derive_seed(random_state, names[i], names[j]))
+            shards = create_shards(
+                player_types[i],
+                player_types[j],
+                matchup_seed,
+                deal_mode,
+                game_count,
+                shard_count,
+            )
+            matchups.append(Matchup(i, j, shards))
+    return matchups
+
+
+class RacingMatchup(Matchup):
+    # 鏡写しとみなすのに必要な組の数
+    MIRROR_PAIR_COUNT = 100
+
+    def __init__(
+        self, player0: int, player1: int, shards: list[Shard], alpha: float
+    ) -> None:
+        """
+        席を入れ替えた組で行う対戦を初期化する
+        シャードは先頭から順に1つずつ行い、勝率の信頼系列で勝ち負けが決まったら止める
+        """
+        super().__init__(player0, player1, shards)
+        self.__sequence = WinRateConfidenceSequence(alpha)
+
+    @property
+    def sequence(self) -> WinRateConfidenceSequence:
+        """先手（player0）の勝率の信頼系列を返す"""
+        return self.__sequence
+
+    @property
+    def is_mirrored(self) -> bool:
+        """
+        席を入れ替えた組がすべて1勝1敗だったか返す
+        同じ種類のプレイヤーは同じシードで同じように打つので、いくら対戦しても差が出ない
+        """
+        tally = self.tally
+        split_count = tally.get_pair_count(True, False) + tally.get_pair_count(
+            False, True
+        )
+        pair_count = tally.pair_count
+        return (pair_count >= self.MIRROR_PAIR_COUNT) and (split_count == pair_count)
+
+    @property
+    def is_settled(self) -> bool:
+        """勝ち負けが決まったか、鏡写しで引き分けと分かったか返す"""
+        return (self.__sequence.decision is not None) or self.is_mirrored
+
+    @property
+    def next_shard(self) -> Shard:
+        """次に行うシャードを返す"""
+        assert not self.is_finished, "No more shards."
+        return self.shards[self.done_count]
+
+    def add_shard_tally(self, tally: DealTally) -> None:
+        """終わったシャードの対戦成績を加え、信頼系列を更新する"""
+        super().add_shard_tally(tally)
+        total = self.tally
+        # 組の中の2つのゲームは独立でないので、組の平均を1つの得点とする
+        self.__sequence.update(total.pair_count, total.player0_win_count / 2)
+
+
+def create_racing_matchups(
+    player_types: Sequence[str],
+    names: Sequence[str],
+    random_state: int,
+    deal_mode: str,
+    budget: int,
+    chunk_size: int,
+    alpha: float,
+) -> list[RacingMatchup]:
+    """
+    すべての組について、席を入れ替えた組で行う対戦を作って返す
+    どの組も予算のすべてを使えるように、予算をchunk_sizeゲームずつのシャードに分ける
+    すべての組の判定が同時に正しい確率が1 - alpha以上になるよう、
+    組ごとの誤り確率はalphaを組の数で割ったものにする
+    """
+    pair_count = len(names) * (len(names) - 1) // 2
+    repeat_count = budget - budget % 2
+    shard_count = math.ceil(repeat_count / chunk_size)
+    matchups = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            matchup_seed = cast(int, derive_seed(random_state, names[i], names[j]))
+            shards = create_shards(
+                player_types[i],
+                player_types[j],
+                matchup_seed,
+                deal_mode,
+                repeat_count,
+                shard_count,
+                True,
+            )
+            matchups.append(RacingMatchup(i, j, shards, alpha / pair_count))
+    return matchups
+
+
+def allocate_round(
+    matchups: Sequence[RacingMatchup], budget: int
+) -> list[RacingMatchup]:
+    """
+    まだ勝ち負けの決まらない組に、1つずつシャードを割り当てて返す
+    予算が足りない場合は、ゲーム数の少ない組を優先する
+    割り当ては結果だけで決まるので、並列に行っても同じになる
+    """
+    candidates = [
+        matchup
+        for matchup in matchups
+        if not (matchup.is_settled or matchup.is_finished)
+    ]
+    candidates.sort(key=lambda matchup: matchup.tally.game_count)
+    allocated = []
+    for matchup in candidates:
+        shard = matchup.next_shard
+        size = shard.stop - shard.start
+        if size <= budget:
+            allocated.append(matchup)
+            budget -= size
+    return allocated
+
+
+def format_ratings(ratings: BradleyTerryRatings) -> list[str]:
+    """レーティングの高い順に、レーティングと信頼区間を文字列にして返す"""
+    lines = []
+    order = sorted(
+        range(len(ratings.names)), key=lambda i: ratings.get_rating(i), reverse=True
+    )
+    name_width = max(len(name) for name in ratings.names)
+    for rank, i in enumerate(order, 1):
+        low, high = ratings.get_confidence_interval(i)
+        lines.append(
+            f"{rank:2}. {ratings.names[i]:{name_width}} "
+            f"{ratings.get_rating(i):7.1f} (95% CI {low:7.1f} - {high:7.1f}), "
+            f"{ratings.get_game_count(i)} games"
+        )
+    return lines
+
+
+def main(
+    entries: Sequence[str],
+    game_count: int,
+    random_state: Optional[int] = None,
+    deal_mode: str = "random",
+    worker_count: int = 1,
+) -> None:
+    """
+    メイン
+    名簿のすべての組について、先手と後手それぞれでgame_count回ずつ対戦する
+    """
+    assert game_count > 0, f"Invalid game count. (count: {game_count})"
+    assert worker_count > 0, f"Invalid worker count. (count: {worker_count})"
+    names, player_types = parse_roster(entries)
+    if random_state is None:
+        random_state = random.SystemRandom().getrandbits(64)
+    terminal = Terminal()
+    ratings = BradleyTerryRatings(names)
+    matchups = create_matchups(
+        player_types, names, random_state, deal_mode, game_count, worker_count
+    )
+    finished_count = 0
+
+    def matchup_finished(matchup: Matchup) -> None:
+        nonlocal finished_count
+        finished_count += 1
+        tally = matchup.tally
+        player0_win_count = tally.player0_win_count
+        player1_win_count = tally.game_count - player0_win_count
+        ratings.add_results(
+            matchup.player0, matchup.player1, player0_win_count, player1_win_count
+        )
+        player0_name = names[matchup.player0]
+        player1_name = names[matchup.player1]
+        player0_win_rate = player0_win_count * 100 / tally.game_count
+        terminal.put_str(
+            f"[{finished_count}/{len(matchups)}] {player0_name} vs {player1_name}: "
+            f"{player0_name} won {player0_win_rate:6.2f}%"
+        )
+
+    if worker_count == 1:
+        for matchup in matchups:
+            for shard in matchup.shards:
+                tally, _ = run_shard(shard)
+                matchup.add_shard_tally(tally)
+            matchup_finished(matchup)
+    else:
+        with ProcessPoolExecutor(worker_count) as executor:
+            # すべてのシャードを投入し、終わった順に対戦成績を加える
+            futures: dict[Future[tuple[DealTally, str]], Matchup] = {}
+            for matchup in matchups:
+                for shard in matchup.shards:
+                    futures[executor.submit(run_shard, shard)] = matchup
+            for future in as_completed(futures):
+                matchup = futures[future]
+                tally, _ = future.result()
+                matchup.add_shard_tally(tally)
+                if matchup.is_finished:
+                    matchup_finished(matchup)
+
+    terminal.put_empty_line()
+    for line in format_ratings(ratings):
+        terminal.put_str(line)
+
+
+def main_adaptive(
+    entries: Sequence[str],
+    budget: int,
+    random_state: Optional[int] = None,
+    deal_mode: str = "random",
+    worker_count: int = 1,
+    chunk_size: int = 200,
+    alpha: float = 0.05,
+) -> None:
+    """
+    予算を割り当てながら対戦するメイン
+    全体でbudgetゲームまで、まだ勝ち負けの決まらない組にchunk_sizeゲームずつ割り当てる
+    """
+    assert budget > 0, f"Invalid budget. (budget: {budget})"
+    assert worker_count > 0, f"Invalid worker count. (count: {worker_count})"
+    assert chunk_size > 0, f"Invalid chunk size. (size: {chunk_size})"
+    names, player_types = parse_roster(entries)
+    if random_state is None:
+        random_state = random.SystemRandom().getrandbits(64)
+    terminal = Terminal()
+    matchups = create_racing_matchups(
+        player_types, names, random_state, deal_mode, budget, chunk_size, alpha
+    )
+    remaining = budget
+    round_count = 0
+    executor = ProcessPoolExecutor(worker_count) if worker_count > 1 else None
+    try:
+        while True:
+            allocated = allocate_round(matchups, remaining)
+            if not allocated:
+                break
+            round_count += 1
+            shards = [matchup.next_shard for matchup in allocated]
+            if executor is None:
+                results = [run_shard(shard) for shard in shards]
+            else:
+                results = list(executor.map(run_shard, shards))
+            for matchup, (tally, _) in zip(allocated, results):
+                matchup.add_shard_tally(tally)
+                remaining -= tally.game_count
+            terminal.put_str(
+                f"[round {round_count}] {len(allocated)} pairs played, "
+                f"{budget - remaining}/{budget} games"
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ratings = BradleyTerryRatings(names)
+    terminal.put_empty_line()
+    name_width = max(len(name) for name in names)
+    for matchup in matchups:
+        tally = matchup.tally
+        player0_win_count = tally.player0_win_count
+        player1_win_count = tally.game_count - player0_win_count
+        if tally.game_count > 0:
+            ratings.add_results(
+                matchup.player0, matchup.player1, player0_win_count, player1_win_count
+            )
+        player0_win_rate = player0_win_count * 100 / max(tally.game_count, 1)
+        if matchup.is_mirrored:
+            result = "mirrored"
+        elif matchup.is_settled:
+            result = "settled"
+        else:
+            result = "undecided"
+        terminal.put_str(
+            f"{names[matchup.player0]:{name_width}} vs "
+            f"{names[matchup.player1]:{name_width}}: {tally.game_count:9,} games, "
+            f"{names[matchup.player0]} won {player0_win_rate:6.2f}% ({result})"
+        )
+    terminal.put_str(
+        f"(equal allocation: {budget // len(matchups):,} games per pair, "
+        f"alpha {alpha} for all pairs)"
+    )
+    terminal.put_empty_line()
+    for line in format_ratings(ratings):
+        terminal.put_str(line)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game_count", type=int)
+    parser.add_argument("roster", nargs="+", help="[NAME=]TYPE (TYPE: random, smart)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--deals", choices=["random", "exhaustive", "stratified"], default="random"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--adaptive", action="store_true", help="use game_count as the total budget"
+    )
+    parser.add_argument("--chunk", type=int, default=200)
+    parser.add_argument("--alpha", type=float, default=0.05)
+
+    args = parser.parse_args()
+    if args.adaptive:
+        main_adaptive(
+            args.roster,
+            args.game_count,
+            args.seed,
+            args.deals,
+            args.workers,
+            args.chunk,
+            args.alpha,
+        )
+    else:
+        main(args.roster, args.game_count, args.seed, args.deals, args.workers)
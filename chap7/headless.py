@@ -0,0 +1,109 @@
+# 表示や観戦のないゲームを大量に実行するためのエンジン
+#
+# Gameと同じルールを、手札のビットマスク、残りのカードのビット、
+# 直前の質問だけを状態として進める
+# 行動の一覧は事前に生成された表から引き、当たりの判定はビット演算で行う
+
+from typing import Iterable, Optional, Sequence
+
+from action import ActionList, AskAction
+from card import Deal
+from game import GameObserver
+from player import Player
+
+
+class HeadlessGame:
+    def __init__(
+        self,
+        player0: Player,
+        player1: Player,
+        observers: Sequence[GameObserver] = (),
+    ) -> None:
+        """
+        ヘッドレスなゲームを初期化する
+        オブザーバは渡された順に通知される
+        """
+        self.__players = (player0, player1)
+        self.__observers = tuple(observers)
+
+    def play(self, deal: Deal) -> int:
+        """ディールでゲームを行い、勝ったプレイヤーの番号（0か1）を返す"""
+        players = self.__players
+        observers = self.__observers
+        hand_masks = (deal.player0_mask, deal.player1_mask)
+        rest_mask = deal.rest_mask
+        get_available_actions = ActionList.get_available_actions_by_mask
+
+        turn = 0
+        prev_action: Optional[AskAction] = None
+        while True:
+            player = players[turn]
+            available_actions = get_available_actions(hand_masks[turn], prev_action)
+            action = player.select_action(available_actions)
+            card_mask = action.card.mask
+
+            if isinstance(action, AskAction):
+                is_hit = (hand_masks[turn ^ 1] & card_mask) != 0
+                for observer in observers:
+                    observer.player_asked(player, action, is_hit)
+                prev_action = action
+                turn ^= 1
+            else:
+                is_hit = card_mask == rest_mask
+                for observer in observers:
+                    observer.player_guessed(player, action, is_hit)
+                return turn if is_hit else turn ^ 1
+
+    def play_all(self, deals: Iterable[Deal]) -> tuple[int, int]:
+        """ディールを順にゲームを行い、各プレイヤーの勝った回数を返す"""
+        win_counts = [0, 0]
+        for deal in deals:
+            win_counts[self.play(deal)] += 1
+        return win_counts[0], win_counts[1]
+
+
+if __name__ == "__main__":
+    import time
+
+    from card import Dealer, Hand
+    from game import Game
+    from player import RandomAI
+    from smartai import SmartAI
+
+    def create_player(player_type: str, name: str, hand: Hand) -> Player:
+        if player_type == "smart":
+            return SmartAI(name, hand, 0)
+        return RandomAI(name, 0)
+
+    game_count = 100000
+    dealer = Dealer(0)
+    deals = [dealer.deal_at(i) for i in range(game_count)]
+
+    for player0_type in ["random", "smart"]:
+        # 同じディール、同じシードのプレイヤーで両方のエンジンを動かす
+        start = time.perf_counter()
+        game_winners = []
+        for deal in deals:
+            player0 = create_player(player0_type, "Player0", deal.player0_hand)
+            player1 = create_player("random", "Player1", deal.player1_hand)
+            game = Game(deal, player0, player1)
+            if isinstance(player0, SmartAI):
+                game.add_observer(player0)
+            win_player = game.start()
+            game_winners.append(0 if win_player == player0 else 1)
+        game_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        headless_winners = []
+        for deal in deals:
+            player0 = create_player(player0_type, "Player0", deal.player0_hand)
+            player1 = create_player("random", "Player1", deal.player1_hand)
+            observers = [player0] if isinstance(player0, SmartAI) else []
+            headless = HeadlessGame(player0, player1, observers)
+            headless_winners.append(headless.play(deal))
+        headless_time = time.perf_counter() - start
+
+        assert game_winners == headless_winners, "Winners differ."
+        print(f"{player0_type} vs random:")
+        print(f"  game    : {game_count / game_time:10,.0f} games/sec")
+        print(f"  headless: {game_count / headless_time:10,.0f} games/sec")
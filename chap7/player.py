@@ -1 +0,0 @@
-../chap6/player.py
\ No newline at end of file
@@ -0,0 +1,51 @@
+# ゲームを再利用するためのプール
+#
+# ゲームごとにGame、プレイヤー、オブザーバの登録を作り直す代わりに、
+# 使い終わったゲームをプールに戻し、次のゲームではreset()して使い回す
+
+from typing import Callable, Optional
+
+from card import Deal
+from game import Game
+
+
+class GamePool:
+    def __init__(self, create_game: Callable[[Deal], Game]) -> None:
+        """
+        プールを初期化する
+        create_gameは、ディールからプレイヤーとオブザーバの揃ったゲームを作る
+        """
+        self.__create_game = create_game
+        self.__free_games: list[Game] = []
+        self.__created_count = 0
+
+    @property
+    def created_count(self) -> int:
+        """作ったゲームの数を返す"""
+        return self.__created_count
+
+    @property
+    def free_count(self) -> int:
+        """プールで空いているゲームの数を返す"""
+        return len(self.__free_games)
+
+    def acquire(
+        self,
+        deal: Deal,
+        random_states: tuple[Optional[int], Optional[int]] = (None, None),
+    ) -> Game:
+        """
+        ディールと各プレイヤーのシードで初期化したゲームを返す
+        空いているゲームがなければ新しく作る
+        """
+        if self.__free_games:
+            game = self.__free_games.pop()
+        else:
+            game = self.__create_game(deal)
+            self.__created_count += 1
+        game.reset(deal, random_states)
+        return game
+
+    def release(self, game: Game) -> None:
+        """使い終わったゲームをプールに戻す"""
+        self.__free_games.append(game)
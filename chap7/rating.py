@@ -0,0 +1,186 @@
+# Bradley–Terryモデルによるレーティング
+#
+# プレイヤーiの強さをθ_iとし、iがjに勝つ確率を 1 / (1 + exp(θ_j - θ_i)) とする
+# 対戦成績を追加するたびに、前回の値から始めたニュートン法で最尤推定し直す
+# 標準誤差はフィッシャー情報行列の逆行列から求める
+# 表示用に、平均が0になるようにずらしてElo（400 * log10）のスケールに変換する
+
+import math
+from typing import Sequence
+
+# θ（自然対数のスケール）からEloのスケールへの係数
+ELO_SCALE = 400 / math.log(10)
+
+
+class BradleyTerryRatings:
+    def __init__(self, names: Sequence[str]) -> None:
+        """
+        プレイヤーの名前の一覧からレーティングを初期化する
+        プレイヤーが2人未満の場合はValueError
+        """
+        if len(names) < 2:
+            raise ValueError(f"Need at least 2 players. (count: {len(names)})")
+        self.__names = tuple(names)
+        count = len(names)
+        # __win_counts[i][j]: iがjに勝った数
+        self.__win_counts = [[0] * count for _ in range(count)]
+        self.__thetas = [0.0] * count
+        self.__covariance = [[0.0] * count for _ in range(count)]
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """プレイヤーの名前の一覧を返す"""
+        return self.__names
+
+    def add_results(self, i: int, j: int, i_win_count: int, j_win_count: int) -> None:
+        """
+        プレイヤーiとjの対戦成績を追加し、レーティングを更新する
+        対戦でつながっていないプレイヤーがいる間は、レーティングは0のまま
+        """
+        assert i != j, f"Same player. (player: {i})"
+        self.__win_counts[i][j] += i_win_count
+        self.__win_counts[j][i] += j_win_count
+        self.__update()
+
+    def get_win_count(self, i: int, j: int) -> int:
+        """プレイヤーiがjに勝った数を返す"""
+        return self.__win_counts[i][j]
+
+    def get_game_count(self, i: int) -> int:
+        """プレイヤーiのゲーム数を返す"""
+        return sum(
+            self.__win_counts[i][j] + self.__win_counts[j][i]
+            for j in range(len(self.__names))
+        )
+
+    def get_rating(self, i: int) -> float:
+        """プレイヤーiのレーティング（平均0のEloのスケール）を返す"""
+        mean = sum(self.__thetas) / len(self.__thetas)
+        return (self.__thetas[i] - mean) * ELO_SCALE
+
+    def get_standard_error(self, i: int) -> float:
+        """プレイヤーiのレーティングの標準誤差（Eloのスケール）を返す"""
+        return math.sqrt(max(self.__covariance[i][i], 0.0)) * ELO_SCALE
+
+    def get_confidence_interval(self, i: int, z: float = 1.96) -> tuple[float, float]:
+        """プレイヤーiのレーティングの信頼区間（既定は95%）を返す"""
+        rating = self.get_rating(i)
+        error = self.get_standard_error(i)
+        return rating - z * error, rating + z * error
+
+    def get_expected_score(self, i: int, j: int) -> float:
+        """プレイヤーiがjに勝つ確率の推定値を返す"""
+        return 1 / (1 + math.exp(self.__thetas[j] - self.__thetas[i]))
+
+    def __get_pair_counts(self) -> tuple[list[list[float]], list[list[float]]]:
+        # 全勝、全敗で推定値が発散しないよう、対戦した組には
+        # 0.5勝0.5敗の仮想的なゲームを1つずつ加える
+        count = len(self.__names)
+        wins = [[0.0] * count for _ in range(count)]
+        games = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(count):
+                n = self.__win_counts[i][j] + self.__win_counts[j][i]
+                if (i != j) and (n > 0):
+                    wins[i][j] = self.__win_counts[i][j] + 0.5
+                    games[i][j] = n + 1
+        return wins, games
+
+    def __update(self, max_iterations: int = 50, tolerance: float = 1e-10) -> None:
+        # θ_0 = 0 に固定して、残りをニュートン法で求める
+        count = len(self.__names)
+        wins, games = self.__get_pair_counts()
+        if not self.__is_connected(games):
+            # 対戦でつながっていないプレイヤーがいる間は、比べられないので推定しない
+            return
+        thetas = self.__thetas
+        base = thetas[0]
+        thetas = [theta - base for theta in thetas]
+        information: list[list[float]] = []
+        for _ in range(max_iterations):
+            gradient = [0.0] * count
+            information = [[0.0] * count for _ in range(count)]
+            for i in range(count):
+                for j in range(count):
+                    if games[i][j] == 0:
+                        continue
+                    p = 1 / (1 + math.exp(thetas[j] - thetas[i]))
+                    gradient[i] += wins[i][j] - games[i][j] * p
+                    weight = games[i][j] * p * (1 - p)
+                    information[i][i] += weight
+                    information[i][j] -= weight
+            free_information = [row[1:] for row in information[1:]]
+            step = solve(free_information, gradient[1:])
+            for k, delta in enumerate(step, 1):
+                thetas[k] += delta
+            if max(abs(delta) for delta in step) < tolerance:
+                break
+        self.__thetas = thetas
+
+        # θ_0を固定したときの共分散を、平均を0にしたときの共分散に変換する
+        free_covariance = invert([row[1:] for row in information[1:]])
+        covariance = [[0.0] * count for _ in range(count)]
+        for i in range(1, count):
+            for j in range(1, count):
+                covariance[i][j] = free_covariance[i - 1][j - 1]
+        row_means = [sum(row) / count for row in covariance]
+        total_mean = sum(row_means) / count
+        self.__covariance = [
+            [
+                covariance[i][j] - row_means[i] - row_means[j] + total_mean
+                for j in range(count)
+            ]
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def __is_connected(games: list[list[float]]) -> bool:
+        count = len(games)
+        visited = {0}
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            for j in range(count):
+                if (games[i][j] > 0) and (j not in visited):
+                    visited.add(j)
+                    stack.append(j)
+        return len(visited) == count
+
+
+def solve(matrix: list[list[float]], vector: list[float]) -> list[float]:
+    """連立一次方程式 matrix * x = vector を解いて返す（部分ピボット選択のガウスの消去法）"""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        pivot_value = rows[column][column]
+        for row in range(size):
+            if row == column:
+                continue
+            factor = rows[row][column] / pivot_value
+            if factor != 0:
+                for k in range(column, size + 1):
+                    rows[row][k] -= factor * rows[column][k]
+    return [rows[row][size] / rows[row][row] for row in range(size)]
+
+
+def invert(matrix: list[list[float]]) -> list[list[float]]:
+    """逆行列を返す"""
+    size = len(matrix)
+    columns = [
+        solve(matrix, [1.0 if row == column else 0.0 for row in range(size)])
+        for column in range(size)
+    ]
+    return [[columns[column][row] for column in range(size)] for row in range(size)]
+
+
+if __name__ == "__main__":
+    ratings = BradleyTerryRatings(["random", "smart", "smart2"])
+    ratings.add_results(0, 1, 300, 700)
+    ratings.add_results(1, 2, 500, 500)
+    ratings.add_results(0, 2, 320, 680)
+    for i, name in enumerate(ratings.names):
+        low, high = ratings.get_confidence_interval(i)
+        print(f"{name:8}: {ratings.get_rating(i):7.1f} ({low:7.1f} - {high:7.1f})")
+    print(f"random vs smart: {ratings.get_expected_score(0, 1):.3f}")
@@ -0,0 +1,155 @@
+# 対戦の結果を出力するもの
+#
+# ゲームごとにターミナルへ出力すると、大量の対戦では出力の時間が支配的になるので、
+# - ゲームごとの出力（GameLogger）
+# - 一定の時間ごとの進捗の出力（ProgressReporter）
+# - ファイルへのバッファ付きの記録（GameRecorder）
+# を使い分けられるようにする
+
+import time
+from typing import Callable, Protocol, TextIO
+
+from terminal import Terminal
+
+
+class BattleObserver(Protocol):
+    def game_finished(
+        self, game_index: int, deal_index: int, player0_won: bool
+    ) -> None:
+        """ゲームが終わったときに実行される"""
+        ...
+
+
+class GameLogger(BattleObserver):
+    def __init__(self, terminal: Terminal, total_count: int) -> None:
+        """ゲームごとに勝ったプレイヤーを出力するものを初期化する"""
+        self.__terminal = terminal
+        self.__total_count = total_count
+
+    def game_finished(
+        self, game_index: int, deal_index: int, player0_won: bool
+    ) -> None:
+        """勝ったプレイヤーを出力する"""
+        name = "Player0" if player0_won else "Player1"
+        self.__terminal.put_str(f"[{game_index}/{self.__total_count}] {name} won.")
+
+
+class ProgressReporter(BattleObserver):
+    def __init__(
+        self,
+        terminal: Terminal,
+        total_count: int,
+        interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        進捗を出力するものを初期化する
+        進捗はゲームの数によらず、interval秒ごとに出力する
+        """
+        assert interval > 0, f"Invalid interval. (interval: {interval})"
+        self.__terminal = terminal
+        self.__total_count = total_count
+        self.__interval = interval
+        self.__clock = clock
+        self.__start_time = clock()
+        self.__next_time = self.__start_time + interval
+        self.__game_count = 0
+        self.__player0_win_count = 0
+        self.__skipped_count = 0
+
+    @property
+    def game_count(self) -> int:
+        """終わったゲームの数を返す"""
+        return self.__game_count
+
+    def game_finished(
+        self, game_index: int, deal_index: int, player0_won: bool
+    ) -> None:
+        """ゲームの結果を数え、前回の出力から一定の時間が経っていたら進捗を出力する"""
+        self.__game_count += 1
+        if player0_won:
+            self.__player0_win_count += 1
+        if self.__clock() >= self.__next_time:
+            self.__report()
+
+    def skip(self, game_count: int, player0_win_count: int) -> None:
+        """
+        再開した場合に、前回までに終わっていたゲームを数える
+        前回までのゲームは、速度と残り時間の計算には含めない
+        """
+        self.__game_count += game_count
+        self.__player0_win_count += player0_win_count
+        self.__skipped_count += game_count
+
+    def update(self, game_count: int, player0_win_count: int) -> None:
+        """
+        終わったゲームの総数と先手の勝った総数を更新し、
+        前回の出力から一定の時間が経っていたら進捗を出力する
+        """
+        self.__game_count = game_count
+        self.__player0_win_count = player0_win_count
+        if self.__clock() >= self.__next_time:
+            self.__report()
+
+    def finish(self) -> None:
+        """最後の進捗を出力する"""
+        self.__report()
+
+    def __report(self) -> None:
+        now = self.__clock()
+        self.__next_time = now + self.__interval
+        game_count = self.__game_count
+        elapsed = now - self.__start_time
+        played_count = game_count - self.__skipped_count
+        rate = played_count / elapsed if elapsed > 0 else 0.0
+        if rate > 0:
+            eta = self.__format_seconds((self.__total_count - game_count) / rate)
+        else:
+            eta = "--:--:--"
+        if game_count > 0:
+            player0_win_rate = self.__player0_win_count * 100 / game_count
+        else:
+            player0_win_rate = 0.0
+        self.__terminal.put_str(
+            f"[{game_count}/{self.__total_count}] {rate:,.0f} games/sec, "
+            f"ETA {eta}, Player0 {player0_win_rate:6.2f}%, "
+            f"Player1 {100 - player0_win_rate:6.2f}%"
+        )
+
+    @staticmethod
+    def __format_seconds(seconds: float) -> str:
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
+
+
+class GameRecorder(BattleObserver):
+    # 記録の1行目（ゲームの番号、ディールの番号、勝ったプレイヤーの番号）
+    HEADER = "game,deal,winner\n"
+
+    def __init__(self, out_stream: TextIO) -> None:
+        """
+        ゲームごとの結果をCSVで記録するものを初期化する
+        書き出しのたびにflushしないので、バッファの大きなストリームを渡すとよい
+        """
+        self.__out_stream = out_stream
+
+    def game_finished(
+        self, game_index: int, deal_index: int, player0_won: bool
+    ) -> None:
+        """ゲームの結果を1行記録する"""
+        winner = 0 if player0_won else 1
+        self.__out_stream.write(f"{game_index},{deal_index},{winner}\n")
+
+
+if __name__ == "__main__":
+    import sys
+
+    terminal = Terminal()
+    reporter = ProgressReporter(terminal, 3000000, 0.5)
+    recorder = GameRecorder(sys.stdout)
+    for i in range(3000000):
+        reporter.game_finished(i, i % 630, i % 3 != 0)
+        if i < 3:
+            recorder.game_finished(i, i % 630, i % 3 != 0)
+    reporter.finish()
@@ -0,0 +1,22 @@
+import hashlib
+from typing import Optional, Union
+
+
+def derive_seed(random_state: Optional[int], *keys: Union[int, str]) -> Optional[int]:
+    """
+    親のシードとキーの並びから子のシードを導出して返す
+    同じ親のシードとキーからは常に同じシードが得られる
+    親のシードがNoneの場合は子もNone（毎回異なる乱数）になる
+    """
+    if random_state is None:
+        return None
+    source = ":".join(str(value) for value in (random_state, *keys))
+    digest = hashlib.sha256(source.encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+if __name__ == "__main__":
+    print(derive_seed(0, "dealer"))
+    print(derive_seed(0, "game", 1, "player0"))
+    print(derive_seed(0, "game", 1, "player1"))
+    print(derive_seed(None, "dealer"))
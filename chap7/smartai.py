@@ -4,16 +4,16 @@ from typing import Optional
 from action import Action, ActionList, AskAction, GuessAction
 from card import Card, Hand
 from game import GameObserver
-from player import Player
+from player import Player, ResettablePlayer
 
 
-class SmartAI(Player, GameObserver):  # type: ignore
+class SmartAI(ResettablePlayer, GameObserver):  # type: ignore
     def __init__(
         self, name: str, hand: Hand, random_state: Optional[int] = None
     ) -> None:
         self.__name = name
         self.__hand = hand
-        self.__random_state = random_state
+        self.__random = random.Random(random_state)
 
         # 伏せられたカードの候補
         self.__rest_cards: list[Card] = []
@@ -25,12 +25,15 @@ class SmartAI(Player, GameObserver):  # type: ignore
         self.__init_state()
 
     def __init_state(self) -> None:
-        self.__rest_cards = [
-            card for card in Card.get_all_cards() if not self.__hand.has_card(card)
-        ]
+        self.__rest_cards = self.__hand.get_other_cards()
         self.__bluff_cards = list(self.__hand.cards)
         self.__maybe_card = None
-        random.seed(self.__random_state)
+
+    def reset(self, hand: Hand, random_state: Optional[int] = None) -> None:
+        """次のゲームのために手札と乱数を初期化する"""
+        self.__hand = hand
+        self.__random.seed(random_state)
+        self.__init_state()
 
     @property
     def name(self) -> str:
@@ -83,20 +86,22 @@ class SmartAI(Player, GameObserver):  # type: ignore
             guess = GuessAction(self.__maybe_card)
         return guess
 
-    def __may_guess(self, guess_actions: list[GuessAction]) -> Optional[GuessAction]:
+    def __may_guess(
+        self, guess_actions: tuple[GuessAction, ...]
+    ) -> Optional[GuessAction]:
         guess: Optional[GuessAction] = None
         if guess_actions:
             if self.__rest_cards:
                 guess_th = 1 / len(self.__rest_cards)
-                if random.random() <= guess_th:
-                    selected_card = random.choice(self.__rest_cards)
+                if self.__random.random() <= guess_th:
+                    selected_card = self.__random.choice(self.__rest_cards)
                     guess = GuessAction(selected_card)
             else:
                 # 相手のブラフと判断したカードがブラフではなく、
                 # しかし相手がそのカードを推測しなかった場合、
                 # 伏せられたカードの候補がなくなることがある
                 # この場合はランダムに推測する
-                guess = random.choice(guess_actions)
+                guess = self.__random.choice(guess_actions)
         return guess
 
     def __may_bluff(self) -> Optional[AskAction]:
@@ -104,13 +109,13 @@ class SmartAI(Player, GameObserver):  # type: ignore
         if self.__bluff_cards:
             # 4枚: 5%, 3枚: 10%, 2枚: 15%, 1枚: 20%
             bluff_th = (5 - len(self.__bluff_cards)) / 20
-            if random.random() <= bluff_th:
-                selected_card = random.choice(self.__bluff_cards)
+            if self.__random.random() <= bluff_th:
+                selected_card = self.__random.choice(self.__bluff_cards)
                 bluff = AskAction(selected_card)
         return bluff
 
     def __ask(self) -> AskAction:
-        selected_card = random.choice(self.__rest_cards)
+        selected_card = self.__random.choice(self.__rest_cards)
         return AskAction(selected_card)
 
     def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
@@ -147,7 +152,7 @@ class SmartAI(Player, GameObserver):  # type: ignore
                     # たまたま当たった可能性は低い
                     # （＝ブラフの可能性高い）
                     not_bluff_th = 1 / len(self.__rest_cards)
-                    if random.random() <= not_bluff_th:
+                    if self.__random.random() <= not_bluff_th:
                         self.__maybe_card = ask.card
                     else:
                         self.__rest_cards.remove(ask.card)
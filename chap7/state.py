@@ -0,0 +1,154 @@
+from typing import Any, Optional
+
+from action import Action, ActionList, AskAction
+from card import Deal
+
+# 取り消し用の履歴
+# （直前の履歴, 行動前の手番, 行動前の直前の質問）を連結リストにしたもの
+# 履歴は変更しないので、複製した状態どうしで共有できる
+History = Optional[tuple[Any, int, Optional[AskAction]]]
+
+
+class GameState:
+    def __init__(self, deal: Deal) -> None:
+        """ディールからゲームの初期状態を初期化する"""
+        self.__hand_masks = (deal.player0_mask, deal.player1_mask)
+        self.__rest_mask = deal.rest_mask
+        self.__turn = 0
+        self.__prev_action: Optional[AskAction] = None
+        self.__winner: Optional[int] = None
+        self.__history: History = None
+
+    @property
+    def turn(self) -> int:
+        """手番のプレイヤーの番号（0か1）を返す"""
+        return self.__turn
+
+    @property
+    def prev_action(self) -> Optional[AskAction]:
+        """直前の質問を返す"""
+        return self.__prev_action
+
+    @property
+    def winner(self) -> Optional[int]:
+        """勝ったプレイヤーの番号を返す（ゲーム中はNone）"""
+        return self.__winner
+
+    @property
+    def is_finished(self) -> bool:
+        """ゲームが終わったか返す"""
+        return self.__winner is not None
+
+    @property
+    def turn_hand_mask(self) -> int:
+        """手番のプレイヤーの手札のビットマスクを返す"""
+        return self.__hand_masks[self.__turn]
+
+    @property
+    def opponent_hand_mask(self) -> int:
+        """手番でないプレイヤーの手札のビットマスクを返す"""
+        return self.__hand_masks[self.__turn ^ 1]
+
+    @property
+    def rest_mask(self) -> int:
+        """残ったカードのビットを返す"""
+        return self.__rest_mask
+
+    @property
+    def available_actions(self) -> ActionList:
+        """手番のプレイヤーが選択可能な行動の一覧を返す"""
+        return ActionList.get_available_actions_by_mask(
+            self.turn_hand_mask, self.__prev_action
+        )
+
+    @property
+    def key(self) -> tuple[int, int, int, int, int, int]:
+        """状態を表すハッシュ可能な値を返す（履歴は含まない）"""
+        prev_mask = 0 if self.__prev_action is None else self.__prev_action.card.mask
+        winner = -1 if self.__winner is None else self.__winner
+        return (
+            self.__hand_masks[0],
+            self.__hand_masks[1],
+            self.__rest_mask,
+            self.__turn,
+            prev_mask,
+            winner,
+        )
+
+    def apply(self, action: Action) -> bool:
+        """
+        手番のプレイヤーの行動を適用し、当たったかを返す
+        選択できない行動やゲーム終了後の場合はAssertionError
+        """
+        assert not self.is_finished, "Game is already finished."
+        assert action in self.available_actions, (
+            "Invalid action. "
+            f"(action: {action}, available: {self.available_actions})"
+        )
+        self.__history = (self.__history, self.__turn, self.__prev_action)
+        if isinstance(action, AskAction):
+            is_hit = (self.opponent_hand_mask & action.card.mask) != 0
+            self.__prev_action = action
+            self.__turn ^= 1
+        else:
+            is_hit = action.card.mask == self.__rest_mask
+            self.__winner = self.__turn if is_hit else self.__turn ^ 1
+        return is_hit
+
+    def undo(self) -> None:
+        """
+        直前のapply()を取り消す
+        取り消す行動がない場合はAssertionError
+        """
+        assert self.__history is not None, "No action to undo."
+        self.__history, self.__turn, self.__prev_action = self.__history
+        self.__winner = None
+
+    def clone(self) -> "GameState":
+        """
+        状態を複製して返す
+        履歴は変更されないので共有し、複製のコストは一定
+        """
+        state = GameState.__new__(GameState)
+        state.__hand_masks = self.__hand_masks
+        state.__rest_mask = self.__rest_mask
+        state.__turn = self.__turn
+        state.__prev_action = self.__prev_action
+        state.__winner = self.__winner
+        state.__history = self.__history
+        return state
+
+    def __hash__(self) -> int:
+        """状態のハッシュ値を返す"""
+        return hash(self.key)
+
+    def __eq__(self, other: Any) -> bool:
+        """状態が同じか返す"""
+        return isinstance(other, GameState) and (self.key == other.key)
+
+    def __repr__(self) -> str:
+        """状態を表現する文字列を返す"""
+        return (
+            f"GameState(hands=({self.__hand_masks[0]:09b}, "
+            f"{self.__hand_masks[1]:09b}), rest={self.__rest_mask:09b}, "
+            f"turn={self.__turn}, prev={self.__prev_action}, winner={self.__winner})"
+        )
+
+
+if __name__ == "__main__":
+    from card import Card, Dealer
+
+    deal = Dealer(0).deal()
+    state = GameState(deal)
+    print(state)
+    print(state.available_actions)
+
+    print(state.apply(AskAction(Card(1))))
+    print(state)
+    cloned = state.clone()
+    print(state.available_actions)
+
+    print(state.apply(state.available_actions.guess_actions[0]))
+    print(state)
+    state.undo()
+    print(state, state == cloned)
@@ -0,0 +1,252 @@
+import math
+from typing import Optional
+
+from card import Deal
+
+
+class DealTally:
+    def __init__(self) -> None:
+        """ディールごとの対戦成績の集計を初期化する"""
+        self.__game_counts = [0] * Deal.COUNT
+        self.__player0_win_counts = [0] * Deal.COUNT
+        # 席を入れ替えた組の結果ごとの数
+        # __pair_counts[2 * x + y]: 先手で勝ったか（x）、後手で勝ったか（y）
+        self.__pair_counts = [0] * 4
+
+    @property
+    def game_count(self) -> int:
+        """ゲームの総数を返す"""
+        return sum(self.__game_counts)
+
+    @property
+    def player0_win_count(self) -> int:
+        """先手が勝ったゲームの総数を返す"""
+        return sum(self.__player0_win_counts)
+
+    @property
+    def pair_count(self) -> int:
+        """席を入れ替えた組の数を返す"""
+        return sum(self.__pair_counts)
+
+    def add(self, deal_index: int, player0_won: bool) -> None:
+        """ディールの番号とその結果を追加する"""
+        self.__game_counts[deal_index] += 1
+        if player0_won:
+            self.__player0_win_counts[deal_index] += 1
+
+    def add_pair(self, deal_index: int, first_won: bool, second_won: bool) -> None:
+        """
+        同じディールで席を入れ替えた2つのゲームの結果を追加する
+        first_wonはPlayer0が先手のゲーム、second_wonはPlayer0が後手のゲームで
+        Player0が勝ったか（この場合、集計の「先手」はPlayer0を表す）
+        """
+        self.add(deal_index, first_won)
+        self.add(deal_index, second_won)
+        self.__pair_counts[2 * first_won + second_won] += 1
+
+    def merge(self, other: "DealTally") -> None:
+        """別の集計の結果を足し合わせる"""
+        for deal_index in range(Deal.COUNT):
+            self.__game_counts[deal_index] += other.get_game_count(deal_index)
+            self.__player0_win_counts[deal_index] += other.get_player0_win_count(
+                deal_index
+            )
+        for first_won in [False, True]:
+            for second_won in [False, True]:
+                self.__pair_counts[2 * first_won + second_won] += other.get_pair_count(
+                    first_won, second_won
+                )
+
+    def to_dict(self) -> dict[str, list[int]]:
+        """JSONにできる辞書にして返す"""
+        return {
+            "game_counts": list(self.__game_counts),
+            "player0_win_counts": list(self.__player0_win_counts),
+            "pair_counts": list(self.__pair_counts),
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, list[int]]) -> "DealTally":
+        """
+        to_dict()で作った辞書から集計を作って返す
+        長さが合わない場合はValueError
+        """
+        tally = DealTally()
+        for key, count in [
+            ("game_counts", Deal.COUNT),
+            ("player0_win_counts", Deal.COUNT),
+            ("pair_counts", 4),
+        ]:
+            if len(data[key]) != count:
+                raise ValueError(f"Invalid tally. (key: {key})")
+        tally.__game_counts = list(data["game_counts"])
+        tally.__player0_win_counts = list(data["player0_win_counts"])
+        tally.__pair_counts = list(data["pair_counts"])
+        return tally
+
+    def get_game_count(self, deal_index: int) -> int:
+        """指定されたディールのゲーム数を返す"""
+        return self.__game_counts[deal_index]
+
+    def get_player0_win_count(self, deal_index: int) -> int:
+        """指定されたディールで先手が勝ったゲーム数を返す"""
+        return self.__player0_win_counts[deal_index]
+
+    def get_pair_count(self, first_won: bool, second_won: bool) -> int:
+        """席を入れ替えた組のうち、Player0の勝ち負けが指定されたものの数を返す"""
+        return self.__pair_counts[2 * first_won + second_won]
+
+    def get_stratum_variance(self, deal_index: int) -> float:
+        """
+        指定されたディールでの先手の勝ち（1）負け（0）の標本分散を返す
+        ゲーム数が2未満の場合は計算できないのでnan
+        """
+        n = self.__game_counts[deal_index]
+        if n < 2:
+            return math.nan
+        p = self.__player0_win_counts[deal_index] / n
+        return p * (1 - p) * n / (n - 1)
+
+    def get_simple_estimate(self) -> tuple[float, float]:
+        """
+        層を考えない先手の勝率の推定値と標準誤差を返す
+        ゲームがない場合はnan
+        """
+        n = self.game_count
+        if n == 0:
+            return math.nan, math.nan
+        p = self.player0_win_count / n
+        return p, math.sqrt(p * (1 - p) / n)
+
+    def get_stratified_estimate(self) -> tuple[float, float]:
+        """
+        ディールを層とした先手の勝率の推定値と標準誤差を返す
+        ディールはどれも同じ確率で配られるので、各層の重みは1/COUNT
+        すべてのディールを2回以上対戦していない場合はnan
+        """
+        if min(self.__game_counts) < 2:
+            return math.nan, math.nan
+        weight = 1 / Deal.COUNT
+        estimate = 0.0
+        variance = 0.0
+        for deal_index in range(Deal.COUNT):
+            n = self.__game_counts[deal_index]
+            p = self.__player0_win_counts[deal_index] / n
+            estimate += weight * p
+            variance += weight**2 * self.get_stratum_variance(deal_index) / n
+        return estimate, math.sqrt(variance)
+
+    def get_paired_estimate(self) -> tuple[float, float]:
+        """
+        席を入れ替えた組ごとの平均（0, 1/2, 1）から、Player0の勝率の推定値と標準誤差を返す
+        同じディールと同じシードで打つので、ディールの運と先手の有利が組の中で打ち消し合う
+        組が2つ未満の場合はnan
+        """
+        n = self.pair_count
+        if n < 2:
+            return math.nan, math.nan
+        scores = [0.0, 0.5, 0.5, 1.0]
+        mean = sum(score * c for score, c in zip(scores, self.__pair_counts)) / n
+        variance = sum(
+            (score - mean) ** 2 * c for score, c in zip(scores, self.__pair_counts)
+        ) / (n - 1)
+        return mean, math.sqrt(variance / n)
+
+    def get_variance_reduction(self) -> float:
+        """
+        ゲームを独立とみなした推定（get_simple_estimate()）に比べて、
+        組にした推定で取り除けた分散の割合を返す（負なら増えている）
+        計算できない場合はnan
+        """
+        _, paired_error = self.get_paired_estimate()
+        _, simple_error = self.get_simple_estimate()
+        if math.isnan(paired_error) or (simple_error == 0):
+            return math.nan
+        return 1 - (paired_error / simple_error) ** 2
+
+
+class WinRateConfidenceSequence:
+    def __init__(self, alpha: float, optimal_count: int = 10000) -> None:
+        """
+        先手の勝率の信頼系列（いつ止めても有効な信頼区間）を初期化する
+        どの時点で見ても、真の勝率が区間から外れる確率は全体でalpha以下
+        optimal_countは区間がもっとも狭くなるゲーム数の目安（有効性には影響しない）
+        """
+        assert 0 < alpha < 1, f"Invalid alpha. (alpha: {alpha})"
+        assert optimal_count > 0, f"Invalid count. (count: {optimal_count})"
+        self.__alpha = alpha
+        # 正規分布の混合による境界（Robbins）
+        # 勝ち負けは分散が1/4以下なので、ゲーム数nに対して分散の上限はn/4
+        log_alpha = math.log(1 / alpha)
+        self.__rho = (optimal_count / 4) / (2 * log_alpha + math.log(1 + 2 * log_alpha))
+        self.__game_count = 0
+        self.__player0_win_count = 0.0
+
+    @property
+    def alpha(self) -> float:
+        """誤り確率の上限を返す"""
+        return self.__alpha
+
+    @property
+    def game_count(self) -> int:
+        """ゲーム数を返す"""
+        return self.__game_count
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """
+        先手の勝率の区間を返す
+        ゲームがない場合は(0, 1)
+        """
+        n = self.__game_count
+        if n == 0:
+            return 0.0, 1.0
+        v = n / 4 + self.__rho
+        radius = math.sqrt(v * math.log(v / (self.__rho * self.__alpha**2))) / n
+        p = self.__player0_win_count / n
+        return max(p - radius, 0.0), min(p + radius, 1.0)
+
+    @property
+    def decision(self) -> Optional[int]:
+        """
+        区間が1/2を含まなくなったら、勝率の高いプレイヤーの番号（0か1）を返す
+        まだ決まらない場合はNone
+        """
+        lower, upper = self.interval
+        if lower > 0.5:
+            return 0
+        if upper < 0.5:
+            return 1
+        return None
+
+    def update(self, game_count: int, player0_win_count: float) -> None:
+        """
+        ゲームの総数と先手の勝った総数を更新する
+        0から1の値をとる得点（組の平均など）の場合は、得点の総和を勝った総数とする
+        """
+        self.__game_count = game_count
+        self.__player0_win_count = player0_win_count
+
+
+if __name__ == "__main__":
+    import random
+
+    tally = DealTally()
+    rng = random.Random(0)
+    for deal_index in range(Deal.COUNT):
+        # ディールによって勝ちやすさが違う場合
+        p = deal_index / Deal.COUNT
+        for _ in range(10):
+            tally.add(deal_index, rng.random() < p)
+    print(tally.get_simple_estimate())
+    print(tally.get_stratified_estimate())
+
+    # 勝率0.55の場合に、どれだけのゲーム数で決まるか
+    sequence = WinRateConfidenceSequence(0.05)
+    win_count = 0
+    game_count = 0
+    while sequence.decision is None:
+        game_count += 1
+        win_count += rng.random() < 0.55
+        sequence.update(game_count, win_count)
+    print(sequence.game_count, sequence.decision, sequence.interval)
@@ -0,0 +1,127 @@
+import threading
+
+from action import ActionList, AskAction, GuessAction
+from card import Card, Hand
+from testtool import TestSubject
+
+with TestSubject("Action (flyweight)") as subject:
+
+    @subject.testcase("same card returns same ask.")
+    def test_same_ask() -> bool:
+        if AskAction(Card(1)) is not AskAction(Card(1)):
+            return False
+        return AskAction(Card(1)) is not AskAction(Card(2))
+
+    @subject.testcase("same card returns same guess.")
+    def test_same_guess() -> bool:
+        if GuessAction(Card(1)) is not GuessAction(Card(1)):
+            return False
+        return GuessAction(Card(1)) is not GuessAction(Card(2))
+
+    @subject.testcase("ask and guess are different.")
+    def test_ask_and_guess() -> bool:
+        return AskAction(Card(1)) != GuessAction(Card(1))
+
+    @subject.testcase("actions are hashable.")
+    def test_hashable() -> bool:
+        actions = {AskAction(Card(1)), AskAction(Card(1)), GuessAction(Card(1))}
+        return len(actions) == 2
+
+    @subject.testcase("action is immutable.")
+    def test_immutable() -> bool:
+        ask = AskAction(Card(1))
+        try:
+            ask.foo = 1
+            return False
+        except AttributeError:
+            return True
+
+    @subject.testcase("check whether actions are hit.")
+    def test_is_hit() -> bool:
+        if not GuessAction(Card(1)).is_hit(Card(1)):
+            return False
+        return not GuessAction(Card(1)).is_hit(Card(2))
+
+
+with TestSubject("ActionList (table)") as subject:
+    hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+
+    @subject.testcase("first turn has only asks.")
+    def test_first_turn() -> bool:
+        actions = ActionList.get_available_actions(hand, None)
+        if actions.ask_actions != tuple(
+            AskAction(card) for card in Card.get_all_cards()
+        ):
+            return False
+        return actions.guess_actions == ()
+
+    @subject.testcase("later turn excludes previous ask.")
+    def test_later_turn() -> bool:
+        actions = ActionList.get_available_actions(hand, AskAction(Card(5)))
+        ask_expected = tuple(
+            AskAction(Card(number)) for number in [1, 2, 3, 4, 6, 7, 8, 9]
+        )
+        guess_expected = tuple(GuessAction(Card(number)) for number in [5, 6, 7, 8, 9])
+        if actions.ask_actions != ask_expected:
+            return False
+        return actions.guess_actions == guess_expected
+
+    @subject.testcase("same state returns shared list.")
+    def test_shared() -> bool:
+        same_hand = Hand([Card(number) for number in [4, 3, 2, 1]])
+        actions1 = ActionList.get_available_actions(hand, AskAction(Card(5)))
+        actions2 = ActionList.get_available_actions(same_hand, AskAction(Card(5)))
+        return actions1 is actions2
+
+    @subject.testcase("first use from many threads.")
+    def test_threads() -> bool:
+        # 表を作り直させて、8つのスレッドから同時に引く
+        setattr(ActionList, "_ActionList__table", {})
+        barrier = threading.Barrier(8)
+        errors: list[BaseException] = []
+
+        def lookup() -> None:
+            barrier.wait()
+            try:
+                for mask in [hand.mask, 0b111100000]:
+                    ActionList.get_available_actions_by_mask(mask, AskAction(Card(9)))
+            except BaseException as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return not errors
+
+
+with TestSubject("ActionList (membership)") as subject:
+    hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+    actions = ActionList.get_available_actions(hand, AskAction(Card(5)))
+
+    @subject.testcase("check whether action is in list.")
+    def test_contains() -> bool:
+        for action in actions.all_actions:
+            if action not in actions:
+                return False
+        if AskAction(Card(5)) in actions:
+            return False
+        return GuessAction(Card(1)) not in actions
+
+    @subject.testcase("action masks.")
+    def test_masks() -> bool:
+        if actions.ask_mask != 0b111101111:
+            return False
+        return actions.guess_mask == 0b111110000
+
+    @subject.testcase("choose action uniformly.")
+    def test_choice() -> bool:
+        import random
+
+        rng = random.Random(0)
+        counts = {action: 0 for action in actions.all_actions}
+        for _ in range(13000):
+            counts[actions.choice(rng)] += 1
+        # 各行動がおよそ1000回ずつ選ばれる
+        return all(800 < count < 1200 for count in counts.values())
@@ -0,0 +1,18 @@
+python test_action.py
+python test_asyncgame.py
+python test_batch.py
+python test_batchgame.py
+python test_card.py
+python test_checkpoint.py
+python test_event.py
+python test_game.py
+python test_guessit_battle_ai.py
+python test_guessit_league.py
+python test_headless.py
+python test_pool.py
+python test_rating.py
+python test_report.py
+python test_seed.py
+python test_smartai.py
+python test_state.py
+python test_stats.py
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+from typing import Union
+
+from action import Action, ActionList, AskAction, GuessAction
+from asyncgame import AsyncGame, AsyncPlayer, SyncPlayerAdapter
+from card import Card, Deal, Dealer, Hand
+from event import AskEvent, EventBus, GuessEvent
+from game import Game
+from player import Player, RandomAI
+from smartai import SmartAI
+from testtool import TestSubject
+
+
+class ScenarioPlayer(AsyncPlayer):
+    def __init__(self, name: str, actions: list[Action]) -> None:
+        self.__name = name
+        self.__actions = actions
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    async def select_action(self, available_actions: ActionList) -> Action:
+        await asyncio.sleep(0)
+        return self.__actions.pop(0)
+
+
+class ThreadRecorder(Player):
+    def __init__(self, player: Player) -> None:
+        self.__player = player
+        self.threads: set[threading.Thread] = set()
+
+    @property
+    def name(self) -> str:
+        return self.__player.name
+
+    def select_action(self, available_actions: ActionList) -> Action:
+        self.threads.add(threading.current_thread())
+        return self.__player.select_action(available_actions)
+
+
+class NotifyRecorder:
+    def __init__(self) -> None:
+        self.players: list[object] = []
+
+    def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
+        self.players.append(player)
+
+    def player_guessed(self, player: Player, guess: GuessAction, is_hit: bool) -> None:
+        self.players.append(player)
+
+
+class BlockingObserver:
+    # releaseがセットされるまで通知を処理しない
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.timed_out = False
+        self.count = 0
+
+    def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
+        self.__wait()
+
+    def player_guessed(self, player: Player, guess: GuessAction, is_hit: bool) -> None:
+        self.__wait()
+
+    def __wait(self) -> None:
+        self.started.set()
+        # イベントループが止められていると、releaseをセットするタスクが動かない
+        if not self.release.wait(10):
+            self.timed_out = True
+        self.count += 1
+
+
+with TestSubject("AsyncGame") as subject:
+    player0_hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+    player1_hand = Hand([Card(number) for number in [5, 6, 7, 8]])
+    deal = Deal(player0_hand, player1_hand, Card(9))
+
+    @subject.testcase("play scenario.")
+    def test_scenario() -> bool:
+        player0 = ScenarioPlayer("player0", [AskAction(Card(5))])
+        player1 = ScenarioPlayer("player1", [GuessAction(Card(9))])
+        game = AsyncGame(deal, player0, player1)
+        recorder = NotifyRecorder()
+        game.add_observer(recorder)
+        winner = asyncio.run(game.start())
+        return (winner is player1) and (recorder.players == [player0, player1])
+
+    @subject.testcase("same result as Game with adapted players.")
+    def test_same_as_game() -> bool:
+        dealer = Dealer(0, counter_based=True)
+
+        async def play_all() -> list[int]:
+            games = []
+            players = []
+            for i in range(100):
+                deal = dealer.deal_at(i)
+                player0 = SmartAI("Player0", deal.player0_hand, i)
+                player1 = RandomAI("Player1", i)
+                adapters = (SyncPlayerAdapter(player0), SyncPlayerAdapter(player1))
+                game = AsyncGame(deal, *adapters)
+                game.add_observer(player0)
+                games.append(game.start())
+                players.append(adapters[0])
+            winners = await asyncio.gather(*games)
+            return [0 if w is p else 1 for w, p in zip(winners, players)]
+
+        async_winners = asyncio.run(play_all())
+        game_winners = []
+        for i in range(100):
+            deal = dealer.deal_at(i)
+            player0 = SmartAI("Player0", deal.player0_hand, i)
+            player1 = RandomAI("Player1", i)
+            game = Game(deal, player0, player1)
+            game.add_observer(player0)
+            game_winners.append(0 if game.start() is player0 else 1)
+        return async_winners == game_winners
+
+    @subject.testcase("run blocking player on another thread.")
+    def test_blocking() -> bool:
+        player0 = ThreadRecorder(RandomAI("player0", 0))
+        player1 = ThreadRecorder(RandomAI("player1", 1))
+        game = AsyncGame(
+            deal,
+            SyncPlayerAdapter(player0, blocking=True),
+            SyncPlayerAdapter(player1),
+        )
+        asyncio.run(game.start())
+        main_thread = threading.current_thread()
+        return (main_thread not in player0.threads) and (
+            player1.threads in [set(), {main_thread}]
+        )
+
+    @subject.testcase("other tasks run while waiting for slow async observer.")
+    def test_slow_async_observer() -> bool:
+        # 処理待ちが1つしか溜まらないので、発行かゲームの終わりで待たされる
+        observer = BlockingObserver()
+        game = AsyncGame(
+            deal,
+            SyncPlayerAdapter(RandomAI("player0", 0)),
+            SyncPlayerAdapter(RandomAI("player1", 1)),
+            EventBus(max_queue_size=1),
+        )
+        game.add_observer(observer, asynchronous=True)
+
+        async def release() -> None:
+            # ゲームがオブザーバを待っている間に、このタスクが動けば通知が進む
+            await asyncio.to_thread(observer.started.wait, 10)
+            observer.release.set()
+
+        async def run() -> None:
+            await asyncio.gather(game.start(), release())
+
+        asyncio.run(run())
+        return (observer.count >= 1) and (not observer.timed_out)
+
+    @subject.testcase("many games share an event bus.")
+    def test_shared_bus() -> bool:
+        bus = EventBus(max_queue_size=8)
+        published: list[Union[AskEvent, GuessEvent]] = []
+        handled: list[Union[AskEvent, GuessEvent]] = []
+        bus.subscribe(AskEvent, published.append)
+        bus.subscribe(GuessEvent, published.append)
+        bus.subscribe_async(AskEvent, handled.append)
+        bus.subscribe_async(GuessEvent, handled.append)
+        dealer = Dealer(0)
+
+        async def play(i: int) -> bool:
+            player0 = RandomAI(f"player0-{i}", i)
+            player1 = RandomAI(f"player1-{i}", i + 1000)
+            game = AsyncGame(
+                dealer.deal_at(i),
+                SyncPlayerAdapter(player0),
+                SyncPlayerAdapter(player1),
+                bus,
+            )
+            await game.start()
+            # ゲームが終わった時点で、そのゲームのイベントは処理し終えている
+            players = (player0, player1)
+            mine = [event for event in published if event.player in players]
+            return [event for event in handled if event.player in players] == mine
+
+        async def run() -> list[bool]:
+            return await asyncio.gather(*(play(i) for i in range(300)))
+
+        results = asyncio.run(run())
+        return all(results) and (len(handled) == len(published))
@@ -0,0 +1,46 @@
+import numpy as np
+
+from batch import DealBatch
+from card import Card, Deal, Dealer
+from testtool import TestSubject
+
+with TestSubject("DealBatch") as subject:
+    batch = Dealer(0).deal_batch(1000)
+
+    @subject.testcase("batch size.")
+    def test_size() -> bool:
+        return len(batch) == 1000
+
+    @subject.testcase("masks match deals.")
+    def test_masks() -> bool:
+        for i in range(len(batch)):
+            deal = batch.get_deal(i)
+            if batch.player0_masks[i] != deal.player0_mask:
+                return False
+            if batch.player1_masks[i] != deal.player1_mask:
+                return False
+            if batch.rest_numbers[i] != deal.rest_card.number:
+                return False
+        return True
+
+    @subject.testcase("every deal uses all cards.")
+    def test_all_cards() -> bool:
+        used = batch.player0_masks | batch.player1_masks | batch.rest_masks
+        return bool(np.all(used == Card.ALL_MASK))
+
+    @subject.testcase("card matrix.")
+    def test_card_matrix() -> bool:
+        matrix = DealBatch.get_card_matrix(batch.player0_masks)
+        if matrix.shape != (1000, 9):
+            return False
+        return bool(np.all(matrix.sum(axis=1) == 4))
+
+    @subject.testcase("same seed gives same batch.")
+    def test_same_seed() -> bool:
+        other_batch = Dealer(0).deal_batch(1000)
+        return bool(np.array_equal(batch.indices, other_batch.indices))
+
+    @subject.testcase("deals are spread over all indices.")
+    def test_spread() -> bool:
+        indices = Dealer(1).deal_batch(100000).indices
+        return len(np.unique(indices)) == Deal.COUNT
@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+
+from batchgame import (
+    NO_CARD,
+    BatchGame,
+    BatchPlayer,
+    BatchRandomAI,
+    BatchSmartAI,
+    choose_bits,
+    count_bits,
+    to_masks,
+)
+from card import Dealer
+from headless import HeadlessGame
+from player import Player, RandomAI
+from seed import derive_seed
+from smartai import SmartAI
+from testtool import TestSubject
+
+
+def get_scalar_win_rate(player0_type: str, player1_type: str, count: int) -> float:
+    dealer = Dealer(0)
+    win_count = 0
+    for i in range(count):
+        deal = dealer.deal_at(i)
+        players: list[Player] = []
+        for seat, (player_type, hand) in enumerate(
+            [(player0_type, deal.player0_hand), (player1_type, deal.player1_hand)]
+        ):
+            seed = derive_seed(0, seat, i)
+            if player_type == "smart":
+                players.append(SmartAI(f"Player{seat}", hand, seed))
+            else:
+                players.append(RandomAI(f"Player{seat}", seed))
+        observers = [player for player in players if isinstance(player, SmartAI)]
+        if HeadlessGame(players[0], players[1], observers).play(deal) == 0:
+            win_count += 1
+    return win_count / count
+
+
+def create_batch_player(player_type: str, seed: int) -> BatchPlayer:
+    generator = np.random.default_rng(seed)
+    if player_type == "smart":
+        return BatchSmartAI(generator)
+    return BatchRandomAI(generator)
+
+
+with TestSubject("batch helpers") as subject:
+
+    @subject.testcase("count bits.")
+    def test_count_bits() -> bool:
+        masks = np.array([0, 0b1, 0b101, 0b111111111], dtype=np.uint16)
+        return bool(count_bits(masks).tolist() == [0, 1, 2, 9])
+
+    @subject.testcase("card masks.")
+    def test_to_masks() -> bool:
+        cards = np.array([NO_CARD, 0, 8], dtype=np.int64)
+        return bool(to_masks(cards).tolist() == [0, 0b1, 0b100000000])
+
+    @subject.testcase("choose bits uniformly.")
+    def test_choose_bits() -> bool:
+        generator = np.random.default_rng(0)
+        masks = np.full(90000, 0b100010010, dtype=np.uint16)
+        cards = choose_bits(masks, generator)
+        counts = [int(np.sum(cards == card)) for card in [1, 4, 8]]
+        if sum(counts) != len(masks):
+            return False
+        if not all(29000 < count < 31000 for count in counts):
+            return False
+        empty = choose_bits(np.zeros(3, dtype=np.uint16), generator)
+        return bool(np.all(empty == NO_CARD))
+
+
+with TestSubject("BatchGame") as subject:
+
+    @subject.testcase("all games finish with a winner.")
+    def test_all_finish() -> bool:
+        game = BatchGame(
+            create_batch_player("smart", 0), create_batch_player("random", 1)
+        )
+        winners = game.play(Dealer(0).deal_batch(10000))
+        return bool(np.all((winners == 0) | (winners == 1)))
+
+    @subject.testcase("same win rates as chap7 classes.")
+    def test_same_win_rates() -> bool:
+        batch_count = 200000
+        scalar_count = 20000
+        for player0_type, player1_type in [
+            ("random", "random"),
+            ("smart", "random"),
+            ("random", "smart"),
+            ("smart", "smart"),
+        ]:
+            game = BatchGame(
+                create_batch_player(player0_type, 0),
+                create_batch_player(player1_type, 1),
+            )
+            win_counts = game.play_many(Dealer(1), batch_count, batch_size=50000)
+            batch_rate = win_counts[0] / batch_count
+            scalar_rate = get_scalar_win_rate(player0_type, player1_type, scalar_count)
+            # 2つの推定値の差が標準誤差の4倍以内なら同じとみなす
+            p = scalar_rate
+            error = math.sqrt(p * (1 - p) * (1 / batch_count + 1 / scalar_count))
+            if abs(batch_rate - scalar_rate) > 4 * error:
+                return False
+        return True
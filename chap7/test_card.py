@@ -0,0 +1,420 @@
+import subprocess
+import sys
+import threading
+from typing import Any, Callable, cast
+
+from card import Card, Deal, Dealer, Hand
+from testtool import TestSubject
+
+
+def run_threads(function: Callable[[], object], count: int = 8) -> list[BaseException]:
+    # count個のスレッドで同時にfunctionを実行し、起きた例外を返す
+    barrier = threading.Barrier(count)
+    errors: list[BaseException] = []
+
+    def run() -> None:
+        barrier.wait()
+        try:
+            function()
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+with TestSubject("Card (mask)") as subject:
+
+    @subject.testcase("card mask.")
+    def test_card_mask() -> bool:
+        if Card(1).mask != 0b000000001:
+            return False
+        if Card(9).mask != 0b100000000:
+            return False
+        return True
+
+    @subject.testcase("all cards mask.")
+    def test_all_mask() -> bool:
+        mask = 0
+        for card in Card.get_all_cards():
+            mask |= card.mask
+        return mask == Card.ALL_MASK
+
+    @subject.testcase("get cards from mask.")
+    def test_get_cards_from_mask() -> bool:
+        cards = Card.get_cards_from_mask(0b101000011)
+        expected = [Card(number) for number in [1, 2, 7, 9]]
+        return cards == expected
+
+    @subject.testcase("first use of mask table from many threads.")
+    def test_mask_threads() -> bool:
+        # 表を作り直させて、8つのスレッドから同時に引く
+        setattr(Card, "_Card__cards_table", ())
+
+        def lookup() -> None:
+            if len(Card.get_cards_from_mask(Card.ALL_MASK)) != 9:
+                raise ValueError("Wrong cards.")
+
+        return not run_threads(lookup)
+
+    @subject.testcase("count mask.")
+    def test_count_mask() -> bool:
+        if Card.count_mask(0) != 0:
+            return False
+        return Card.count_mask(Card.ALL_MASK) == 9
+
+
+with TestSubject("Hand (mask)") as subject:
+    hand = Hand([Card(number) for number in [4, 2, 3, 1]])
+
+    @subject.testcase("hand mask.")
+    def test_hand_mask() -> bool:
+        return hand.mask == 0b000001111
+
+    @subject.testcase("other cards.")
+    def test_other_cards() -> bool:
+        if hand.other_mask != 0b111110000:
+            return False
+        expected = [Card(number) for number in [5, 6, 7, 8, 9]]
+        return hand.get_other_cards() == expected
+
+    @subject.testcase("union of hands.")
+    def test_union_mask() -> bool:
+        other_hand = Hand([Card(number) for number in [5, 6, 7, 8]])
+        return hand.union_mask(other_hand) == 0b011111111
+
+    @subject.testcase("hand from mask.")
+    def test_from_mask() -> bool:
+        hand_from_mask = Hand.from_mask(0b000001111)
+        if hand_from_mask != hand:
+            return False
+        if hash(hand_from_mask) != hash(hand):
+            return False
+        return hand_from_mask.cards == hand.cards
+
+    @subject.testcase("changing cards does not change hand.")
+    def test_cards_copy() -> bool:
+        shared_hand = Deal.from_index(0).player0_hand
+        expected = shared_hand.cards
+        shared_hand.cards.append(Card(9))
+        shared_hand.cards.clear()
+        return shared_hand.cards == expected
+
+    @subject.testcase("invalid mask is not allowed.")
+    def test_invalid_mask() -> bool:
+        try:
+            Hand.from_mask(0b000000111)
+            return False
+        except Exception:
+            return True
+
+
+with TestSubject("Deal (mask)") as subject:
+    player0_hand = Hand([Card(number) for number in [1, 5, 7, 8]])
+    player1_hand = Hand([Card(number) for number in [2, 4, 6, 9]])
+    rest_card = Card(3)
+    deal = Deal(player0_hand, player1_hand, rest_card)
+
+    @subject.testcase("deal masks.")
+    def test_deal_masks() -> bool:
+        if deal.player0_mask != player0_hand.mask:
+            return False
+        if deal.player1_mask != player1_hand.mask:
+            return False
+        if deal.rest_mask != rest_card.mask:
+            return False
+        used_mask = deal.player0_mask | deal.player1_mask | deal.rest_mask
+        return used_mask == Card.ALL_MASK
+
+    @subject.testcase("overlapped deal is not allowed.")
+    def test_overlapped_deal() -> bool:
+        try:
+            Deal(player0_hand, player0_hand, rest_card)
+            return False
+        except Exception:
+            return True
+
+
+with TestSubject("Card (flyweight)") as subject:
+
+    @subject.testcase("same number returns same instance.")
+    def test_same_instance() -> bool:
+        if Card(5) is not Card(5):
+            return False
+        return Card.get_all_cards()[4] is Card(5)
+
+    @subject.testcase("card is immutable.")
+    def test_immutable() -> bool:
+        card = Card(5)
+        try:
+            card.foo = 1
+            return False
+        except AttributeError:
+            return True
+
+    @subject.testcase("copy returns same instance.")
+    def test_copy() -> bool:
+        import copy
+        import pickle
+
+        card = Card(5)
+        if copy.deepcopy(card) is not card:
+            return False
+        return pickle.loads(pickle.dumps(card)) is card
+
+
+with TestSubject("Deal (index)") as subject:
+
+    @subject.testcase("all deals are distinct.")
+    def test_all_deals() -> bool:
+        all_deals = Deal.get_all_deals()
+        if len(all_deals) != Deal.COUNT:
+            return False
+        return len(set(all_deals)) == Deal.COUNT
+
+    @subject.testcase("index round trip.")
+    def test_round_trip() -> bool:
+        for index in range(Deal.COUNT):
+            if Deal.from_index(index).index != index:
+                return False
+        return True
+
+    @subject.testcase("index of constructed deal.")
+    def test_constructed_deal() -> bool:
+        player0_hand = Hand([Card(number) for number in [1, 5, 7, 8]])
+        player1_hand = Hand([Card(number) for number in [2, 4, 6, 9]])
+        deal = Deal(player0_hand, player1_hand, Card(3))
+        return Deal.from_index(deal.index) == deal
+
+    @subject.testcase("invalid index is not allowed.")
+    def test_invalid_index() -> bool:
+        try:
+            Deal.from_index(Deal.COUNT)
+            return False
+        except ValueError:
+            return True
+
+    @subject.testcase("first use from many threads.")
+    def test_threads() -> bool:
+        # 表を作り直させて、8つのスレッドから同時に引く
+        setattr(Deal, "_Deal__table", None)
+
+        def lookup() -> None:
+            if Deal.from_index(5).index != 5:
+                raise ValueError("Wrong deal.")
+
+        errors = run_threads(lookup)
+        return (not errors) and (len(Deal.get_all_deals()) == Deal.COUNT)
+
+    @subject.testcase("indexed dealer returns shared deal.")
+    def test_indexed_dealer() -> bool:
+        deal = Dealer(0, indexed=True).deal()
+        return deal is Deal.from_index(deal.index)
+
+
+with TestSubject("Dealer (random state)") as subject:
+
+    @subject.testcase("dealer with same seed deals same sequence.")
+    def test_same_sequence() -> bool:
+        for indexed in [False, True]:
+            dealer1 = Dealer(0, indexed)
+            dealer2 = Dealer(0, indexed)
+            for _ in range(10):
+                if dealer1.deal() != dealer2.deal():
+                    return False
+        return True
+
+    @subject.testcase("dealer does not repeat same deal.")
+    def test_not_repeat() -> bool:
+        for indexed in [False, True]:
+            dealer = Dealer(0, indexed)
+            deals = {dealer.deal() for _ in range(10)}
+            # 10回配って1種類しかないことはまずない
+            if len(deals) == 1:
+                return False
+        return True
+
+    @subject.testcase("dealers do not share random state.")
+    def test_not_share() -> bool:
+        import random
+
+        expected = [Dealer(0).deal(), Dealer(1).deal()]
+        dealer0 = Dealer(0)
+        random.seed(2)
+        dealer1 = Dealer(1)
+        random.seed(3)
+        return [dealer0.deal(), dealer1.deal()] == expected
+
+
+with TestSubject("Dealer (counter based)") as subject:
+
+    @subject.testcase("deal at index does not depend on order.")
+    def test_deal_at_order() -> bool:
+        dealer = Dealer(0)
+        forward = [dealer.deal_at(index) for index in range(20)]
+        backward = [dealer.deal_at(index) for index in reversed(range(20))]
+        return forward == list(reversed(backward))
+
+    @subject.testcase("counter based dealer deals in sequence.")
+    def test_counter_based() -> bool:
+        dealer = Dealer(0, counter_based=True)
+        deals = [dealer.deal() for _ in range(20)]
+        if dealer.position != 20:
+            return False
+        return deals == [Dealer(0).deal_at(index) for index in range(20)]
+
+    @subject.testcase("seek to game index.")
+    def test_seek() -> bool:
+        dealer = Dealer(0, counter_based=True)
+        dealer.seek(100)
+        return dealer.deal() == Dealer(0).deal_at(100)
+
+    @subject.testcase("master seed reproduces deals.")
+    def test_master_seed() -> bool:
+        dealer = Dealer()
+        other_dealer = Dealer(dealer.master_seed)
+        return dealer.deal_at(7) == other_dealer.deal_at(7)
+
+
+with TestSubject("Dealer (enumeration)") as subject:
+
+    @subject.testcase("enumerate all deals.")
+    def test_enumerate_deals() -> bool:
+        deals = list(Dealer(0).enumerate_deals(2))
+        if len(deals) != 2 * Deal.COUNT:
+            return False
+        return [deal.index for deal in deals] == list(range(Deal.COUNT)) * 2
+
+    @subject.testcase("stratified deals.")
+    def test_stratified_deals() -> bool:
+        count = 2 * Deal.COUNT + 100
+        deals = list(Dealer(0).stratified_deals(count))
+        if len(deals) != count:
+            return False
+        counts = [0] * Deal.COUNT
+        for deal in deals:
+            counts[deal.index] += 1
+        # 各ディールは2回か3回で、3回のものがちょうど100個
+        if sorted(set(counts)) != [2, 3]:
+            return False
+        return counts.count(3) == 100
+
+    @subject.testcase("start from the middle.")
+    def test_deals_from_middle() -> bool:
+        count = 2 * Deal.COUNT + 100
+        for start in [0, 1, Deal.COUNT + 5, 2 * Deal.COUNT, 2 * Deal.COUNT + 40, count]:
+            enumerated = list(Dealer(0).enumerate_deals(2))[start:]
+            if list(Dealer(0).enumerate_deals(2, start)) != enumerated:
+                return False
+            stratified = list(Dealer(0).stratified_deals(count))[start:]
+            if list(Dealer(0).stratified_deals(count, start)) != stratified:
+                return False
+        return True
+
+
+with TestSubject("Trusted construction") as subject:
+
+    @subject.testcase("invalid number is always rejected.")
+    def test_invalid_number() -> bool:
+        # 範囲外の数字や、整数でない値（boolも含む）
+        numbers: list[Any] = [Card.MIN_NUMBER - 1, Card.MAX_NUMBER + 1, 1.5, True, "1"]
+        for number in numbers:
+            try:
+                Card(number)
+                return False
+            except ValueError:
+                pass
+        return True
+
+    def raises_value_error(function: Callable[[], object]) -> bool:
+        try:
+            function()
+            return False
+        except ValueError:
+            return True
+
+    @subject.testcase("invalid hand is always rejected.")
+    def test_invalid_hand() -> bool:
+        return all(
+            raises_value_error(lambda: Hand([Card(number) for number in numbers]))
+            for numbers in [[1, 2, 3], [1, 2, 3, 4, 5], [1, 2, 3, 3]]
+        )
+
+    @subject.testcase("non-card values are always rejected.")
+    def test_non_card_values() -> bool:
+        numbers: list[Any] = [1, 2, 3, 4]
+        player0_hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+        player1_hand = Hand([Card(number) for number in [5, 6, 7, 8]])
+        return all(
+            raises_value_error(function)
+            for function in [
+                lambda: Hand(numbers),
+                lambda: Deal(player0_hand, player1_hand, cast(Card, 9)),
+                lambda: Deal(player0_hand, cast(Hand, numbers[:4]), Card(9)),
+            ]
+        )
+
+    @subject.testcase("invalid mask is always rejected.")
+    def test_invalid_hand_mask() -> bool:
+        return all(
+            raises_value_error(lambda: Hand.from_mask(mask))
+            for mask in [0b000000111, 0b111100000 << 1, -1]
+        )
+
+    @subject.testcase("invalid deal is always rejected.")
+    def test_invalid_deal() -> bool:
+        player0_hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+        player1_hand = Hand([Card(number) for number in [4, 5, 6, 7]])
+        return raises_value_error(lambda: Deal(player0_hand, player1_hand, Card(9)))
+
+    @subject.testcase("invalid dealer arguments are always rejected.")
+    def test_invalid_dealer_arguments() -> bool:
+        dealer = Dealer(0)
+        return all(
+            raises_value_error(function)
+            for function in [
+                lambda: Deal.from_index(-1),
+                lambda: dealer.seek(-1),
+                lambda: dealer.deal_at(-1),
+                lambda: dealer.enumerate_deals(-1),
+                lambda: dealer.stratified_deals(-1),
+                lambda: dealer.enumerate_deals(1, -1),
+                lambda: dealer.stratified_deals(1, -1),
+            ]
+        )
+
+    @subject.testcase("checked even with -O.")
+    def test_optimized() -> bool:
+        code = (
+            "from card import Card, Hand\n"
+            "try:\n"
+            "    Hand([Card(1), Card(1), Card(2), Card(3)])\n"
+            "except ValueError:\n"
+            "    print('rejected')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-O", "-c", code], capture_output=True, text=True
+        )
+        return result.stdout == "rejected\n"
+
+    @subject.testcase("trusted hand equals checked hand.")
+    def test_trusted_hand() -> bool:
+        hand = Hand([Card(number) for number in [9, 1, 5, 3]])
+        trusted_hand = Hand.from_trusted_mask(hand.mask)
+        if trusted_hand != hand:
+            return False
+        return trusted_hand.cards == hand.cards
+
+    @subject.testcase("trusted deal equals checked deal.")
+    def test_trusted_deal() -> bool:
+        player0_hand = Hand([Card(number) for number in [1, 5, 7, 8]])
+        player1_hand = Hand([Card(number) for number in [2, 4, 6, 9]])
+        deal = Deal(player0_hand, player1_hand, Card(3))
+        trusted_deal = Deal.from_trusted(player0_hand, player1_hand, Card(3))
+        if trusted_deal != deal:
+            return False
+        return trusted_deal.player1_hand is player1_hand
@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+from checkpoint import Checkpoint
+from stats import DealTally
+from testtool import TestSubject
+
+with TestSubject("Checkpoint") as subject:
+    settings = {"repeat_count": 100, "random_state": 1, "alpha": None}
+
+    @subject.testcase("save and load.")
+    def test_save_load() -> bool:
+        tally = DealTally()
+        tally.add(3, True)
+        tally.add_pair(5, True, False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ckpt")
+            Checkpoint(settings, 40, tally, 123).save(path)
+            loaded = Checkpoint.load(path)
+        if (loaded.settings != settings) or (loaded.next_game != 40):
+            return False
+        if loaded.record_offset != 123:
+            return False
+        return loaded.tally.to_dict() == tally.to_dict()
+
+    @subject.testcase("overwrite without temporary files left.")
+    def test_overwrite() -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ckpt")
+            Checkpoint(settings, 10, DealTally()).save(path)
+            Checkpoint(settings, 20, DealTally()).save(path)
+            if os.listdir(directory) != ["run.ckpt"]:
+                return False
+            return Checkpoint.load(path).next_game == 20
+
+    @subject.testcase("keep old checkpoint when saving fails.")
+    def test_failed_save() -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ckpt")
+            Checkpoint(settings, 10, DealTally()).save(path)
+            # JSONにできない設定
+            try:
+                Checkpoint({"value": object()}, 20, DealTally()).save(path)
+                return False
+            except TypeError:
+                pass
+            if os.listdir(directory) != ["run.ckpt"]:
+                return False
+            return Checkpoint.load(path).next_game == 10
+
+    @subject.testcase("different settings are not allowed.")
+    def test_check_settings() -> bool:
+        checkpoint = Checkpoint(settings, 10, DealTally())
+        checkpoint.check_settings(dict(settings))
+        try:
+            checkpoint.check_settings({**settings, "random_state": 2})
+            return False
+        except ValueError:
+            return True
@@ -0,0 +1,304 @@
+import gc
+import threading
+import time
+
+from action import Action, ActionList, AskAction, GuessAction
+from card import Card, Deal, Hand
+from event import AskEvent, EventBus, GuessEvent
+from game import Game
+from player import Player, RandomAI
+from testtool import TestSubject
+
+
+class ScenarioPlayer(Player):
+    def __init__(self, name: str, actions: list[Action]) -> None:
+        self.__name = name
+        self.__actions = actions
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def select_action(self, available_actions: ActionList) -> Action:
+        return self.__actions.pop(0)
+
+
+class OrderRecorder:
+    def __init__(self, names: list[str], name: str) -> None:
+        self.__names = names
+        self.__name = name
+
+    def player_asked(self, player: Player, ask: AskAction, is_hit: bool) -> None:
+        self.__names.append(self.__name)
+
+    def player_guessed(self, player: Player, guess: GuessAction, is_hit: bool) -> None:
+        self.__names.append(self.__name)
+
+
+with TestSubject("EventBus") as subject:
+    player = RandomAI("player", 0)
+    ask_event = AskEvent(player, AskAction(Card(1)), True)
+    guess_event = GuessEvent(player, GuessAction(Card(2)), False)
+
+    @subject.testcase("deliver by priority, then by subscribed order.")
+    def test_order() -> bool:
+        bus = EventBus()
+        names: list[str] = []
+        bus.subscribe(AskEvent, lambda event: names.append("c"), priority=1)
+        bus.subscribe(AskEvent, lambda event: names.append("a"))
+        bus.subscribe(AskEvent, lambda event: names.append("b"))
+        bus.subscribe(AskEvent, lambda event: names.append("z"), priority=-1)
+        bus.publish(ask_event)
+        return names == ["z", "a", "b", "c"]
+
+    @subject.testcase("deliver only subscribed event type.")
+    def test_event_type() -> bool:
+        bus = EventBus()
+        events: list[AskEvent] = []
+        bus.subscribe(AskEvent, events.append)
+        bus.publish(guess_event)
+        bus.publish(ask_event)
+        if not bus.has_subscribers(AskEvent):
+            return False
+        if bus.has_subscribers(GuessEvent):
+            return False
+        return events == [ask_event]
+
+    @subject.testcase("unsubscribe.")
+    def test_unsubscribe() -> bool:
+        bus = EventBus()
+        events: list[AskEvent] = []
+        subscription = bus.subscribe(AskEvent, events.append)
+        bus.unsubscribe(subscription)
+        bus.publish(ask_event)
+        if bus.has_subscribers(AskEvent) or (bus.get_subscriber_count(AskEvent) != 0):
+            return False
+        try:
+            bus.unsubscribe(subscription)
+        except ValueError:
+            return events == []
+        return False
+
+    @subject.testcase("batch delivery on flush.")
+    def test_batch() -> bool:
+        bus = EventBus()
+        batches: list[list[AskEvent]] = []
+        bus.subscribe_batch(AskEvent, batches.append)
+        bus.publish(ask_event)
+        bus.publish(ask_event)
+        if batches != []:
+            return False
+        bus.flush()
+        bus.flush()
+        return batches == [[ask_event, ask_event]]
+
+    @subject.testcase("asynchronous delivery on background thread.")
+    def test_async() -> bool:
+        bus = EventBus()
+        events: list[AskEvent] = []
+        threads: set[threading.Thread] = set()
+
+        def handler(event: AskEvent) -> None:
+            time.sleep(0.01)
+            threads.add(threading.current_thread())
+            events.append(event)
+
+        bus.subscribe_async(AskEvent, handler)
+        for _ in range(5):
+            bus.publish(ask_event)
+        bus.flush()
+        if threading.current_thread() in threads:
+            return False
+        return events == [ask_event] * 5
+
+    @subject.testcase("wait for space in bounded queue.")
+    def test_backpressure() -> bool:
+        bus = EventBus(max_queue_size=1)
+        handled: list[int] = []
+        published: list[int] = []
+
+        def handler(event: AskEvent) -> None:
+            time.sleep(0.02)
+            handled.append(len(handled))
+
+        bus.subscribe_async(AskEvent, handler)
+        for _ in range(4):
+            bus.publish(ask_event)
+            published.append(len(handled))
+        bus.flush()
+        # キューに1つ、処理中に1つしか溜められないので、発行は処理に追いつかない
+        return (published[-1] >= 1) and (len(handled) == 4)
+
+    @subject.testcase("report backlog and pending asynchronous work.")
+    def test_backlog() -> bool:
+        bus = EventBus(max_queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def handler(event: AskEvent) -> None:
+            started.set()
+            release.wait()
+
+        bus.subscribe_async(AskEvent, handler)
+        if bus.has_async_work or bus.is_backlogged:
+            return False
+        bus.publish(ask_event)
+        started.wait()
+        # 1つは処理中、1つはキューに溜まっている
+        bus.publish(ask_event)
+        backlogged = bus.is_backlogged and bus.has_async_work
+        release.set()
+        bus.flush()
+        return backlogged and not (bus.has_async_work or bus.is_backlogged)
+
+    @subject.testcase("report asynchronous subscribers.")
+    def test_async_subscribers() -> bool:
+        bus = EventBus()
+        bus.subscribe(AskEvent, lambda event: None)
+        if bus.has_async_subscribers:
+            return False
+        subscription = bus.subscribe_async(AskEvent, lambda event: None)
+        if not bus.has_async_subscribers:
+            return False
+        bus.unsubscribe(subscription)
+        return not bus.has_async_subscribers
+
+    @subject.testcase("raise asynchronous error on flush.")
+    def test_async_error() -> bool:
+        bus = EventBus()
+
+        def handler(event: AskEvent) -> None:
+            raise RuntimeError("error in handler.")
+
+        bus.subscribe_async(AskEvent, handler)
+        bus.publish(ask_event)
+        try:
+            bus.flush()
+        except RuntimeError:
+            bus.flush()
+            return True
+        return False
+
+
+with TestSubject("Game with EventBus") as subject:
+    player0_hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+    player1_hand = Hand([Card(number) for number in [5, 6, 7, 8]])
+    deal = Deal(player0_hand, player1_hand, Card(9))
+
+    def create_players() -> tuple[Player, Player]:
+        player0 = ScenarioPlayer("player0", [AskAction(Card(5))])
+        player1 = ScenarioPlayer("player1", [GuessAction(Card(9))])
+        return player0, player1
+
+    @subject.testcase("notify observers by priority, then by added order.")
+    def test_observer_order() -> bool:
+        game = Game(deal, *create_players())
+        names: list[str] = []
+        game.add_observer(OrderRecorder(names, "b"), priority=1)
+        game.add_observer(OrderRecorder(names, "a"))
+        game.add_observer(OrderRecorder(names, "c"), priority=1)
+        game.start()
+        return names == ["a", "b", "c"] * 2
+
+    @subject.testcase("add same observer only once.")
+    def test_add_twice() -> bool:
+        game = Game(deal, *create_players())
+        names: list[str] = []
+        recorder = OrderRecorder(names, "a")
+        game.add_observer(recorder)
+        game.add_observer(recorder)
+        game.start()
+        return names == ["a", "a"]
+
+    @subject.testcase("flush batch subscribers on game end.")
+    def test_flush_on_end() -> bool:
+        player0, player1 = create_players()
+        game = Game(deal, player0, player1)
+        batches: list[list[GuessEvent]] = []
+        game.event_bus.subscribe_batch(GuessEvent, batches.append)
+        game.start()
+        return batches == [[GuessEvent(player1, GuessAction(Card(9)), True)]]
+
+    @subject.testcase("finish asynchronous observer before game end.")
+    def test_async_observer() -> bool:
+        game = Game(deal, *create_players())
+        names: list[str] = []
+        game.add_observer(OrderRecorder(names, "a"), asynchronous=True)
+        game.start()
+        return names == ["a", "a"]
+
+    @subject.testcase("remove dead weak observer.")
+    def test_weak_observer() -> bool:
+        game = Game(deal, *create_players())
+        names: list[str] = []
+        recorder = OrderRecorder(names, "a")
+        game.add_observer(recorder, weak=True)
+        game.add_observer(OrderRecorder(names, "b"))
+        if game.observer_count != 2:
+            return False
+        del recorder
+        gc.collect()
+        if (game.observer_count != 1) or (
+            game.event_bus.get_subscriber_count(AskEvent) != 1
+        ):
+            return False
+        game.start()
+        return names == ["b", "b"]
+
+    @subject.testcase("notify and remove live weak observer.")
+    def test_live_weak_observer() -> bool:
+        game = Game(deal, *create_players())
+        names: list[str] = []
+        recorder = OrderRecorder(names, "a")
+        game.add_observer(recorder, weak=True)
+        game.start()
+        game.remove_observer(recorder)
+        del recorder
+        gc.collect()
+        return (names == ["a", "a"]) and (game.observer_count == 0)
+
+    @subject.testcase("share event bus between games.")
+    def test_shared_bus() -> bool:
+        bus = EventBus()
+        events: list[AskEvent] = []
+        bus.subscribe(AskEvent, events.append)
+        for _ in range(3):
+            Game(deal, *create_players(), event_bus=bus).start()
+        return len(events) == 3
+
+    @subject.testcase("share event bus with asynchronous subscriber between threads.")
+    def test_shared_async_bus() -> bool:
+        bus = EventBus(max_queue_size=4)
+        published: list[AskEvent] = []
+        handled: list[AskEvent] = []
+
+        def handler(event: AskEvent) -> None:
+            time.sleep(0.0001)
+            handled.append(event)
+
+        bus.subscribe(AskEvent, published.append)
+        bus.subscribe_async(AskEvent, handler)
+        barrier = threading.Barrier(8)
+        failures: list[str] = []
+
+        def play() -> None:
+            barrier.wait()
+            for _ in range(20):
+                players = create_players()
+                try:
+                    Game(deal, *players, event_bus=bus).start()
+                except BaseException as error:
+                    failures.append(repr(error))
+                    return
+                # ゲームが終わった時点で、そのゲームのイベントは処理し終えている
+                mine = [event for event in published if event.player in players]
+                if [event for event in handled if event.player in players] != mine:
+                    failures.append("not handled")
+
+        threads = [threading.Thread(target=play) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        bus.flush()
+        return (not failures) and (len(handled) == len(published) == 8 * 20)
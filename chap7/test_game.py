@@ -0,0 +1 @@
+../chap6/test_game.py
\ No newline at end of file
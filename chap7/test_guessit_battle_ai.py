@@ -0,0 +1,247 @@
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from card import Deal
+from checkpoint import Checkpoint
+from guessit_battle_ai import (
+    create_shards,
+    iterate_shard_results,
+    main,
+    play_shard,
+    run_shard,
+)
+from report import GameRecorder
+from stats import DealTally
+from testtool import TestSubject
+
+
+def is_same_tally(tally0: DealTally, tally1: DealTally) -> bool:
+    return all(
+        (tally0.get_game_count(i) == tally1.get_game_count(i))
+        and (tally0.get_player0_win_count(i) == tally1.get_player0_win_count(i))
+        for i in range(Deal.COUNT)
+    )
+
+
+def run_battle(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "guessit_battle_ai.py", *args],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+with TestSubject("shards") as subject:
+
+    @subject.testcase("cover all games without overlap.")
+    def test_create_shards() -> bool:
+        shards = create_shards("random", "smart", 0, "random", 10, 4)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        return ranges == [(0, 2), (2, 5), (5, 7), (7, 10)]
+
+    @subject.testcase("no empty shard.")
+    def test_small_shards() -> bool:
+        shards = create_shards("random", "smart", 0, "random", 3, 8)
+        return [shard.stop - shard.start for shard in shards] == [1, 1, 1]
+
+    @subject.testcase("keep pairs in the same shard.")
+    def test_paired_shards() -> bool:
+        shards = create_shards("random", "smart", 0, "random", 10, 4, True)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        return ranges == [(0, 2), (2, 4), (4, 6), (6, 10)]
+
+    @subject.testcase("shards from the middle.")
+    def test_shards_from_start() -> bool:
+        shards = create_shards("random", "smart", 0, "random", 10, 2, True, 4)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        return ranges == [(4, 6), (6, 10)]
+
+    @subject.testcase("shard bounds counted from game 0.")
+    def test_sized_shards() -> bool:
+        shards = create_shards("random", "smart", 0, "random", 10, 1, False, 0, 4)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        if ranges != [(0, 4), (4, 8), (8, 10)]:
+            return False
+        shards = create_shards("random", "smart", 0, "random", 10, 1, False, 5, 4)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        if ranges != [(5, 8), (8, 10)]:
+            return False
+        shards = create_shards("random", "smart", 0, "random", 12, 1, True, 2, 3)
+        ranges = [(shard.start, shard.stop) for shard in shards]
+        return ranges == [(2, 6), (6, 8), (8, 12)]
+
+    @subject.testcase("same result for any shard count.")
+    def test_same_result() -> bool:
+        for deal_mode in ["random", "stratified"]:
+            (whole,) = create_shards("smart", "random", 1, deal_mode, 700, 1)
+            expected = play_shard(whole)
+            for shard_count in [3, 7]:
+                tally = DealTally()
+                for shard in create_shards(
+                    "smart", "random", 1, deal_mode, 700, shard_count
+                ):
+                    tally.merge(play_shard(shard))
+                if not is_same_tally(tally, expected):
+                    return False
+        return True
+
+    @subject.testcase("same result with process pool.")
+    def test_process_pool() -> bool:
+        (whole,) = create_shards("smart", "smart", 2, "random", 400, 1)
+        expected = play_shard(whole)
+        shards = create_shards("smart", "smart", 2, "random", 400, 4)
+        tally = DealTally()
+        with ProcessPoolExecutor(2) as executor:
+            for shard_tally in executor.map(play_shard, shards):
+                tally.merge(shard_tally)
+        return is_same_tally(tally, expected)
+
+    @subject.testcase("results in shard order.")
+    def test_iterate_shard_results() -> bool:
+        shards = create_shards("smart", "random", 3, "random", 300, 6)
+        expected = [play_shard(shard) for shard in shards]
+        results = list(iterate_shard_results(shards, 2))
+        if [shard for shard, _, _ in results] != shards:
+            return False
+        return all(
+            is_same_tally(tally, expected_tally)
+            for (_, tally, _), expected_tally in zip(results, expected)
+        )
+
+    @subject.testcase("same player types cancel out when paired.")
+    def test_paired_same_players() -> bool:
+        (whole,) = create_shards("smart", "smart", 4, "random", 400, 1, True)
+        tally = play_shard(whole)
+        rate, error = tally.get_paired_estimate()
+        return (tally.pair_count == 200) and (rate == 0.5) and (error == 0.0)
+
+    @subject.testcase("same paired result for any shard count.")
+    def test_paired_same_result() -> bool:
+        (whole,) = create_shards("random", "smart", 5, "random", 400, 1, True)
+        expected = play_shard(whole)
+        tally = DealTally()
+        for shard in create_shards("random", "smart", 5, "random", 400, 3, True):
+            tally.merge(play_shard(shard))
+        if not is_same_tally(tally, expected):
+            return False
+        return all(
+            tally.get_pair_count(x, y) == expected.get_pair_count(x, y)
+            for x in [False, True]
+            for y in [False, True]
+        )
+
+    @subject.testcase("same result when resumed from the middle.")
+    def test_resume() -> bool:
+        (whole,) = create_shards("smart", "random", 6, "stratified", 500, 1)
+        expected = play_shard(whole)
+        first = create_shards("smart", "random", 6, "stratified", 500, 3)[0]
+        tally = DealTally.from_dict(play_shard(first).to_dict())
+        for shard in create_shards(
+            "smart", "random", 6, "stratified", 500, 2, False, first.stop
+        ):
+            tally.merge(play_shard(shard))
+        return is_same_tally(tally, expected)
+
+    @subject.testcase("no shards left after the last game.")
+    def test_no_shards_left() -> bool:
+        if create_shards("random", "smart", 0, "random", 10, 4, False, 10) != []:
+            return False
+        return create_shards("random", "smart", 0, "random", 10, 1, True, 10, 4) == []
+
+
+with TestSubject("report") as subject:
+
+    @subject.testcase("no variance reduction when paired variance is zero.")
+    def test_zero_paired_variance() -> bool:
+        args = ["200", "smart", "smart", "--seed", "1", "--paired"]
+        result = run_battle(*args, "--output", "summary")
+        if result.returncode != 0:
+            return False
+        lines = result.stdout.splitlines()
+        return "Variance removed by pairing: n/a (no paired variance)" in lines
+
+
+with TestSubject("sequential test") as subject:
+
+    @subject.testcase("same players stay undecided.")
+    def test_same_players_undecided() -> bool:
+        for player_type in ["random", "smart"]:
+            args = ["4000", player_type, player_type, "--seed", "1", "--alpha", "0.05"]
+            result = run_battle(*args, "--paired", "--output", "summary")
+            if result.returncode != 0:
+                return False
+            if "undecided after 4000 games" not in result.stdout.splitlines()[-1]:
+                return False
+        return True
+
+    @subject.testcase("unpaired games are not allowed.")
+    def test_unpaired_sequential_test() -> bool:
+        try:
+            main(100, "random", "random", 1, alpha=0.05, output_mode="summary")
+            return False
+        except ValueError:
+            pass
+        result = run_battle("100", "random", "random", "--alpha", "0.05")
+        return (result.returncode != 0) and ("requires --paired" in result.stderr)
+
+
+with TestSubject("resume") as subject:
+    args = ["300", "smart", "random", "--seed", "8", "--output", "summary"]
+
+    @subject.testcase("resume a finished battle.")
+    def test_resume_finished() -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ckpt")
+            first = run_battle(*args, "--checkpoint", path)
+            resumed = run_battle(*args, "--checkpoint", path, "--resume")
+        if (first.returncode != 0) or (resumed.returncode != 0):
+            return False
+        return resumed.stdout == first.stdout
+
+    @subject.testcase("different settings are not allowed.")
+    def test_resume_different_settings() -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ckpt")
+            run_battle(*args, "--checkpoint", path)
+            resumed = run_battle(
+                *args, "--checkpoint", path, "--resume", "--deals", "stratified"
+            )
+        return (resumed.returncode != 0) and ("Settings differ" in resumed.stderr)
+
+    @subject.testcase("discard records written after the checkpoint.")
+    def test_resume_record() -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            whole_path = os.path.join(directory, "whole.csv")
+            whole = run_battle(*args, "--record", whole_path)
+            # 最初のシャードまでで止まり、その後の記録も書きかけていたとする
+            first = create_shards("smart", "random", 8, "random", 300, 3)[0]
+            tally, records = run_shard(first, True)
+            record_path = os.path.join(directory, "resumed.csv")
+            with open(record_path, "w") as record_file:
+                record_file.write(GameRecorder.HEADER + records)
+                record_offset = record_file.tell()
+                record_file.write("100,0,0\n101,1,")
+            settings = {
+                "repeat_count": 300,
+                "player0_type": "smart",
+                "player1_type": "random",
+                "random_state": 8,
+                "deal_mode": "random",
+                "alpha": None,
+                "check_interval": 100,
+                "paired": False,
+            }
+            path = os.path.join(directory, "run.ckpt")
+            Checkpoint(settings, first.stop, tally, record_offset).save(path)
+            resumed = run_battle(
+                *args, "--record", record_path, "--checkpoint", path, "--resume"
+            )
+            with open(whole_path) as whole_file, open(record_path) as record_file:
+                is_same_record = whole_file.read() == record_file.read()
+        if resumed.returncode != 0:
+            return False
+        return is_same_record and (resumed.stdout == whole.stdout)
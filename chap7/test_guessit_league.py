@@ -0,0 +1,91 @@
+from guessit_battle_ai import run_shard
+from guessit_league import (
+    allocate_round,
+    create_matchups,
+    create_racing_matchups,
+    parse_roster,
+)
+from testtool import TestSubject
+
+with TestSubject("league") as subject:
+
+    @subject.testcase("parse roster.")
+    def test_parse_roster() -> bool:
+        names, player_types = parse_roster(["smart", "r=random", "smart"])
+        return (names == ["smart", "r", "smart2"]) and (
+            player_types == ["smart", "random", "smart"]
+        )
+
+    @subject.testcase("unknown type and duplicated name are not allowed.")
+    def test_invalid_roster() -> bool:
+        for entries in [["random", "strong"], ["a=random", "a=smart"]]:
+            try:
+                parse_roster(entries)
+                return False
+            except ValueError:
+                pass
+        return True
+
+    @subject.testcase("both seatings of every pair.")
+    def test_matchups() -> bool:
+        matchups = create_matchups(
+            ["random", "smart", "smart"], "abc", 0, "random", 10, 2
+        )
+        pairs = [(matchup.player0, matchup.player1) for matchup in matchups]
+        if sorted(pairs) != [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)]:
+            return False
+        return all(len(matchup.shards) == 2 for matchup in matchups)
+
+    @subject.testcase("same seeds when roster grows.")
+    def test_stable_seeds() -> bool:
+        small = create_matchups(["random", "smart"], "ab", 0, "random", 10, 1)
+        large = create_matchups(["random", "smart", "smart"], "abc", 0, "random", 10, 1)
+        small_seeds = {(m.player0, m.player1): m.shards[0].random_state for m in small}
+        large_seeds = {(m.player0, m.player1): m.shards[0].random_state for m in large}
+        return all(large_seeds[pair] == seed for pair, seed in small_seeds.items())
+
+
+with TestSubject("adaptive league") as subject:
+
+    @subject.testcase("one paired matchup for every pair.")
+    def test_racing_matchups() -> bool:
+        matchups = create_racing_matchups(
+            ["random", "smart", "smart"], "abc", 0, "random", 1000, 200, 0.05
+        )
+        pairs = [(matchup.player0, matchup.player1) for matchup in matchups]
+        if pairs != [(0, 1), (0, 2), (1, 2)]:
+            return False
+        return all(
+            (len(matchup.shards) == 5) and matchup.next_shard.paired
+            for matchup in matchups
+        )
+
+    @subject.testcase("allocate within budget, fewest games first.")
+    def test_allocate_round() -> bool:
+        matchups = create_racing_matchups(
+            ["random", "smart", "smart"], "abc", 0, "random", 1000, 200, 0.05
+        )
+        first = allocate_round(matchups, 1000)
+        if first != matchups:
+            return False
+        tally, _ = run_shard(matchups[0].next_shard)
+        matchups[0].add_shard_tally(tally)
+        return allocate_round(matchups, 400) == matchups[1:]
+
+    @subject.testcase("stop allocating to settled pairs.")
+    def test_settled() -> bool:
+        matchups = create_racing_matchups(
+            ["random", "smart", "random"], "abc", 1, "random", 20000, 200, 0.05
+        )
+        budget = 20000
+        allocated = allocate_round(matchups, budget)
+        while allocated:
+            for matchup in allocated:
+                tally, _ = run_shard(matchup.next_shard)
+                matchup.add_shard_tally(tally)
+                budget -= tally.game_count
+            allocated = allocate_round(matchups, budget)
+        # random同士は鏡写し、randomとsmartは勝ち負けが決まる
+        if not matchups[1].is_mirrored:
+            return False
+        return all(matchup.is_settled for matchup in matchups) and (budget > 0)
@@ -0,0 +1,52 @@
+from card import Dealer, Hand
+from game import Game
+from headless import HeadlessGame
+from player import Player, RandomAI
+from smartai import SmartAI
+from testtool import TestSubject
+
+
+def create_player(player_type: str, name: str, hand: Hand, seed: int) -> Player:
+    if player_type == "smart":
+        return SmartAI(name, hand, seed)
+    return RandomAI(name, seed)
+
+
+with TestSubject("HeadlessGame") as subject:
+    dealer = Dealer(0)
+    deals = [dealer.deal_at(i) for i in range(500)]
+
+    @subject.testcase("same winners as Game.")
+    def test_same_winners() -> bool:
+        for player0_type, player1_type in [
+            ("random", "random"),
+            ("smart", "random"),
+            ("random", "smart"),
+            ("smart", "smart"),
+        ]:
+            for i, deal in enumerate(deals):
+                players = [
+                    create_player(player0_type, "Player0", deal.player0_hand, i),
+                    create_player(player1_type, "Player1", deal.player1_hand, i + 1),
+                ]
+                game = Game(deal, players[0], players[1])
+                for player in players:
+                    if isinstance(player, SmartAI):
+                        game.add_observer(player)
+                game_winner = players.index(game.start())
+
+                players = [
+                    create_player(player0_type, "Player0", deal.player0_hand, i),
+                    create_player(player1_type, "Player1", deal.player1_hand, i + 1),
+                ]
+                observers = [p for p in players if isinstance(p, SmartAI)]
+                headless = HeadlessGame(players[0], players[1], observers)
+                if headless.play(deal) != game_winner:
+                    return False
+        return True
+
+    @subject.testcase("play all deals.")
+    def test_play_all() -> bool:
+        headless = HeadlessGame(RandomAI("Player0", 0), RandomAI("Player1", 1))
+        win_counts = headless.play_all(deals)
+        return sum(win_counts) == len(deals)
@@ -0,0 +1,82 @@
+from action import Action, ActionList
+from card import Deal, Dealer
+from game import Game
+from player import Player, RandomAI
+from pool import GamePool
+from smartai import SmartAI
+from testtool import TestSubject
+
+
+class FixedPlayer(Player):
+    # reset()を持たないプレイヤー
+    def __init__(self, name: str) -> None:
+        self.__name = name
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def select_action(self, available_actions: ActionList) -> Action:
+        return available_actions.all_actions[0]
+
+
+def create_game(deal: Deal) -> Game:
+    player0 = SmartAI("Player0", deal.player0_hand)
+    player1 = RandomAI("Player1")
+    game = Game(deal, player0, player1)
+    game.add_observer(player0)
+    return game
+
+
+with TestSubject("Game.reset") as subject:
+    dealer = Dealer(0, counter_based=True)
+
+    @subject.testcase("same result as new players.")
+    def test_same_as_new() -> bool:
+        game = create_game(dealer.deal_at(0))
+        for i in range(200):
+            deal = dealer.deal_at(i)
+            game.reset(deal, (i, i + 1000))
+            reset_won = game.start() is game.player0
+
+            player0 = SmartAI("Player0", deal.player0_hand, i)
+            player1 = RandomAI("Player1", i + 1000)
+            new_game = Game(deal, player0, player1)
+            new_game.add_observer(player0)
+            new_won = new_game.start() is player0
+            if reset_won != new_won:
+                return False
+        return True
+
+    @subject.testcase("players that cannot be reset are rejected.")
+    def test_not_resettable() -> bool:
+        game = Game(dealer.deal_at(0), FixedPlayer("Player0"), RandomAI("Player1"))
+        try:
+            game.reset(dealer.deal_at(1))
+            return False
+        except TypeError:
+            return True
+
+
+with TestSubject("GamePool") as subject:
+    dealer = Dealer(0, counter_based=True)
+
+    @subject.testcase("reuse released game.")
+    def test_reuse() -> bool:
+        pool = GamePool(create_game)
+        game0 = pool.acquire(dealer.deal_at(0))
+        game0.start()
+        pool.release(game0)
+        game1 = pool.acquire(dealer.deal_at(1))
+        return (game1 is game0) and (pool.created_count == 1)
+
+    @subject.testcase("create game when no free game.")
+    def test_create() -> bool:
+        pool = GamePool(create_game)
+        game0 = pool.acquire(dealer.deal_at(0))
+        game1 = pool.acquire(dealer.deal_at(1))
+        if (game0 is game1) or (pool.created_count != 2):
+            return False
+        pool.release(game0)
+        pool.release(game1)
+        return pool.free_count == 2
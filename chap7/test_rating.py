@@ -0,0 +1,72 @@
+import math
+import random
+
+from rating import BradleyTerryRatings, invert, solve
+from testtool import TestSubject
+
+with TestSubject("BradleyTerryRatings") as subject:
+
+    @subject.testcase("even results give same ratings.")
+    def test_even() -> bool:
+        ratings = BradleyTerryRatings(["a", "b", "c"])
+        ratings.add_results(0, 1, 50, 50)
+        ratings.add_results(1, 2, 50, 50)
+        return all(abs(ratings.get_rating(i)) < 1e-6 for i in range(3))
+
+    @subject.testcase("recover strengths.")
+    def test_recover() -> bool:
+        rng = random.Random(0)
+        thetas = [0.0, 0.5, 1.0]
+        ratings = BradleyTerryRatings(["a", "b", "c"])
+        for i in range(3):
+            for j in range(i + 1, 3):
+                p = 1 / (1 + math.exp(thetas[j] - thetas[i]))
+                i_win_count = sum(rng.random() < p for _ in range(4000))
+                ratings.add_results(i, j, i_win_count, 4000 - i_win_count)
+        for i in range(3):
+            expected = (thetas[i] - 0.5) * 400 / math.log(10)
+            low, high = ratings.get_confidence_interval(i, 3.0)
+            if not (low <= expected <= high):
+                return False
+        return abs(ratings.get_expected_score(2, 0) - 1 / (1 + math.exp(-1))) < 0.02
+
+    @subject.testcase("no rating until connected.")
+    def test_not_connected() -> bool:
+        ratings = BradleyTerryRatings(["a", "b", "c"])
+        ratings.add_results(0, 1, 100, 0)
+        if ratings.get_rating(0) != 0:
+            return False
+        ratings.add_results(1, 2, 10, 10)
+        return ratings.get_rating(0) > ratings.get_rating(1)
+
+    @subject.testcase("finite rating for all wins.")
+    def test_all_wins() -> bool:
+        ratings = BradleyTerryRatings(["a", "b"])
+        ratings.add_results(0, 1, 100, 0)
+        rating = ratings.get_rating(0)
+        return math.isfinite(rating) and (rating > 0)
+
+    @subject.testcase("need two players.")
+    def test_one_player() -> bool:
+        try:
+            BradleyTerryRatings(["a"])
+        except ValueError:
+            return True
+        return False
+
+
+with TestSubject("linear algebra") as subject:
+
+    @subject.testcase("solve and invert.")
+    def test_solve() -> bool:
+        matrix = [[0.0, 2.0], [4.0, 1.0]]
+        x = solve(matrix, [2.0, 6.0])
+        inverse = invert(matrix)
+        if not all(math.isclose(a, b) for a, b in zip(x, [1.25, 1.0])):
+            return False
+        expected = [[-0.125, 0.25], [0.5, 0.0]]
+        return all(
+            math.isclose(inverse[i][j], expected[i][j], abs_tol=1e-12)
+            for i in range(2)
+            for j in range(2)
+        )
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from report import GameLogger, GameRecorder, ProgressReporter
+from terminal import Terminal
+from testtool import TestSubject
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+with TestSubject("ProgressReporter") as subject:
+
+    @subject.testcase("report at fixed interval.")
+    def test_interval() -> bool:
+        out_stream = StringIO()
+        clock = FakeClock()
+        reporter = ProgressReporter(Terminal(out_stream=out_stream), 100, 1.0, clock)
+        for i in range(50):
+            clock.now = i * 0.1
+            reporter.game_finished(i, 0, i % 2 == 0)
+        lines = out_stream.getvalue().splitlines()
+        # 1.0秒, 2.0秒, 3.0秒, 4.0秒の4回
+        if len(lines) != 4:
+            return False
+        return lines[0].startswith("[11/100] 11 games/sec, ETA 00:00:08,")
+
+    @subject.testcase("report running win rates on finish.")
+    def test_finish() -> bool:
+        out_stream = StringIO()
+        clock = FakeClock()
+        reporter = ProgressReporter(Terminal(out_stream=out_stream), 4, 1.0, clock)
+        reporter.update(3, 1)
+        clock.now = 0.5
+        reporter.update(4, 3)
+        reporter.finish()
+        return out_stream.getvalue() == (
+            "[4/4] 8 games/sec, ETA 00:00:00, Player0  75.00%, Player1  25.00%\n"
+        )
+
+    @subject.testcase("skipped games do not count for speed.")
+    def test_skip() -> bool:
+        out_stream = StringIO()
+        clock = FakeClock()
+        reporter = ProgressReporter(Terminal(out_stream=out_stream), 100, 1.0, clock)
+        reporter.skip(80, 40)
+        clock.now = 2.0
+        reporter.update(90, 45)
+        return out_stream.getvalue() == (
+            "[90/100] 5 games/sec, ETA 00:00:02, Player0  50.00%, Player1  50.00%\n"
+        )
+
+
+with TestSubject("GameLogger and GameRecorder") as subject:
+
+    @subject.testcase("log each game.")
+    def test_logger() -> bool:
+        out_stream = StringIO()
+        logger = GameLogger(Terminal(out_stream=out_stream), 10)
+        logger.game_finished(0, 5, True)
+        logger.game_finished(1, 7, False)
+        return out_stream.getvalue() == "[0/10] Player0 won.\n[1/10] Player1 won.\n"
+
+    @subject.testcase("record each game as csv.")
+    def test_recorder() -> bool:
+        out_stream = StringIO()
+        recorder = GameRecorder(out_stream)
+        recorder.game_finished(0, 5, True)
+        recorder.game_finished(1, 7, False)
+        return out_stream.getvalue() == "0,5,0\n1,7,1\n"
@@ -0,0 +1,22 @@
+from seed import derive_seed
+from testtool import TestSubject
+
+with TestSubject("derive_seed") as subject:
+
+    @subject.testcase("same keys give same seed.")
+    def test_same_keys() -> bool:
+        return derive_seed(0, "game", 1) == derive_seed(0, "game", 1)
+
+    @subject.testcase("different keys give different seeds.")
+    def test_different_keys() -> bool:
+        seeds = {
+            derive_seed(0, "game", 1),
+            derive_seed(0, "game", 2),
+            derive_seed(1, "game", 1),
+            derive_seed(0, "dealer"),
+        }
+        return len(seeds) == 4
+
+    @subject.testcase("no seed gives no seed.")
+    def test_no_seed() -> bool:
+        return derive_seed(None, "game", 1) is None
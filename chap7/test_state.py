@@ -0,0 +1,72 @@
+from action import AskAction, GuessAction
+from card import Card, Deal, Hand
+from state import GameState
+from testtool import TestSubject
+
+with TestSubject("GameState") as subject:
+    player0_hand = Hand([Card(number) for number in [1, 2, 3, 4]])
+    player1_hand = Hand([Card(number) for number in [5, 6, 7, 8]])
+    deal = Deal(player0_hand, player1_hand, Card(9))
+
+    @subject.testcase("initial state.")
+    def test_initial_state() -> bool:
+        state = GameState(deal)
+        if (state.turn != 0) or (state.prev_action is not None):
+            return False
+        if state.is_finished or (state.winner is not None):
+            return False
+        return state.available_actions.guess_actions == ()
+
+    @subject.testcase("apply ask.")
+    def test_apply_ask() -> bool:
+        state = GameState(deal)
+        if not state.apply(AskAction(Card(5))):
+            return False
+        if (state.turn != 1) or (state.prev_action is not AskAction(Card(5))):
+            return False
+        return GuessAction(Card(9)) in state.available_actions
+
+    @subject.testcase("apply guess.")
+    def test_apply_guess() -> bool:
+        state = GameState(deal)
+        state.apply(AskAction(Card(1)))
+        if not state.apply(GuessAction(Card(9))):
+            return False
+        return state.is_finished and (state.winner == 1)
+
+    @subject.testcase("unavailable action is not allowed.")
+    def test_unavailable_action() -> bool:
+        state = GameState(deal)
+        try:
+            state.apply(GuessAction(Card(9)))
+            return False
+        except AssertionError:
+            return True
+
+    @subject.testcase("undo actions.")
+    def test_undo() -> bool:
+        state = GameState(deal)
+        initial_key = state.key
+        state.apply(AskAction(Card(1)))
+        after_ask_key = state.key
+        state.apply(GuessAction(Card(1)))
+        state.undo()
+        if state.key != after_ask_key:
+            return False
+        state.undo()
+        return state.key == initial_key
+
+    @subject.testcase("clone is independent.")
+    def test_clone() -> bool:
+        state = GameState(deal)
+        state.apply(AskAction(Card(1)))
+        cloned = state.clone()
+        if (cloned != state) or (hash(cloned) != hash(state)):
+            return False
+        cloned.apply(GuessAction(Card(9)))
+        if state.is_finished or (cloned == state):
+            return False
+        # 複製前の履歴も取り消せる
+        cloned.undo()
+        cloned.undo()
+        return cloned == GameState(deal)
@@ -0,0 +1,137 @@
+import math
+import random
+
+from card import Deal
+from stats import DealTally, WinRateConfidenceSequence
+from testtool import TestSubject
+
+with TestSubject("DealTally") as subject:
+
+    @subject.testcase("count games and wins.")
+    def test_counts() -> bool:
+        tally = DealTally()
+        tally.add(0, True)
+        tally.add(0, False)
+        tally.add(1, True)
+        if (tally.game_count != 3) or (tally.player0_win_count != 2):
+            return False
+        if (tally.get_game_count(0) != 2) or (tally.get_player0_win_count(0) != 1):
+            return False
+        return tally.get_stratum_variance(0) == 0.5
+
+    @subject.testcase("simple estimate.")
+    def test_simple_estimate() -> bool:
+        tally = DealTally()
+        for i in range(100):
+            tally.add(i % Deal.COUNT, i < 25)
+        rate, error = tally.get_simple_estimate()
+        return (rate == 0.25) and math.isclose(error, math.sqrt(0.25 * 0.75 / 100))
+
+    @subject.testcase("stratified estimate needs two games for each deal.")
+    def test_stratified_not_available() -> bool:
+        tally = DealTally()
+        for deal_index in range(Deal.COUNT):
+            tally.add(deal_index, True)
+        rate, _ = tally.get_stratified_estimate()
+        return math.isnan(rate)
+
+    @subject.testcase("stratified estimate removes variance between deals.")
+    def test_stratified_estimate() -> bool:
+        # 前半のディールは必ず先手が勝ち、後半は必ず負ける
+        tally = DealTally()
+        for _ in range(2):
+            for deal_index in range(Deal.COUNT):
+                tally.add(deal_index, deal_index < Deal.COUNT // 2)
+        rate, error = tally.get_stratified_estimate()
+        _, simple_error = tally.get_simple_estimate()
+        return math.isclose(rate, 0.5) and (error == 0.0) and (simple_error > 0.0)
+
+    @subject.testcase("merge tallies.")
+    def test_merge() -> bool:
+        tally0 = DealTally()
+        tally0.add(0, True)
+        tally0.add(1, False)
+        tally1 = DealTally()
+        tally1.add(0, False)
+        tally0.merge(tally1)
+        if (tally0.game_count != 3) or (tally0.player0_win_count != 1):
+            return False
+        return (tally0.get_game_count(0) == 2) and (tally1.game_count == 1)
+
+
+with TestSubject("WinRateConfidenceSequence") as subject:
+
+    def run_sequence(alpha: float, p: float, max_count: int, seed: int) -> int:
+        # 勝率pの先手で、決まるまで（最大max_countゲーム）続けて決定を返す
+        # 決まらなかった場合は-1
+        rng = random.Random(seed)
+        sequence = WinRateConfidenceSequence(alpha, 1000)
+        win_count = 0
+        for game_count in range(1, max_count + 1):
+            win_count += rng.random() < p
+            sequence.update(game_count, win_count)
+            if sequence.decision is not None:
+                return sequence.decision
+        return -1
+
+    @subject.testcase("no decision without games.")
+    def test_empty() -> bool:
+        sequence = WinRateConfidenceSequence(0.05)
+        return (sequence.interval == (0.0, 1.0)) and (sequence.decision is None)
+
+    @subject.testcase("stop early when difference is large.")
+    def test_stop_early() -> bool:
+        return all(
+            run_sequence(0.05, 0.7, 1000, seed) == 0 for seed in range(20)
+        ) and all(run_sequence(0.05, 0.3, 1000, seed) == 1 for seed in range(20))
+
+    @subject.testcase("rarely decide when players are even.")
+    def test_error_rate() -> bool:
+        # 何度見ても誤って決まる割合はalpha以下になる
+        wrong_count = sum(
+            run_sequence(0.1, 0.5, 2000, seed) != -1 for seed in range(100)
+        )
+        return wrong_count <= 10
+
+
+with TestSubject("DealTally (paired)") as subject:
+
+    @subject.testcase("count pairs.")
+    def test_pair_counts() -> bool:
+        tally = DealTally()
+        tally.add_pair(0, True, False)
+        tally.add_pair(1, True, True)
+        if (tally.pair_count != 2) or (tally.get_pair_count(True, False) != 1):
+            return False
+        return (tally.game_count == 4) and (tally.player0_win_count == 3)
+
+    @subject.testcase("merge pairs.")
+    def test_merge_pairs() -> bool:
+        tally0 = DealTally()
+        tally0.add_pair(0, True, False)
+        tally1 = DealTally()
+        tally1.add_pair(0, True, False)
+        tally1.add_pair(1, False, False)
+        tally0.merge(tally1)
+        return (tally0.pair_count == 3) and (tally0.get_pair_count(True, False) == 2)
+
+    @subject.testcase("paired estimate removes seat advantage.")
+    def test_paired_estimate() -> bool:
+        # 先手が必ず勝つ場合、組の平均は常に1/2になる
+        tally = DealTally()
+        for deal_index in range(100):
+            tally.add_pair(deal_index, True, False)
+        rate, error = tally.get_paired_estimate()
+        reduction = tally.get_variance_reduction()
+        return (rate == 0.5) and (error == 0.0) and (reduction == 1.0)
+
+    @subject.testcase("paired estimate of independent games.")
+    def test_independent_pairs() -> bool:
+        tally = DealTally()
+        for first_won in [False, True]:
+            for second_won in [False, True]:
+                for deal_index in range(25):
+                    tally.add_pair(deal_index, first_won, second_won)
+        rate, error = tally.get_paired_estimate()
+        # 組の平均の分散は1/8なので、独立なゲームとしたときとほぼ同じ
+        return (rate == 0.5) and math.isclose(error, math.sqrt(1 / 8 / 99))